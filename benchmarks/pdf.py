@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""
+PDF generation throughput benchmark: the Federal Fact Finder laid out by
+WeasyPrint (cases/fact_finder_pdf_professional.html), the Fact Finder filled
+into the official template's form fields (fact_finder_form, see
+FACT_FINDER_PDF_RENDERER) and the report notes PDF, over the payloads in
+pdf_corpus.py (empty, typical, all fields filled, very long notes).
+
+Each template/payload pair runs in its own Python process, so peak RSS is
+that render's alone. The first render in the process is cold - it compiles
+the stylesheets and loads fonts (or parses the form template), as in an
+unwarmed worker - and is reported next to the warm p50 of the following
+--renders renders. Pages/sec, render times, peak RSS and output size are
+written to benchmarks/results/pdf-<timestamp>.json and compared with
+benchmarks/baselines/pdf.json. The run exits with status 1 when pages/sec
+drops, or peak RSS or output size grows, by more than --tolerance.
+
+Usage:
+    python benchmarks/pdf.py --save-baseline              # before a template change
+    python benchmarks/pdf.py                              # after it: compare
+    python benchmarks/pdf.py --templates fact_finder --payloads full long_notes
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from run import BASE_DIR, BENCHMARKS_DIR, display_path, git_commit, percentile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TEMPLATES = ['fact_finder', 'fact_finder_form', 'report_notes']
+PAYLOADS = ['empty', 'typical', 'full', 'long_notes']
+
+# (metric, True when higher is better)
+COMPARED_METRICS = [('pages_per_sec', True), ('peak_rss_mb', False), ('output_bytes', False)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark WeasyPrint PDF generation')
+    parser.add_argument('--templates', nargs='+', choices=TEMPLATES, default=TEMPLATES)
+    parser.add_argument('--payloads', nargs='+', choices=PAYLOADS, default=PAYLOADS)
+    parser.add_argument('--renders', type=int, default=5, help='Timed renders per template and payload')
+    parser.add_argument('--baseline', type=Path, help='Baseline file (default benchmarks/baselines/pdf.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.15,
+        help='Allowed change against the baseline as a fraction (default 0.15)',
+    )
+    parser.add_argument('--worker', nargs=2, metavar=('TEMPLATE', 'PAYLOAD'), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def render_worker(template, payload, renders):
+    """Render one template/payload pair in this process; returns the measurements"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+    from cases.services.pdf_form_handler import fill_fact_finder_template
+    from cases.services.pdf_generator import (
+        WEASYPRINT_AVAILABLE, render_fact_finder_html, render_report_notes_html,
+    )
+    from cases.services.pdf_renderer import render_pdf
+    from pdf_corpus import build_case
+
+    if template != 'fact_finder_form' and not WEASYPRINT_AVAILABLE:
+        return {'error': 'WeasyPrint is not available on this system'}
+
+    case = build_case(payload)
+
+    def render():
+        # Same calls as generate_fact_finder_pdf and generate_report_notes_pdf
+        if template == 'fact_finder_form':
+            pdf, pages = fill_fact_finder_template(case.fact_finder_data)
+        elif template == 'fact_finder':
+            pdf, pages = render_pdf(render_fact_finder_html(case), 'fact_finder')
+        else:
+            pdf, pages = render_pdf(render_report_notes_html(case), 'report_notes')
+        return pages, pdf
+
+    # Cold: the first render in the process also compiles the stylesheets and
+    # loads fonts (or parses the form template), as for an unwarmed worker
+    start = time.perf_counter()
+    render()
+    cold_render = time.perf_counter() - start
+    rss_before = peak_rss_mb()
+    durations = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        pages, pdf = render()
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    peak = peak_rss_mb()
+    return {
+        'pages': pages,
+        'pages_per_sec': round(pages * renders / sum(durations), 2),
+        'cold_render_ms': round(cold_render * 1000, 1),
+        'render_p50_ms': round(percentile(durations, 0.50) * 1000, 1),
+        'render_max_ms': round(durations[-1] * 1000, 1),
+        'peak_rss_mb': peak,
+        'rss_growth_mb': round(peak - rss_before, 1) if peak is not None else None,
+        'output_bytes': len(pdf),
+    }
+
+
+def run_pair(template, payload, renders):
+    completed = subprocess.run(
+        [sys.executable, __file__, '--worker', template, payload, '--renders', str(renders)],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'worker failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Print the comparison table; returns the regressed template/payload pairs"""
+    regressions = []
+    print(f'\n{"template/payload":<30} {"metric":<14} {"current":>12} {"base":>12} {"change":>8}')
+    for name, current in results['runs'].items():
+        previous = baseline['runs'].get(name)
+        if 'error' in current or previous is None or 'error' in previous:
+            print(f'{name:<30} (no comparison)')
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            if current.get(metric) is None or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            worse = -change if higher_is_better else change
+            flag = '  REGRESSION' if worse > tolerance else ''
+            if flag:
+                regressions.append(f'{name} {metric}')
+            print(f'{name:<30} {metric:<14} {current[metric]:>12,} {previous[metric]:>12,} {change:>+8.0%}{flag}')
+    return regressions
+
+
+def main():
+    args = parse_args()
+    if args.worker:
+        print(json.dumps(render_worker(*args.worker, args.renders)))
+        return 0
+
+    results = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'renders': args.renders,
+        'runs': {},
+    }
+    for template in args.templates:
+        for payload in args.payloads:
+            name = f'{template}/{payload}'
+            result = run_pair(template, payload, args.renders)
+            results['runs'][name] = result
+            if 'error' in result:
+                print(f'{name:<30} {result["error"]}')
+            else:
+                print(
+                    f'{name:<30} {result["pages"]:>3} pages  {result["pages_per_sec"]:>7.2f} pages/s  '
+                    f'cold {result["cold_render_ms"]:>7.0f} ms  warm p50 {result["render_p50_ms"]:>7.0f} ms  peak RSS {result["peak_rss_mb"]} MB  '
+                    f'{result["output_bytes"]:>9,} bytes'
+                )
+
+    if all('error' in result for result in results['runs'].values()):
+        return 2
+
+    results_dir = BENCHMARKS_DIR / 'results'
+    results_dir.mkdir(exist_ok=True)
+    output = results_dir / f'pdf-{datetime.now():%Y%m%d-%H%M%S}.json'
+    output.write_text(json.dumps(results, indent=2))
+    print(f'\nResults written to {display_path(output)}')
+
+    baseline_path = args.baseline or BENCHMARKS_DIR / 'baselines' / 'pdf.json'
+    if args.save_baseline:
+        baseline_path.parent.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f'Baseline saved to {display_path(baseline_path)}')
+        return 0
+    if not baseline_path.exists():
+        print(f'No baseline at {display_path(baseline_path)}; run with --save-baseline to create one')
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    print('\nNo regressions against the baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+PDF benchmark corpus: representative cases for the Fact Finder and report
+notes PDFs, rendered by pdf.py.
+
+Cases are unsaved model instances, so no database is needed. The "full"
+payload is derived from the Fact Finder template itself - every
+data.<section>.<field> and service row it reads is filled - so fields added
+to the template are covered without editing this file.
+"""
+import random
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+FACT_FINDER_TEMPLATE = Path(settings.BASE_DIR) / 'cases' / 'templates' / 'cases' / 'fact_finder_pdf_professional.html'
+PAYLOADS = ['empty', 'typical', 'full', 'long_notes']
+
+WORDS = (
+    'retirement annuity service credit deposit survivor benefit supplement high three salary '
+    'contribution matching withdrawal coverage premium election spouse military buyback reserve '
+    'agency pension estimate eligibility creditable period interest beneficiary allotment'
+).split()
+
+FIELD_PATTERN = re.compile(r'{{\s*data\.(\w+)\.(\w+)([^}]*)}}')
+SERVICE_FIELD_PATTERN = re.compile(r'{{\s*service\.(\w+)([^}]*)}}')
+SERVICE_LOOP_PATTERN = re.compile(r'{%\s*for service in data\.(\w+)\.services\s*%}')
+CONDITION_PATTERN = re.compile(r'{%\s*if data\.(\w+)\.(\w+)\s*%}')
+
+
+def _paragraphs(rng, count, words=60):
+    """TinyMCE-style HTML notes"""
+    paragraphs = []
+    for index in range(count):
+        text = ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+        if index % 4 == 3:
+            items = ''.join(f'<li>{rng.choice(WORDS)} {rng.randint(1, 40)}</li>' for _ in range(4))
+            paragraphs.append(f'<ul>{items}</ul>')
+        paragraphs.append(f'<p><strong>{rng.choice(WORDS).title()}:</strong> {text}.</p>')
+    return '\n'.join(paragraphs)
+
+
+def _template_fields():
+    """Fields the Fact Finder template reads: ({section: {field: numeric}}, {field: numeric}, [loop sections])"""
+    source = FACT_FINDER_TEMPLATE.read_text(encoding='utf-8')
+    sections = {}
+    for section, field, filters in FIELD_PATTERN.findall(source):
+        sections.setdefault(section, {})[field] = 'floatformat' in filters
+    for section, field in CONDITION_PATTERN.findall(source):
+        sections.setdefault(section, {}).setdefault(field, False)
+    service_fields = {field: 'floatformat' in filters for field, filters in SERVICE_FIELD_PATTERN.findall(source)}
+    return sections, service_fields, SERVICE_LOOP_PATTERN.findall(source)
+
+
+def _notes_field(field):
+    return field in ('notes', 'comments') or field.endswith('_notes') or field.endswith('_details')
+
+
+def _full_data(rng, notes_paragraphs):
+    sections, service_fields, loop_sections = _template_fields()
+    data = {}
+    for section, fields in sections.items():
+        data[section] = {}
+        for field, numeric in fields.items():
+            if _notes_field(field):
+                data[section][field] = _paragraphs(rng, notes_paragraphs)
+            elif numeric:
+                data[section][field] = round(rng.uniform(1000, 250000), 2)
+            else:
+                data[section][field] = ' '.join(rng.choice(WORDS) for _ in range(3)).title()
+    for section in loop_sections:
+        data.setdefault(section, {})['services'] = [
+            {
+                field: round(rng.uniform(100, 5000), 2) if numeric else rng.choice(WORDS).title()
+                for field, numeric in service_fields.items()
+            }
+            for _ in range(6)
+        ]
+    data['retirement_system'] = 'FERS'
+    data['employee_type'] = 'Regular'
+    return data
+
+
+def _typical_data(rng):
+    return {
+        'basic_information': {
+            'employee_name': 'Pat Example',
+            'first_name': 'Pat',
+            'last_name': 'Example',
+            'dob': '1968-04-12',
+            'address': '100 Main Street',
+            'city': 'Springfield',
+            'state': 'IL',
+            'zip': '62701',
+            'spouse_name': 'Sam Example',
+        },
+        'retirement_system': 'FERS',
+        'employee_type': 'Regular',
+        'tsp': {
+            'current_balance': 412500,
+            'annual_contributions': 23000,
+            'employer_match': 'Yes',
+            'c_fund': 60,
+            'g_fund': 20,
+            'i_fund': 10,
+            's_fund': 10,
+            'comments': _paragraphs(rng, 1),
+        },
+        'fehb': {'plan_name': 'Blue Cross Standard', 'coverage_type': 'Self Plus One', 'keep_in_retirement': 'Yes'},
+        'fegli': {'basic': 98000, 'option_a': 10000, 'keep_in_retirement': 'Unsure'},
+        'social_security': {'pia': 2450, 'planned_claiming_age': '67'},
+        'mad': {
+            'services': [{'branch': 'Army', 'from_date': '1987-06-01', 'to_date': '1991-05-31', 'status': 'Active'}],
+            'notes': _paragraphs(rng, 1),
+        },
+        'add_info': {'additional_notes': _paragraphs(rng, 3)},
+    }
+
+
+def build_case(payload):
+    """Unsaved Case for a corpus payload, with fact_finder_data and report notes set"""
+    from accounts.models import User
+    from cases.models import Case
+
+    rng = random.Random(payload)
+    if payload == 'empty':
+        data, notes = {}, ''
+    elif payload == 'typical':
+        data, notes = _typical_data(rng), _paragraphs(rng, 6)
+    elif payload == 'full':
+        data, notes = _full_data(rng, notes_paragraphs=2), _paragraphs(rng, 12)
+    elif payload == 'long_notes':
+        data, notes = _full_data(rng, notes_paragraphs=40), _paragraphs(rng, 200)
+    else:
+        raise ValueError(f'Unknown payload {payload}')
+
+    member = User(username='bench_member', first_name='Alex', last_name='Advisor', role='member')
+    return Case(
+        external_case_id='BENCH-0001',
+        workshop_code='WS-BENCH',
+        employee_first_name='Pat',
+        employee_last_name='Example',
+        member=member,
+        status='completed',
+        num_reports_requested=2,
+        date_completed=datetime(2026, 1, 15, 16, 0, tzinfo=timezone.utc),
+        created_at=datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc),
+        fact_finder_data=data,
+        report_notes_to_member=notes,
+    )
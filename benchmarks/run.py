@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Performance benchmarks for the dashboards, case detail, reports and JSON
+polling endpoints (see scenarios.py), run in-process with the Django test
+client against a dataset from generate_load_dataset.
+
+Each scenario is requested --iterations times after --warmup requests, with
+the cache cleared before every request unless --warm-cache is given.
+Latency percentiles, SQL query counts and response sizes are written to
+benchmarks/results/<dataset>-<timestamp>.json and compared with
+benchmarks/baselines/<dataset>.json; the run exits with status 1 when a
+scenario is slower than the baseline by more than --tolerance or runs more
+queries.
+
+With SQLite each dataset lives in benchmarks/data/<dataset>.sqlite3; with
+DB_ENGINE set the configured database is used as it is.
+
+Usage:
+    python benchmarks/run.py --dataset 10k --prepare          # build the dataset once
+    python benchmarks/run.py --dataset 10k --save-baseline    # before a change
+    python benchmarks/run.py --dataset 10k                    # after it: compare
+    python benchmarks/run.py --dataset 100k --only case_detail member_dashboard
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+
+DATASETS = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DATASET_SEED = 1
+
+# Differences below this many milliseconds are never reported as regressions
+NOISE_FLOOR_MS = 5
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Run the performance benchmark suite')
+    parser.add_argument('--dataset', choices=DATASETS, default='10k')
+    parser.add_argument('--prepare', action='store_true', help='Migrate and generate the dataset if it is empty')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--warm-cache', action='store_true', help='Keep the cache between requests')
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO', help='Run only these scenarios')
+    parser.add_argument('--baseline', type=Path, help='Baseline file (default benchmarks/baselines/<dataset>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.20,
+        help='Allowed p50 slowdown against the baseline as a fraction (default 0.20)',
+    )
+    return parser.parse_args()
+
+
+def configure_environment(dataset):
+    if os.environ.get('DB_ENGINE', 'django.db.backends.sqlite3') == 'django.db.backends.sqlite3':
+        data_dir = BENCHMARKS_DIR / 'data'
+        data_dir.mkdir(exist_ok=True)
+        os.environ.setdefault('SQLITE_NAME', str(data_dir / f'{dataset}.sqlite3'))
+    # Measure the views, not the monitoring around them
+    os.environ['REQUEST_METRICS_ENABLED'] = 'False'
+    os.environ['PROFILER_ENABLED'] = 'False'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+def prepare(dataset):
+    from django.core.management import call_command
+    from cases.models import Case
+
+    call_command('migrate', interactive=False, verbosity=0)
+    if Case.objects.exists():
+        print(f'Dataset {dataset} already has {Case.objects.count():,} cases')
+        return
+    call_command('generate_load_dataset', cases=DATASETS[dataset], seed=DATASET_SEED)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(client, url, iterations, warmup, clear_cache):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    durations, query_counts = [], []
+    response = None
+    for iteration in range(warmup + iterations):
+        if clear_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            content = b''.join(response) if response.streaming else response.content
+            elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            return {'error': f'HTTP {response.status_code}', 'url': url}
+        if iteration >= warmup:
+            durations.append(elapsed * 1000)
+            query_counts.append(len(queries))
+
+    durations.sort()
+    return {
+        'url': url,
+        'p50_ms': round(percentile(durations, 0.50), 2),
+        'p95_ms': round(percentile(durations, 0.95), 2),
+        'mean_ms': round(sum(durations) / len(durations), 2),
+        'min_ms': round(durations[0], 2),
+        'max_ms': round(durations[-1], 2),
+        'queries': max(query_counts),
+        'bytes': len(content),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the comparison table; returns the names of regressed scenarios"""
+    if baseline['dataset_fingerprint'] != results['dataset_fingerprint']:
+        print('WARNING: the baseline was recorded on a different dataset '
+              f'({baseline["dataset_fingerprint"]} vs {results["dataset_fingerprint"]})')
+
+    regressions = []
+    print(f'\n{"scenario":<28} {"p50 ms":>9} {"base":>9} {"change":>8} {"queries":>8} {"base":>6}')
+    for name, current in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if 'error' in current or previous is None or 'error' in previous:
+            print(f'{name:<28} {"-":>9} (no comparison)')
+            continue
+        change = (current['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] if previous['p50_ms'] else 0
+        slower = change > tolerance and current['p50_ms'] - previous['p50_ms'] > NOISE_FLOOR_MS
+        more_queries = current['queries'] > previous['queries']
+        flag = '  REGRESSION' if slower or more_queries else ''
+        if flag:
+            regressions.append(name)
+        print(
+            f'{name:<28} {current["p50_ms"]:>9.1f} {previous["p50_ms"]:>9.1f} {change:>+8.0%} '
+            f'{current["queries"]:>8} {previous["queries"]:>6}{flag}'
+        )
+    return regressions
+
+
+def display_path(path):
+    path = Path(path).resolve()
+    return path.relative_to(BASE_DIR) if path.is_relative_to(BASE_DIR) else path
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parse_args()
+    configure_environment(args.dataset)
+    if args.prepare:
+        prepare(args.dataset)
+
+    import django
+    from django.db import connection
+    from django.test import Client
+    from cases.models import Case
+    from scenarios import SCENARIOS, load_fixtures
+
+    scenarios = [scenario for scenario in SCENARIOS if not args.only or scenario['name'] in args.only]
+    fixtures = load_fixtures()
+    clients = {}
+    for role, user in fixtures['users'].items():
+        clients[role] = Client()
+        clients[role].force_login(user)
+
+    newest_case = Case.objects.order_by('-created_at').values_list('created_at', flat=True).first()
+    results = {
+        'dataset': args.dataset,
+        'dataset_fingerprint': f'{Case.objects.count()} cases, newest {newest_case:%Y-%m-%d}',
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'iterations': args.iterations,
+        'cache': 'warm' if args.warm_cache else 'cleared per request',
+        'scenarios': {},
+    }
+
+    for scenario in scenarios:
+        url = scenario['url'](fixtures)
+        result = run_scenario(
+            clients[scenario['role']], url, args.iterations, args.warmup, clear_cache=not args.warm_cache
+        )
+        results['scenarios'][scenario['name']] = result
+        if 'error' in result:
+            print(f'{scenario["name"]:<28} {result["error"]} ({url})')
+        else:
+            print(
+                f'{scenario["name"]:<28} p50 {result["p50_ms"]:>8.1f} ms  p95 {result["p95_ms"]:>8.1f} ms  '
+                f'{result["queries"]:>4} queries  {result["bytes"]:>8,} bytes'
+            )
+
+    results_dir = BENCHMARKS_DIR / 'results'
+    results_dir.mkdir(exist_ok=True)
+    output = results_dir / f'{args.dataset}-{datetime.now():%Y%m%d-%H%M%S}.json'
+    output.write_text(json.dumps(results, indent=2))
+    print(f'\nResults written to {display_path(output)}')
+
+    baseline_path = args.baseline or BENCHMARKS_DIR / 'baselines' / f'{args.dataset}.json'
+    if args.save_baseline:
+        baseline_path.parent.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f'Baseline saved to {display_path(baseline_path)}')
+        return 0
+    if not baseline_path.exists():
+        print(f'No baseline at {display_path(baseline_path)}; run with --save-baseline to create one')
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print(f'\n{len(regressions)} scenario(s) regressed: {", ".join(regressions)}')
+        return 1
+    print('\nNo regressions against the baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
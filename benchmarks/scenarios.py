@@ -0,0 +1,68 @@
+"""
+Benchmark scenarios: the pages and polling endpoints measured by run.py,
+and the users/cases they are requested as.
+
+Each scenario names the role it runs as and builds its URL from the
+fixtures, which pick the heaviest realistic subjects in the dataset (the
+member with the most cases, the technician with the most assigned cases,
+the case with the most messages among those).
+"""
+from django.db.models import Count
+
+SCENARIOS = [
+    # Pages
+    {'name': 'member_dashboard', 'role': 'member', 'url': lambda f: '/cases/member/dashboard/'},
+    {'name': 'technician_dashboard', 'role': 'technician', 'url': lambda f: '/cases/technician/dashboard/'},
+    {'name': 'admin_dashboard', 'role': 'administrator', 'url': lambda f: '/cases/admin/dashboard/'},
+    {'name': 'manager_dashboard', 'role': 'manager', 'url': lambda f: '/cases/manager/dashboard/'},
+    {'name': 'case_detail', 'role': 'technician', 'url': lambda f: f'/cases/{f["case_id"]}/'},
+    {'name': 'view_reports', 'role': 'administrator', 'url': lambda f: '/reports/'},
+    {'name': 'audit_log_dashboard', 'role': 'administrator', 'url': lambda f: '/cases/audit/'},
+    # JSON polling endpoints
+    {'name': 'api_unread_message_count', 'role': 'member', 'url': lambda f: '/cases/unread-message-count/'},
+    {'name': 'api_member_notifications', 'role': 'member', 'url': lambda f: '/cases/api/notifications/'},
+    {'name': 'api_hold_cases', 'role': 'member', 'url': lambda f: '/cases/api/hold-cases/'},
+    {'name': 'api_case_messages', 'role': 'technician', 'url': lambda f: f'/cases/{f["case_id"]}/messages/'},
+    {'name': 'api_turnaround_percentiles', 'role': 'manager', 'url': lambda f: '/cases/api/turnaround-percentiles/'},
+]
+
+
+def load_fixtures():
+    """
+    Users per role and the case to open, chosen deterministically.
+
+    Administrator and manager accounts are created if the dataset has none.
+    """
+    from accounts.models import User
+    from cases.models import Case, CaseMessage
+
+    busiest_member = (
+        Case.objects.filter(member__isnull=False).values('member')
+        .annotate(total=Count('id')).order_by('-total', 'member').first()
+    )
+    busiest_technician = (
+        Case.objects.filter(assigned_to__isnull=False).values('assigned_to')
+        .annotate(total=Count('id')).order_by('-total', 'assigned_to').first()
+    )
+    if busiest_member is None or busiest_technician is None:
+        raise RuntimeError('The dataset has no member or assigned cases; generate it with generate_load_dataset')
+
+    technician = User.objects.get(pk=busiest_technician['assigned_to'])
+    busiest_case = (
+        CaseMessage.objects.filter(case__assigned_to=technician).values('case')
+        .annotate(total=Count('id')).order_by('-total', 'case').first()
+    )
+    case_id = busiest_case['case'] if busiest_case else (
+        Case.objects.filter(assigned_to=technician).order_by('-id').values_list('id', flat=True).first()
+    )
+
+    users = {
+        'member': User.objects.get(pk=busiest_member['member']),
+        'technician': technician,
+    }
+    for role in ('administrator', 'manager'):
+        users[role], _ = User.objects.get_or_create(
+            username=f'bench_{role}',
+            defaults={'role': role, 'email': f'bench_{role}@example.com', 'is_staff': role == 'administrator'},
+        )
+    return {'users': users, 'case_id': case_id}
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Case, CaseDocument, CaseReport, CaseNote, APICallLog, FederalFactFinder
+from .models import Case, CaseDocument, CaseReport, CaseNote, APICallLog, FederalFactFinder, PendingStorageDeletion, ChunkedUpload
 from .services import benefits_api
 
 
@@ -132,6 +132,22 @@ class CaseReportAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+@admin.register(PendingStorageDeletion)
+class PendingStorageDeletionAdmin(admin.ModelAdmin):
+    list_display = ['name', 'queued_at', 'attempts', 'last_error']
+    list_filter = ['attempts']
+    search_fields = ['name']
+    readonly_fields = ['name', 'queued_at', 'attempts', 'last_error']
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'case', 'uploaded_by', 'total_size', 'status', 'created_at', 'updated_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['filename', 'case__external_case_id', 'uploaded_by__username']
+    readonly_fields = ['upload_id', 'storage_name', 'multipart_id', 'document', 'created_at', 'updated_at']
+
+
 @admin.register(CaseNote)
 class CaseNoteAdmin(admin.ModelAdmin):
     list_display = ['case', 'author', 'is_internal', 'created_at']
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class CasesConfig(AppConfig):
     name = 'cases'
+    
+    def ready(self):
+        """Refuse to start with a Fact Finder renderer that would produce incomplete PDFs"""
+        from cases.services.pdf_form_handler import check_fact_finder_renderer
+        check_fact_finder_renderer()
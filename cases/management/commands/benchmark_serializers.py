@@ -0,0 +1,188 @@
+"""
+Django management command to benchmark the message/notification serializers.
+Compares the original model-based page serialization (select_related + a
+pytz timezone and astimezone/strftime per row) against serialization_service.
+Sample data is created inside a transaction that is rolled back.
+
+Usage:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --rows 20 200 --repeat 100
+"""
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from cases.models import Case, CaseMessage, CaseNotification
+from cases.services import serialization_service
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_messages(case, viewer, rows):
+    """Serialization as get_case_messages did it before serialization_service"""
+    import pytz
+    messages_data = []
+    cst_tz = pytz.timezone('America/Chicago')
+    for msg in CaseMessage.objects.filter(case=case).select_related('author')[:rows]:
+        created_at_cst = msg.created_at.astimezone(cst_tz) if msg.created_at.tzinfo else pytz.UTC.localize(msg.created_at).astimezone(cst_tz)
+        updated_at_cst = msg.updated_at.astimezone(cst_tz) if msg.updated_at.tzinfo else pytz.UTC.localize(msg.updated_at).astimezone(cst_tz)
+        messages_data.append({
+            'id': msg.id,
+            'author': msg.author.get_full_name() or msg.author.username,
+            'author_id': msg.author.id,
+            'author_role': msg.author.role,
+            'message': msg.message,
+            'created_at': created_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
+            'updated_at': updated_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
+            'is_author': msg.author == viewer
+        })
+    return messages_data
+
+
+def _legacy_notifications(member, rows):
+    """Serialization as get_member_notifications did it before serialization_service"""
+    import pytz
+    notification_list = []
+    cst_tz = pytz.timezone('America/Chicago')
+    notifications = CaseNotification.objects.filter(member=member).select_related('case').order_by('-created_at')
+    for notif in notifications[:rows]:
+        created_at_cst = notif.created_at.astimezone(cst_tz) if notif.created_at.tzinfo else pytz.UTC.localize(notif.created_at).astimezone(cst_tz)
+        read_at_cst = notif.read_at.astimezone(cst_tz) if notif.read_at and notif.read_at.tzinfo else (pytz.UTC.localize(notif.read_at).astimezone(cst_tz) if notif.read_at else None)
+        notification_list.append({
+            'id': notif.id,
+            'case_id': notif.case.id,
+            'case_code': notif.case.external_case_id,
+            'notification_type': notif.notification_type,
+            'notification_type_display': notif.get_notification_type_display(),
+            'title': notif.title,
+            'message': notif.message,
+            'hold_reason': notif.hold_reason,
+            'is_read': notif.is_read,
+            'created_at': created_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
+            'read_at': read_at_cst.strftime('%b %d, %Y %I:%M %p %Z') if read_at_cst else None
+        })
+    return notification_list
+
+
+class Command(BaseCommand):
+    help = 'Benchmark values()-based message/notification serialization against the model-based version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[20, 200],
+            help='Page sizes to benchmark (default: 20 200)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Timed runs per page size (default: 50)',
+        )
+
+    def _time(self, func, repeat):
+        func()  # Warm up
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    def _create_sample_data(self, count):
+        member = User.objects.create(username='_bench_member', role='member', first_name='Bench', last_name='Member')
+        technician = User.objects.create(username='_bench_tech', role='technician', first_name='Bench', last_name='Tech')
+        case = Case.objects.create(
+            external_case_id='BENCH-SERIALIZERS',
+            workshop_code='BENCH',
+            member=member,
+            assigned_to=technician,
+            employee_first_name='Bench',
+            employee_last_name='Employee',
+            client_email='bench@example.com',
+            status='accepted',
+        )
+
+        messages = CaseMessage.objects.bulk_create([
+            CaseMessage(case=case, author=member if i % 2 else technician, message=f'Benchmark message {i} ' * 8)
+            for i in range(count)
+        ])
+        notifications = CaseNotification.objects.bulk_create([
+            CaseNotification(
+                case=case,
+                member=member,
+                notification_type='case_put_on_hold',
+                title=f'Benchmark notification {i}',
+                message='Benchmark notification body',
+                hold_reason='Waiting on documents',
+                is_read=bool(i % 3),
+            )
+            for i in range(count)
+        ])
+
+        # Spread timestamps the way real traffic does (bulk_create stamps them all with now)
+        start = timezone.now() - timedelta(days=30)
+        for i, msg in enumerate(messages):
+            msg.created_at = start + timedelta(minutes=7 * i)
+            msg.updated_at = msg.created_at + timedelta(seconds=1)
+        for i, notif in enumerate(notifications):
+            notif.created_at = start + timedelta(minutes=11 * i)
+            notif.read_at = notif.created_at + timedelta(hours=2) if notif.is_read else None
+        CaseMessage.objects.bulk_update(messages, ['created_at', 'updated_at'])
+        CaseNotification.objects.bulk_update(notifications, ['created_at', 'read_at'])
+        return case, member, technician
+
+    def handle(self, *args, **options):
+        page_sizes = options['rows']
+        repeat = options['repeat']
+
+        try:
+            with transaction.atomic():
+                case, member, technician = self._create_sample_data(max(page_sizes))
+
+                for rows in page_sizes:
+                    legacy = _legacy_messages(case, technician, rows)
+                    lean = serialization_service.serialize_case_messages(
+                        serialization_service.case_message_rows(case)[:rows], technician
+                    )
+                    if legacy != lean:
+                        self.stdout.write(self.style.ERROR(f'Message payloads differ at {rows} rows'))
+
+                    legacy_ms = self._time(lambda: _legacy_messages(case, technician, rows), repeat)
+                    lean_ms = self._time(lambda: serialization_service.serialize_case_messages(
+                        serialization_service.case_message_rows(case)[:rows], technician
+                    ), repeat)
+                    self._report('messages', rows, legacy_ms, lean_ms)
+
+                    legacy = _legacy_notifications(member, rows)
+                    lean = serialization_service.serialize_notifications(
+                        serialization_service.member_notification_rows(member)[:rows]
+                    )
+                    if legacy != lean:
+                        self.stdout.write(self.style.ERROR(f'Notification payloads differ at {rows} rows'))
+
+                    legacy_ms = self._time(lambda: _legacy_notifications(member, rows), repeat)
+                    lean_ms = self._time(lambda: serialization_service.serialize_notifications(
+                        serialization_service.member_notification_rows(member)[:rows]
+                    ), repeat)
+                    self._report('notifications', rows, legacy_ms, lean_ms)
+
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _report(self, label, rows, legacy_ms, lean_ms):
+        speedup = legacy_ms / lean_ms if lean_ms else 0
+        self.stdout.write(
+            f'{label:<14} {rows:>4} rows: model-based {legacy_ms:7.2f} ms  '
+            f'values() {lean_ms:7.2f} ms  ({speedup:.1f}x)'
+        )
@@ -0,0 +1,34 @@
+"""
+Django management command aborting resumable uploads that stopped receiving
+chunks: their S3 multipart uploads are aborted and local partial files are
+queued for deletion. Also aborts S3 multipart uploads left behind by deleted
+cases.
+
+Cron example (hourly):
+    0 * * * * cd /path/to/project && python manage.py expire_chunked_uploads
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cases.services.chunked_upload_service import abort_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Abort chunked uploads that received no chunks for CHUNKED_UPLOAD_EXPIRE_HOURS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age-hours',
+            type=int,
+            default=settings.CHUNKED_UPLOAD_EXPIRE_HOURS,
+            help=f'Abort uploads idle for this many hours (default: {settings.CHUNKED_UPLOAD_EXPIRE_HOURS})',
+        )
+
+    def handle(self, *args, **options):
+        aborted, failed = abort_stale_uploads(options['max_age_hours'])
+        if not (aborted or failed):
+            self.stdout.write(self.style.SUCCESS('No stale chunked uploads.'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Aborted {aborted} stale upload(s)'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} upload(s) could not be aborted; they are retried on the next run'))
@@ -0,0 +1,59 @@
+"""
+Django management command to check that the hot queries are index-backed.
+Runs EXPLAIN on every query registered in cases/services/query_plan_service.py
+and exits non-zero if any plan contains a full table scan.
+
+Run after migrations in CI or on deploy:
+    python manage.py explain_hot_queries
+Show every plan:
+    python manage.py explain_hot_queries --verbose
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from cases.services import query_plan_service
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the registered hot queries and fail on full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Print the plan of every query, not only failing ones',
+        )
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Only check these queries (default: all)',
+        )
+
+    def handle(self, *args, **options):
+        hot_queries = query_plan_service.get_hot_queries()
+        names = options['names'] or sorted(hot_queries)
+        unknown = [name for name in names if name not in hot_queries]
+        if unknown:
+            raise CommandError(f"Unknown hot queries: {', '.join(unknown)}")
+
+        failures = []
+        for name in names:
+            sql, plan = query_plan_service.explain(hot_queries[name]())
+            errors, warnings = query_plan_service.find_full_scans(plan)
+
+            if errors:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'✗ {name}: full scan'))
+            elif warnings:
+                self.stdout.write(self.style.WARNING(f'! {name}: scan chosen although an index is usable'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+
+            if errors or warnings:
+                self.stdout.write(f'    {sql}')
+            if errors or warnings or options['verbose']:
+                for line in query_plan_service.format_plan(plan):
+                    self.stdout.write(f'    {line}')
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot query(s) do a full table scan: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS(f'\nAll {len(names)} hot queries use an index.'))
@@ -0,0 +1,473 @@
+"""
+Django management command to generate a production-scale synthetic dataset
+for load testing: members, technicians, cases with realistic status, tier and
+turnaround distributions, documents (pointing at tiny shared placeholder
+files), messages, unread markers, notifications and audit logs.
+
+Rows are written with bulk_create in chunks, bypassing model signals; the
+derived tables (CaseDailyFact rollups, turnaround sketches, unread counters)
+are rebuilt at the end. Each chunk has its own random stream and ID range, so
+output is deterministic for a given --seed, --end-date and --chunk-size
+however many --workers build the chunks. Model instance preparation is the
+bottleneck, so on PostgreSQL/MySQL use one worker per core (SQLite allows only
+one writer at a time). Use a fresh database: the generated usernames and case
+IDs start with --prefix, which must not already be in use.
+
+Usage:
+    python manage.py generate_load_dataset --cases 1000000 --workers 8
+    python manage.py generate_load_dataset --cases 50000 --seed 7 --end-date 2026-06-30
+    python manage.py generate_load_dataset --cases 200000 --skip-derived
+"""
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from cases.models import (
+    Case, CaseDocument, CaseMessage, CaseNotification, UnreadMessage,
+)
+from core.models import AuditLog
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+    'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Daniel', 'Nancy', 'Matthew', 'Lisa', 'Anthony', 'Betty', 'Mark', 'Sandra', 'Donald', 'Ashley',
+    'Steven', 'Kimberly', 'Paul', 'Emily', 'Andrew', 'Donna', 'Joshua', 'Michelle', 'Kenneth', 'Carol',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+]
+AGENCIES = ['VA', 'DOD', 'USPS', 'SSA', 'IRS', 'DHS', 'USDA', 'DOJ', 'FAA', 'NASA']
+MESSAGES = [
+    'Could you confirm the retirement date the client prefers?',
+    'Uploaded the latest leave and earnings statement.',
+    'The SF-50 shows a different service computation date; please check.',
+    'Client asked whether survivor benefits are included in the analysis.',
+    'Thanks, the report looks good.',
+    'Missing the TSP statement for the last quarter.',
+    'Added military service deposit details to the fact finder.',
+    'Can we move the due date by a few days?',
+]
+HOLD_REASONS = [
+    'Waiting for the latest leave and earnings statement',
+    'Service computation date conflicts between SF-50s',
+    'Military deposit information missing',
+    'Client to confirm survivor benefit election',
+]
+
+# Share of cases in each status by case age; old cases are almost all completed
+STATUS_WEIGHTS_BY_AGE = [
+    (7, {'draft': 5, 'submitted': 35, 'accepted': 35, 'pending_review': 10, 'hold': 5, 'completed': 10}),
+    (30, {'submitted': 5, 'accepted': 25, 'pending_review': 8, 'hold': 7, 'completed': 55}),
+    (None, {'accepted': 3, 'hold': 3, 'needs_resubmission': 2, 'completed': 92}),
+]
+TIER_WEIGHTS = {'tier_1': 50, 'tier_2': 35, 'tier_3': 15}
+TECHNICIAN_LEVEL_WEIGHTS = {'level_1': 50, 'level_2': 35, 'level_3': 15}
+CREDIT_VALUES = [Decimal(value) for value in ('0.5', '1.0', '1.5', '2.0', '2.5', '3.0')]
+MAX_MESSAGES_PER_CASE = 15
+
+# Smallest valid one-page PDF, used for every generated document
+PLACEHOLDER_PDF = (
+    b'%PDF-1.1\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+    b'2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n'
+    b'3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n'
+    b'trailer<</Root 1 0 R>>\n%%EOF\n'
+)
+
+
+def _weighted(choices):
+    """(values, cumulative weights) for rng.choices"""
+    values = list(choices)
+    cumulative, total = [], 0
+    for value in values:
+        total += choices[value]
+        cumulative.append(total)
+    return values, cumulative
+
+
+@contextmanager
+def _explicit_timestamps(*models):
+    """Let bulk_create keep the historical dates set on auto_now/auto_now_add fields"""
+    changed = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                changed.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in changed:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _next_id(model):
+    return (model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+
+
+# The command instance, inherited by forked workers
+_generator = None
+
+
+def _create_chunk(chunk_index):
+    return _generator.create_chunk(chunk_index)
+
+
+class Command(BaseCommand):
+    help = 'Generate a large deterministic synthetic dataset for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cases', type=int, default=10000, help='Number of cases (default 10000)')
+        parser.add_argument('--members', type=int, help='Number of members (default: one per 100 cases)')
+        parser.add_argument('--technicians', type=int, help='Number of technicians (default: one per 2500 cases)')
+        parser.add_argument('--days', type=int, default=730, help='History span in days (default 730)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default 1)')
+        parser.add_argument(
+            '--end-date',
+            help='Date of the newest cases, YYYY-MM-DD (default today); fix it for reproducible datasets',
+        )
+        parser.add_argument('--prefix', default='lt', help='Prefix for usernames and case IDs (default "lt")')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Cases per bulk insert transaction')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes building chunks in parallel (default 1)',
+        )
+        parser.add_argument(
+            '--skip-derived',
+            action='store_true',
+            help='Do not rebuild rollups, turnaround sketches and unread counters afterwards',
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.span_days = options['days']
+        num_cases = options['cases']
+        if num_cases < 1:
+            raise CommandError('--cases must be at least 1')
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(f'Users with prefix "{self.prefix}_" already exist; pass another --prefix')
+
+        end_date = date.fromisoformat(options['end_date']) if options['end_date'] else timezone.localdate()
+        self.end = timezone.make_aware(datetime.combine(end_date, datetime.min.time()) + timedelta(hours=18))
+
+        started = time.perf_counter()
+        members = self.create_users('member', options['members'] or max(10, num_cases // 100))
+        technicians = self.create_users('technician', options['technicians'] or max(5, num_cases // 2500))
+        self.placeholders = self.save_placeholder_files()
+
+        # Few members submit most cases (heavy-tailed, as in production)
+        self.members = members
+        self.member_weights = list(accumulate(self.rng.paretovariate(1.2) for _ in members))
+        self.technicians = technicians
+        self.technician_weights = list(accumulate(self.rng.uniform(0.5, 1.5) for _ in technicians))
+
+        self.seed = options['seed']
+        self.num_cases = num_cases
+        self.chunk_size = options['chunk_size']
+        self.first_case_id = _next_id(Case)
+        self.first_message_id = _next_id(CaseMessage)
+        chunks = range((num_cases + self.chunk_size - 1) // self.chunk_size)
+        totals = {'cases': 0, 'documents': 0, 'messages': 0, 'unread': 0, 'notifications': 0, 'audit_logs': 0}
+
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING('SQLite allows one writer at a time; using a single worker.'))
+            workers = 1
+
+        global _generator
+        _generator = self
+        with _explicit_timestamps(Case, CaseDocument, CaseMessage, CaseNotification, UnreadMessage):
+            if workers > 1:
+                # Forked workers must open their own database connections
+                connections.close_all()
+                pool = multiprocessing.get_context('fork').Pool(workers)
+                results = pool.imap_unordered(_create_chunk, chunks)
+            else:
+                pool = None
+                results = map(self.create_chunk, chunks)
+            try:
+                for written in results:
+                    for key, value in written.items():
+                        totals[key] += value
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f'{totals["cases"]:>10,} cases  {totals["cases"] / elapsed:,.0f}/s  ({elapsed:.0f}s)'
+                    )
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+
+        self.reset_sequences()
+        self.stdout.write(self.style.SUCCESS(
+            'Created ' + ', '.join(f'{value:,} {key.replace("_", " ")}' for key, value in totals.items())
+            + f', {len(members):,} members and {len(technicians):,} technicians '
+            f'in {time.perf_counter() - started:.0f}s.'
+        ))
+
+        if not options['skip_derived']:
+            self.stdout.write('Rebuilding derived tables...')
+            call_command('build_case_rollups', '--full', stdout=self.stdout)
+            call_command('rebuild_turnaround_sketches', stdout=self.stdout)
+            call_command('rebuild_unread_counters', stdout=self.stdout)
+
+    # ------------------------------------------------------------------
+    # Users and files
+    # ------------------------------------------------------------------
+
+    def create_users(self, role, count):
+        password = make_password('password123')
+        levels = _weighted(TECHNICIAN_LEVEL_WEIGHTS)
+        first_id = _next_id(User)
+        users = []
+        for index in range(count):
+            first_name = self.rng.choice(FIRST_NAMES)
+            last_name = self.rng.choice(LAST_NAMES)
+            username = f'{self.prefix}_{role}_{index + 1}'
+            users.append(User(
+                id=first_id + index,
+                username=username,
+                email=f'{username}@example.com',
+                first_name=first_name,
+                last_name=last_name,
+                password=password,
+                role=role,
+                user_level=self.rng.choices(*levels)[0] if role == 'technician' else None,
+                # Members share workshops, about three per workshop
+                workshop_code=f'{self.prefix.upper()}WS{index // 3 + 1:05d}' if role == 'member' else '',
+                phone=f'555-{self.rng.randrange(10000):04d}',
+            ))
+        User.objects.bulk_create(users, batch_size=1000)
+        return users
+
+    def save_placeholder_files(self):
+        placeholders = {}
+        for document_type in ('fact_finder', 'supporting'):
+            name = f'load_test/{self.prefix}/{document_type}_placeholder.pdf'
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(PLACEHOLDER_PDF))
+            placeholders[document_type] = name
+        return placeholders
+
+    # ------------------------------------------------------------------
+    # Cases and related rows
+    # ------------------------------------------------------------------
+
+    def create_chunk(self, chunk_index):
+        """Build and insert one chunk of cases with their related rows, in one transaction"""
+        rng = self.rng = random.Random(f'{self.seed}:{chunk_index}')
+        cases, documents, messages, unread, notifications, audit_logs = [], [], [], [], [], []
+
+        first_index = chunk_index * self.chunk_size
+        for index in range(first_index, min(first_index + self.chunk_size, self.num_cases)):
+            case = self.build_case(self.first_case_id + index)
+            cases.append(case)
+            member = case.member
+            technician = case.assigned_to
+            last_activity = case.date_completed or min(self.end, case.created_at + timedelta(days=30))
+
+            audit_logs.append(self.audit(member, 'case_created', case.created_at, case, 'Case created'))
+            if case.status != 'draft':
+                audit_logs.append(self.audit(member, 'case_submitted', case.created_at, case, 'Case submitted'))
+            if technician:
+                audit_logs.append(self.audit(technician, 'case_accepted', case.date_accepted, case, 'Case accepted'))
+
+            if case.status != 'draft':
+                documents.append(self.document(case, 'fact_finder', case.created_at))
+                audit_logs.append(self.audit(
+                    member, 'document_uploaded', case.created_at, case, 'Federal Fact Finder uploaded'
+                ))
+                for _ in range(min(int(rng.expovariate(1 / 1.5)), 8)):
+                    documents.append(self.document(case, 'supporting', self.between(case.created_at, last_activity)))
+
+            # Messages alternate between member and technician
+            message_times = sorted(
+                self.between(case.created_at, last_activity)
+                for _ in range(min(int(rng.expovariate(1 / 2.0)), MAX_MESSAGES_PER_CASE) if technician else 0)
+            )
+            # Message IDs come from a fixed block per case so chunks never collide
+            first_message_id = self.first_message_id + index * MAX_MESSAGES_PER_CASE
+            for position, created_at in enumerate(message_times):
+                author = member if position % 2 == 0 else technician
+                messages.append(CaseMessage(
+                    id=first_message_id + position, case=case, author=author, message=rng.choice(MESSAGES),
+                    created_at=created_at, updated_at=created_at,
+                ))
+            if message_times and case.status != 'completed' and rng.random() < 0.4:
+                last = messages[-1]
+                recipient = technician if last.author is member else member
+                unread.append(UnreadMessage(message=last, user=recipient, case=case, created_at=last.created_at))
+
+            if case.status == 'hold':
+                notifications.append(CaseNotification(
+                    case=case, member=member, notification_type='case_put_on_hold',
+                    title='Your case has been placed on hold', message=case.hold_reason,
+                    hold_reason=case.hold_reason, created_at=case.hold_start_date,
+                    is_read=rng.random() < 0.5,
+                ))
+                audit_logs.append(self.audit(technician, 'case_held', case.hold_start_date, case, case.hold_reason))
+            if case.status == 'completed':
+                is_read = rng.random() < 0.85
+                notifications.append(CaseNotification(
+                    case=case, member=member, notification_type='case_released',
+                    title=f'Case {case.external_case_id} is ready', message='Your reports are available.',
+                    created_at=case.actual_release_date, is_read=is_read,
+                    read_at=case.actual_release_date + timedelta(hours=rng.uniform(1, 72)) if is_read else None,
+                ))
+                audit_logs.append(self.audit(
+                    technician, 'case_status_changed', case.date_completed, case, 'Case completed'
+                ))
+            if technician and rng.random() < 0.1:
+                notifications.append(CaseNotification(
+                    case=case, member=member, notification_type='documents_needed',
+                    title='Documents needed', message='Please upload the missing documents.',
+                    created_at=self.between(case.date_accepted, last_activity), is_read=rng.random() < 0.7,
+                ))
+
+        with transaction.atomic():
+            Case.objects.bulk_create(cases, batch_size=1000)
+            CaseDocument.objects.bulk_create(documents, batch_size=2000)
+            CaseMessage.objects.bulk_create(messages, batch_size=2000)
+            UnreadMessage.objects.bulk_create(unread, batch_size=2000)
+            CaseNotification.objects.bulk_create(notifications, batch_size=2000)
+            AuditLog.objects.bulk_create(audit_logs, batch_size=2000)
+        return {
+            'cases': len(cases), 'documents': len(documents), 'messages': len(messages),
+            'unread': len(unread), 'notifications': len(notifications), 'audit_logs': len(audit_logs),
+        }
+
+    def build_case(self, case_id):
+        rng = self.rng
+        # Volume grows over time: recent days get more cases; submissions during working hours
+        age_days = int(self.span_days * rng.random() ** 1.4)
+        day = self.end.date() - timedelta(days=age_days)
+        created_at = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(
+            hours=rng.triangular(7, 19, 11)
+        )
+        created_at = min(created_at, self.end)
+
+        for max_age, weights in STATUS_WEIGHTS_BY_AGE:
+            if max_age is None or age_days < max_age:
+                status = rng.choices(*_weighted(weights))[0]
+                break
+
+        member = rng.choices(self.members, cum_weights=self.member_weights)[0]
+        urgency = 'rush' if rng.random() < 0.15 else 'normal'
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        case = Case(
+            id=case_id,
+            external_case_id=f'{self.prefix.upper()}-{case_id:08d}',
+            workshop_code=member.workshop_code,
+            member=member,
+            created_by=member,
+            employee_first_name=first_name,
+            employee_last_name=last_name,
+            client_email=f'{first_name}.{last_name}{case_id}@agency.example.gov'.lower(),
+            num_reports_requested=rng.choices([1, 2, 3], weights=[75, 18, 7])[0],
+            urgency=urgency,
+            status=status,
+            tier=rng.choices(*_weighted(TIER_WEIGHTS))[0] if status != 'draft' else '',
+            date_submitted=created_at,
+            created_at=created_at,
+            date_due=created_at.date() + timedelta(days=3 if urgency == 'rush' else 7),
+            fact_finder_data=self.fact_finder_data(first_name, last_name),
+            api_sync_status='pending' if status == 'draft' else rng.choices(
+                ['synced', 'failed', 'pending'], weights=[97, 2, 1]
+            )[0],
+        )
+        if case.api_sync_status == 'synced':
+            case.api_synced_at = created_at + timedelta(seconds=rng.uniform(1, 30))
+
+        if status not in ('draft', 'submitted'):
+            technician = rng.choices(self.technicians, cum_weights=self.technician_weights)[0]
+            case.assigned_to = case.accepted_by = technician
+            case.date_accepted = min(self.end, created_at + timedelta(hours=rng.expovariate(1 / 18)))
+            case.credit_value = rng.choice(CREDIT_VALUES)
+
+        if status == 'completed':
+            mean_days = 2 if urgency == 'rush' else 5
+            completed_at = case.date_accepted + timedelta(days=rng.expovariate(1 / mean_days))
+            completed_at = min(completed_at, self.end)
+            case.date_completed = completed_at
+            case.actual_release_date = case.scheduled_release_at = completed_at
+            case.actual_email_sent_date = case.scheduled_email_at = completed_at
+            case.scheduled_release_date = case.scheduled_email_date = timezone.localtime(completed_at).date()
+            case.fact_finder_pdf_status = 'completed'
+            case.fact_finder_pdf_generated_at = created_at
+            if case.assigned_to.user_level == 'level_1':
+                case.review_status = 'approved'
+                case.reviewed_at = completed_at
+        elif status == 'hold':
+            case.hold_reason = rng.choice(HOLD_REASONS)
+            case.hold_start_date = self.between(case.date_accepted, self.end)
+        elif status == 'pending_review':
+            case.review_status = None
+
+        case.updated_at = case.date_completed or case.hold_start_date or case.date_accepted or created_at
+        return case
+
+    def fact_finder_data(self, first_name, last_name):
+        rng = self.rng
+        return {
+            'basic_information': {
+                'employee_name': f'{first_name} {last_name}',
+                'first_name': first_name,
+                'last_name': last_name,
+                'agency': rng.choice(AGENCIES),
+                'retirement_system': rng.choices(['FERS', 'CSRS', 'CSRS Offset'], weights=[85, 10, 5])[0],
+                'years_of_service': rng.randint(5, 40),
+                'annual_salary': rng.randrange(45000, 190000, 500),
+            },
+            'tsp': {
+                'balance': rng.randrange(10000, 1500000, 100),
+                'contribution_percent': rng.choice([3, 5, 8, 10, 15]),
+            },
+        }
+
+    def document(self, case, document_type, uploaded_at):
+        return CaseDocument(
+            case=case,
+            document_type=document_type,
+            file=self.placeholders[document_type],
+            original_filename=f'{case.employee_last_name}_{document_type}.pdf',
+            file_size=len(PLACEHOLDER_PDF),
+            uploaded_by=case.member,
+            uploaded_at=uploaded_at,
+        )
+
+    def audit(self, user, action_type, timestamp, case, description):
+        return AuditLog(user=user, action_type=action_type, timestamp=timestamp, case=case, description=description)
+
+    def between(self, start, end):
+        if end <= start:
+            return start
+        return start + timedelta(seconds=self.rng.uniform(0, (end - start).total_seconds()))
+
+    def reset_sequences(self):
+        """Explicit IDs were inserted; move PostgreSQL sequences past them (no-op elsewhere)"""
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Case, CaseMessage])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
@@ -0,0 +1,63 @@
+"""
+Django management command removing stored files queued for deletion.
+
+Deleting a CaseDocument or CaseReport only queues its file
+(PendingStorageDeletion); this command deletes the queued files in batches,
+one S3 DeleteObjects call per 1,000 keys on Spaces. run_scheduler also
+drains the queue every SCHEDULER_STORAGE_DELETION_INTERVAL seconds, so cron
+is only needed where the scheduler daemon is not running.
+
+Cron example (every 5 minutes):
+    */5 * * * * cd /path/to/project && python manage.py process_storage_deletions
+"""
+from django.core.management.base import BaseCommand
+
+from cases.models import PendingStorageDeletion
+from cases.services import storage_deletion_service
+
+
+class Command(BaseCommand):
+    help = 'Delete stored document and report files queued by deleted cases and documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=storage_deletion_service.BATCH_SIZE,
+            help='Files per storage request (default: 1000, the S3 DeleteObjects maximum)',
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop after this many batches (default: drain the queue)',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help=f'Reset the attempt count of rows that failed {storage_deletion_service.MAX_ATTEMPTS} times first',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = min(options['batch_size'], storage_deletion_service.BATCH_SIZE)
+
+        if options['retry_failed']:
+            reset = PendingStorageDeletion.objects.filter(
+                attempts__gte=storage_deletion_service.MAX_ATTEMPTS
+            ).update(attempts=0)
+            self.stdout.write(f'Reset {reset} failed deletion(s)')
+
+        deleted, skipped, failed = storage_deletion_service.process_pending(
+            batch_size=batch_size,
+            max_batches=options['max_batches'],
+        )
+
+        if not (deleted or skipped or failed):
+            self.stdout.write(self.style.SUCCESS('No files queued for deletion.'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} file(s), skipped {skipped} still in use, {failed} failed'
+        ))
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                'Failed deletions are retried on the next run; see Pending Storage Deletions in the admin.'
+            ))
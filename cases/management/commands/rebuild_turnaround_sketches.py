@@ -0,0 +1,26 @@
+"""
+Django management command to rebuild the turnaround percentile sketches.
+Sketches are kept current as cases are saved; run this once after deploying
+them (to backfill existing cases) or after bulk data fixes made with
+queryset.update(), which skips the save signals.
+
+Usage:
+    python manage.py rebuild_turnaround_sketches
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from cases.services.turnaround_service import rebuild_sketches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild turnaround percentile sketches from case dates'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        cases, sketches = rebuild_sketches()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Recorded {cases} case(s) into {sketches} sketch row(s) in {elapsed:.2f}s.'
+        ))
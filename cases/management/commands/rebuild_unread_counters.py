@@ -0,0 +1,32 @@
+"""
+Django management command to rebuild UnreadCounter rows from UnreadMessage.
+Run after bulk data fixes or if badge counts ever drift:
+    python manage.py rebuild_unread_counters
+    python manage.py rebuild_unread_counters --user jsmith
+"""
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import User
+from cases.services.unread_counter_service import rebuild_unread_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-user unread message counters from UnreadMessage records'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only rebuild counters for this username',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options.get('user'):
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["user"]}" does not exist')
+        
+        count = rebuild_unread_counters(user=user)
+        
+        scope = f'user {user.username}' if user else 'all users'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} unread counter(s) for {scope}.'))
@@ -0,0 +1,97 @@
+"""
+Django management command comparing stored files with the CaseDocument and
+CaseReport file columns. Replaces the one-off verify/cleanup scripts that
+walked cases one by one.
+
+Reports orphans (stored files no row references) and missing files (rows
+whose file is not in storage). Storage and database are read as sorted
+streams and merge-joined, so memory stays flat for millions of objects.
+
+Usage:
+    python manage.py reconcile_storage                      # report only
+    python manage.py reconcile_storage --delete-orphans     # queue orphans for deletion
+    python manage.py reconcile_storage --prefix case_reports/ --show 0
+
+Cron example (weekly, Sunday 3 AM):
+    0 3 * * 0 cd /path/to/project && python manage.py reconcile_storage --delete-orphans
+"""
+from django.core.management.base import BaseCommand
+
+from cases.services import storage_reconcile_service
+
+# Orphans are queued for deletion in groups of this size
+QUEUE_CHUNK = 1000
+
+
+class Command(BaseCommand):
+    help = 'Report (or delete) stored files without a database row, and rows whose file is missing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefix',
+            action='append',
+            dest='prefixes',
+            help='Storage folder to reconcile, repeatable (default: case_documents/ and case_reports/)',
+        )
+        parser.add_argument(
+            '--delete-orphans',
+            action='store_true',
+            help='Queue orphaned files for deletion by process_storage_deletions',
+        )
+        parser.add_argument(
+            '--min-age-minutes',
+            type=int,
+            default=60,
+            help='Ignore stored files newer than this; uploads write the file before the row (default: 60)',
+        )
+        parser.add_argument(
+            '--show',
+            type=int,
+            default=20,
+            help='Orphans and missing files to list by name (default: 20, -1 for all)',
+        )
+
+    def handle(self, *args, **options):
+        prefixes = [
+            prefix if prefix.endswith('/') else prefix + '/'
+            for prefix in options['prefixes'] or storage_reconcile_service.DEFAULT_PREFIXES
+        ]
+        show = options['show']
+        orphans = missing = recent = queued = 0
+        orphan_bytes = 0
+        to_queue = []
+
+        self.stdout.write(f'Reconciling {", ".join(prefixes)}...')
+        for kind, item in storage_reconcile_service.reconcile(prefixes):
+            if kind == 'missing':
+                missing += 1
+                if show < 0 or missing <= show:
+                    self.stdout.write(self.style.WARNING(f'  missing  {item}'))
+                continue
+
+            if storage_reconcile_service.is_recent(item, options['min_age_minutes']):
+                recent += 1
+                continue
+            orphans += 1
+            orphan_bytes += item.size
+            if show < 0 or orphans <= show:
+                self.stdout.write(f'  orphan   {item.name} ({item.size:,} bytes)')
+            if options['delete_orphans']:
+                to_queue.append(item.name)
+                if len(to_queue) >= QUEUE_CHUNK:
+                    queued += storage_reconcile_service.queue_orphans(to_queue)
+                    to_queue = []
+
+        if to_queue:
+            queued += storage_reconcile_service.queue_orphans(to_queue)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{orphans} orphaned file(s) ({orphan_bytes / (1024 * 1024):,.1f} MB), '
+            f'{missing} row(s) with a missing file, {recent} recent file(s) skipped'
+        ))
+        if queued:
+            self.stdout.write(self.style.SUCCESS(
+                f'Queued {queued} orphan(s) for deletion; run process_storage_deletions or let run_scheduler pick them up'
+            ))
+        if orphans and not options['delete_orphans']:
+            self.stdout.write('Run with --delete-orphans to remove the orphaned files.')
@@ -1,11 +1,12 @@
 """
 Django management command to release scheduled cases
 Run this daily via cron: 0 0 * * * cd /path/to/app && python manage.py release_scheduled_cases
+Prefer the run_scheduler daemon, which releases each case at its exact scheduled time.
 """
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from datetime import date
-from cases.models import Case
+from cases.services import scheduler_service
+from core.prometheus import SCHEDULER_RUN_JOBS
 
 
 class Command(BaseCommand):
@@ -20,14 +21,10 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
-        today = date.today()
+        now = timezone.now()
         
-        # Find all completed cases that are scheduled for release on or before today
-        cases_to_release = Case.objects.filter(
-            status='completed',
-            scheduled_release_date__lte=today,
-            actual_release_date__isnull=True
-        )
+        # Find all completed cases whose scheduled release time has passed
+        cases_to_release = scheduler_service.due_releases(now)
         
         count = cases_to_release.count()
         
@@ -42,16 +39,19 @@ class Command(BaseCommand):
             return
         
         # Release the cases
-        for case in cases_to_release:
-            case.actual_release_date = timezone.now()
-            case.date_completed = timezone.now()  # Set completion date when actually released
-            case.save()
+        count = 0
+        for case_id in list(cases_to_release.values_list('id', flat=True)):
+            case = scheduler_service.release_case(case_id, now)
+            if case is None:
+                continue
+            count += 1
             self.stdout.write(
                 self.style.SUCCESS(
                     f'✓ Released case {case.external_case_id} (was scheduled for {case.scheduled_release_date})'
                 )
             )
         
+        SCHEDULER_RUN_JOBS.observe(count, job=scheduler_service.JOB_RELEASE)
         self.stdout.write(
             self.style.SUCCESS(f'\nSuccessfully released {count} case(s).')
         )
@@ -0,0 +1,174 @@
+"""
+Django management command running scheduled case work in one long-lived process.
+Replaces the per-minute cron invocations of release_scheduled_cases,
+send_scheduled_emails, retry_api_sync and process_storage_deletions.
+
+Pending releases and emails are loaded into a due-time priority queue from the
+indexed Case.scheduled_release_at / scheduled_email_at columns, and the loop
+sleeps until the next one is due, so hour-level release delays are honoured to
+the minute. The queue is reloaded every SCHEDULER_REFRESH_SECONDS to pick up
+newly scheduled cases. Several copies may run (e.g. one per host): only the
+holder of the SchedulerLock lease does any work, and a standby takes over
+within SCHEDULER_LOCK_TTL seconds if the leader dies.
+
+Run under a process supervisor (systemd, supervisord):
+    python manage.py run_scheduler
+Run whatever is due once and exit:
+    python manage.py run_scheduler --once
+"""
+import heapq
+import logging
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from cases.services import retry_failed_cases, scheduler_service, storage_deletion_service
+from core.models import SystemSettings
+from core.prometheus import SCHEDULER_JOBS, SCHEDULER_RUN_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run scheduled releases, notification emails and API retries in a long-lived process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run everything that is due now and exit',
+        )
+        parser.add_argument(
+            '--queue-size',
+            type=int,
+            default=500,
+            help='Pending jobs of each kind held in memory between reloads (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        self.queue_size = options['queue_size']
+        self.owner = scheduler_service.default_owner()
+        self.stopping = threading.Event()
+
+        if options['once']:
+            self.run_due_jobs(self.load_queue())
+            self.retry_api_syncs()
+            self.delete_queued_files()
+            return
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.stdout.write(f'Scheduler {self.owner} starting')
+        try:
+            self.run_forever()
+        finally:
+            close_old_connections()
+            scheduler_service.release_lock(self.owner)
+            self.stdout.write(f'Scheduler {self.owner} stopped')
+
+    def stop(self, signum, frame):
+        self.stopping.set()
+
+    def run_forever(self):
+        lock_ttl = settings.SCHEDULER_LOCK_TTL
+        refresh_interval = settings.SCHEDULER_REFRESH_SECONDS
+        queue = []
+        is_leader = False
+        next_refresh = 0
+        next_api_retry = 0
+        next_storage_deletion = 0
+
+        while not self.stopping.is_set():
+            close_old_connections()
+            SystemSettings.expire_cached_settings()
+
+            was_leader = is_leader
+            is_leader = scheduler_service.acquire_lock(self.owner, lock_ttl)
+            if not is_leader:
+                if was_leader:
+                    self.stdout.write(self.style.WARNING(f'Scheduler {self.owner} lost the lease'))
+                queue, next_refresh = [], 0
+                self.stopping.wait(lock_ttl / 3)
+                continue
+            if not was_leader:
+                self.stdout.write(self.style.SUCCESS(f'Scheduler {self.owner} is the leader'))
+
+            if time.monotonic() >= next_refresh:
+                queue = self.load_queue()
+                next_refresh = time.monotonic() + refresh_interval
+
+            self.run_due_jobs(queue)
+
+            if time.monotonic() >= next_api_retry:
+                self.retry_api_syncs()
+                next_api_retry = time.monotonic() + settings.SCHEDULER_API_RETRY_INTERVAL
+
+            if time.monotonic() >= next_storage_deletion:
+                # A bounded pass per iteration, so the lease is renewed between passes
+                more_pending = self.delete_queued_files(settings.SCHEDULER_STORAGE_DELETION_BATCHES)
+                next_storage_deletion = time.monotonic() + (
+                    0 if more_pending else settings.SCHEDULER_STORAGE_DELETION_INTERVAL
+                )
+
+            # Sleep until the next job is due, the queue is reloaded or the lease needs renewing
+            wake_in = min(next_refresh, next_api_retry, next_storage_deletion) - time.monotonic()
+            wake_in = min(wake_in, lock_ttl / 3)
+            if queue:
+                wake_in = min(wake_in, (queue[0][0] - timezone.now()).total_seconds())
+            self.stopping.wait(max(wake_in, 0))
+
+    def load_queue(self):
+        queue = [
+            (due_at, scheduler_service.JOB_PRIORITY[job], case_id, job)
+            for due_at, job, case_id in scheduler_service.upcoming_jobs(self.queue_size)
+        ]
+        heapq.heapify(queue)
+        return queue
+
+    def run_due_jobs(self, queue):
+        now = timezone.now()
+        processed = {}  # job -> cases acted on this run
+        while queue and queue[0][0] <= now and not self.stopping.is_set():
+            due_at, _, case_id, job = heapq.heappop(queue)
+            processed.setdefault(job, 0)
+            try:
+                case = scheduler_service.run_job(job, case_id, now)
+            except Exception:
+                logger.exception(f'Scheduler job {job} failed for case {case_id}')
+                SCHEDULER_JOBS.inc(job=job, outcome='error')
+                continue
+            if case is not None:
+                processed[job] += 1
+                lateness = (timezone.now() - due_at).total_seconds()
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ {job} case {case.external_case_id} ({lateness:.0f}s after due time)'
+                ))
+        for job, count in processed.items():
+            SCHEDULER_RUN_JOBS.observe(count, job=job)
+
+    def retry_api_syncs(self):
+        try:
+            success_count, fail_count = retry_failed_cases()
+        except Exception:
+            logger.exception('Scheduled API sync retry failed')
+            return
+        if success_count or fail_count:
+            self.stdout.write(f'API sync retry: {success_count} succeeded, {fail_count} failed')
+
+    def delete_queued_files(self, max_batches=None):
+        """Process the deletion queue; returns True if max_batches was reached with rows left"""
+        try:
+            deleted, skipped, failed = storage_deletion_service.process_pending(max_batches=max_batches)
+        except Exception:
+            logger.exception('Queued storage deletion failed')
+            return False
+        if deleted or failed:
+            self.stdout.write(f'Storage deletion: {deleted} file(s) deleted, {failed} failed')
+        # Failures wait for the normal interval, so a storage outage does not burn through retries
+        quota = (max_batches or 0) * storage_deletion_service.BATCH_SIZE
+        return max_batches is not None and not failed and deleted + skipped >= quota
@@ -5,14 +5,12 @@ Email sending is tied to case release dates.
 Run this daily/hourly via cron:
     Daily: 0 0 * * * cd /path/to/app && python manage.py send_scheduled_emails
     Hourly: 0 * * * * cd /path/to/app && python manage.py send_scheduled_emails
+Prefer the run_scheduler daemon, which sends each email at its exact scheduled time.
 """
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils import timezone
-from django.conf import settings
-from datetime import date
-from cases.models import Case
+from cases.services import scheduler_service
+from core.prometheus import SCHEDULER_RUN_JOBS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,15 +28,10 @@ class Command(BaseCommand):
     
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
-        today = date.today()
+        now = timezone.now()
         
-        # Find all completed cases that are scheduled for email notification on or before today
-        cases_to_email = Case.objects.filter(
-            status='completed',
-            scheduled_email_date__lte=today,
-            actual_email_sent_date__isnull=True,
-            member__isnull=False,  # Must have a member to email
-        ).select_related('member')
+        # Find all completed cases whose scheduled email time has passed (member required)
+        cases_to_email = scheduler_service.due_emails(now).select_related('member')
         
         count = cases_to_email.count()
         
@@ -65,13 +58,10 @@ class Command(BaseCommand):
                     failed_count += 1
                     continue
                 
-                # Send email
-                email_result = send_case_notification_email(case)
+                # Send email and mark as sent (skipped if another process got there first)
+                email_result = scheduler_service.send_case_email(case.id, now)
                 
                 if email_result:
-                    # Mark as sent
-                    case.actual_email_sent_date = timezone.now()
-                    case.save()
                     sent_count += 1
                     self.stdout.write(self.style.SUCCESS(
                         f'✓ Sent notification email for case {case.external_case_id} to {case.member.email}'
@@ -86,6 +76,7 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR(f'✗ Error: {str(e)}'))
         
         # Summary
+        SCHEDULER_RUN_JOBS.observe(sent_count, job=scheduler_service.JOB_EMAIL)
         self.stdout.write(self.style.SUCCESS(
             f'\nSuccessfully sent {sent_count} email(s).'
         ))
@@ -93,49 +84,3 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(
                 f'Failed to send {failed_count} email(s).'
             ))
-
-
-def send_case_notification_email(case):
-    """
-    Send member notification email for completed case.
-    
-    Args:
-        case: Case object with member to notify
-        
-    Returns:
-        bool: True if email sent successfully, False otherwise
-    """
-    try:
-        if not case.member or not case.member.email:
-            logger.warning(f'Cannot send email: Case {case.external_case_id} has no member email')
-            return False
-        
-        # Prepare email context
-        context = {
-            'member': case.member,
-            'case': case,
-            'case_url': f'{settings.SITE_URL}/cases/{case.id}/' if hasattr(settings, 'SITE_URL') else 'https://yoursite.com/cases/',
-            'employee_name': f'{case.employee_first_name} {case.employee_last_name}',
-        }
-        
-        # Render email templates
-        subject = f'Your Case {case.external_case_id} is Now Available'
-        text_message = render_to_string('emails/case_released_notification.txt', context)
-        html_message = render_to_string('emails/case_released_notification.html', context)
-        
-        # Send email
-        result = send_mail(
-            subject=subject,
-            message=text_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[case.member.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        
-        logger.info(f'Sent notification email for case {case.external_case_id} to {case.member.email}')
-        return result > 0
-        
-    except Exception as e:
-        logger.error(f'Error sending email for case {case.external_case_id}: {str(e)}')
-        return False
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_unread_counters(apps, schema_editor):
+    """Seed counters from existing UnreadMessage rows"""
+    UnreadMessage = apps.get_model('cases', 'UnreadMessage')
+    UnreadCounter = apps.get_model('cases', 'UnreadCounter')
+    rows = UnreadMessage.objects.values('user_id', 'case_id').annotate(total=models.Count('id'))
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=row['user_id'], case_id=row['case_id'], count=row['total']) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0031_case_original_case'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Number of unread messages for this user on this case')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the counter last changed')),
+                ('case', models.ForeignKey(help_text='Case the unread messages belong to', on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to='cases.case')),
+                ('user', models.ForeignKey(help_text='User with unread messages', on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Unread Counter',
+                'verbose_name_plural': 'Unread Counters',
+                'unique_together': {('user', 'case')},
+            },
+        ),
+        migrations.RunPython(populate_unread_counters, migrations.RunPython.noop),
+    ]
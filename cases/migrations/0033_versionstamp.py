@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0032_unreadcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionStamp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('case', 'Case'), ('user', 'User')], help_text='What object_id refers to', max_length=10)),
+                ('object_id', models.PositiveIntegerField(help_text='Case id or user id')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='Incremented on every tracked write')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the version last changed')),
+            ],
+            options={
+                'verbose_name': 'Version Stamp',
+                'verbose_name_plural': 'Version Stamps',
+                'unique_together': {('scope', 'object_id')},
+            },
+        ),
+    ]
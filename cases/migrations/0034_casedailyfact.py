@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-19 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0033_versionstamp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDailyFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Submission date (CST); null for cases without date_submitted', null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('urgency', models.CharField(max_length=10)),
+                ('workshop_code', models.CharField(max_length=50)),
+                ('case_count', models.PositiveIntegerField(default=0)),
+                ('credit_count', models.PositiveIntegerField(default=0, help_text='Cases with a credit value')),
+                ('credit_sum', models.DecimalField(decimal_places=1, default=0, help_text='Sum of credit values', max_digits=12)),
+                ('processing_count', models.PositiveIntegerField(default=0, help_text='Completed cases with submission and completion dates')),
+                ('processing_seconds', models.BigIntegerField(default=0, help_text='Sum of submission-to-completion seconds for processing_count cases')),
+                ('built_at', models.DateTimeField(help_text='Start of the rollup run that wrote this row')),
+                ('assigned_to', models.ForeignKey(help_text='Assigned technician', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('member', models.ForeignKey(help_text='Member who submitted the cases', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Case Daily Fact',
+                'verbose_name_plural': 'Case Daily Facts',
+                'indexes': [models.Index(fields=['date'], name='cases_cased_date_47b94b_idx'), models.Index(fields=['-built_at'], name='cases_cased_built_a_a85fa3_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['updated_at'], name='cases_case_updated_cd653a_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0034_casedailyfact'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseTurnaround',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recorded', models.JSONField(default=dict, help_text='metric -> [seconds, technician_id, tier, month] currently in the sketches')),
+                ('hold_seconds', models.BigIntegerField(default=0, help_text='Total time spent on hold across all holds')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='turnaround', to='cases.case')),
+            ],
+            options={
+                'verbose_name': 'Case Turnaround',
+                'verbose_name_plural': 'Case Turnarounds',
+            },
+        ),
+        migrations.CreateModel(
+            name='TurnaroundSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('submit_to_accept', 'Submission to Acceptance'), ('accept_to_complete', 'Acceptance to Completion'), ('submit_to_complete', 'Submission to Completion'), ('hold', 'Time on Hold')], max_length=20)),
+                ('tier', models.CharField(blank=True, max_length=10)),
+                ('month', models.DateField(help_text='First day of the month (CST) the duration ended in')),
+                ('bins', models.JSONField(default=dict, help_text='Log-bucket index -> count')),
+                ('zero_count', models.PositiveIntegerField(default=0, help_text='Durations under one second')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('technician', models.ForeignKey(help_text='Assigned technician (null = unassigned)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='turnaround_sketches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Turnaround Sketch',
+                'verbose_name_plural': 'Turnaround Sketches',
+                'indexes': [models.Index(fields=['metric', 'month'], name='cases_turna_metric_674ac3_idx')],
+                'unique_together': {('metric', 'technician', 'tier', 'month')},
+            },
+        ),
+    ]
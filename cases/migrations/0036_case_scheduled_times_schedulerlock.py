@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-19 14:40
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_scheduled_times(apps, schema_editor):
+    """Pending releases/emails keep their old due time: midnight CST of the scheduled date"""
+    Case = apps.get_model('cases', 'Case')
+    for date_field, time_field in [('scheduled_release_date', 'scheduled_release_at'),
+                                   ('scheduled_email_date', 'scheduled_email_at')]:
+        dates = Case.objects.filter(**{f'{date_field}__isnull': False}).values_list(date_field, flat=True).distinct()
+        for scheduled_date in dates:
+            Case.objects.filter(**{date_field: scheduled_date}).update(**{
+                time_field: timezone.make_aware(datetime.combine(scheduled_date, datetime.min.time()))
+            })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0035_caseturnaround_turnaroundsketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('owner', models.CharField(help_text='host:pid of the current holder', max_length=255)),
+                ('expires_at', models.DateTimeField()),
+                ('acquired_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Scheduler Lock',
+                'verbose_name_plural': 'Scheduler Locks',
+            },
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='scheduled_email_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Exact time the notification email is due (kept in sync with scheduled_email_date)', null=True),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='scheduled_release_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Exact time the case is due for release (kept in sync with scheduled_release_date; midnight CST of that date when no time was chosen)', null=True),
+        ),
+        migrations.RunPython(populate_scheduled_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-19 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0036_case_scheduled_times_schedulerlock'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='case',
+            name='scheduled_email_at',
+            field=models.DateTimeField(blank=True, help_text='Exact time the notification email is due (kept in sync with scheduled_email_date)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='scheduled_release_at',
+            field=models.DateTimeField(blank=True, help_text='Exact time the case is due for release (kept in sync with scheduled_release_date; midnight CST of that date when no time was chosen)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', 'actual_release_date', 'scheduled_release_at'], name='cases_case_status_9dbdc7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', 'actual_email_sent_date', 'scheduled_email_at'], name='cases_case_status_2ef688_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', 'api_sync_status', 'created_at'], name='cases_case_status_b74d6b_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0037_scheduler_scan_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingStorageDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='File name in the default storage', max_length=500)),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Failed deletion attempts so far')),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Pending Storage Deletion',
+                'verbose_name_plural': 'Pending Storage Deletions',
+                'indexes': [models.Index(fields=['attempts', 'id'], name='cases_pendi_attempt_add560_idx')],
+            },
+        ),
+    ]
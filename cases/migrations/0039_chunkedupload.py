@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-19 17:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0038_pendingstoragedeletion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('filename', models.CharField(help_text='Name of the file on the client', max_length=255)),
+                ('total_size', models.BigIntegerField(help_text='File size in bytes')),
+                ('chunk_size', models.PositiveIntegerField(help_text='Bytes per chunk; only the last chunk is shorter')),
+                ('document_type', models.CharField(max_length=20)),
+                ('notes', models.TextField(blank=True)),
+                ('storage_name', models.CharField(help_text='Name the completed file is stored under', max_length=500)),
+                ('multipart_id', models.CharField(blank=True, help_text='S3 multipart UploadId (empty on local storage)', max_length=255)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('aborted', 'Aborted')], default='uploading', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunked_uploads', to='cases.case')),
+                ('document', models.ForeignKey(blank=True, help_text='Document created on completion', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cases.casedocument')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Chunked Upload',
+                'verbose_name_plural': 'Chunked Uploads',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChunkedUploadPart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(help_text='Chunk number from 0; the byte offset is index * chunk_size')),
+                ('size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('etag', models.CharField(blank=True, help_text='S3 part ETag', max_length=255)),
+                ('received_at', models.DateTimeField(auto_now=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='cases.chunkedupload')),
+            ],
+            options={
+                'verbose_name': 'Chunked Upload Part',
+                'verbose_name_plural': 'Chunked Upload Parts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='chunkedupload',
+            index=models.Index(fields=['status', 'updated_at'], name='cases_chunk_status_3b0278_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='chunkeduploadpart',
+            unique_together={('upload', 'index')},
+        ),
+    ]
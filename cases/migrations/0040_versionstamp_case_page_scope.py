@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0039_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='versionstamp',
+            name='scope',
+            field=models.CharField(choices=[('case', 'Case'), ('user', 'User'), ('case_page', 'Case Page')], help_text='What object_id refers to', max_length=10),
+        ),
+    ]
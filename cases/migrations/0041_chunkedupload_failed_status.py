@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0040_versionstamp_case_page_scope'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chunkedupload',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('aborted', 'Aborted'), ('failed', 'Failed')], default='uploading', max_length=10),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0041_chunkedupload_failed_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleRollupDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Submission date (CST); null for cases without date_submitted', null=True)),
+                ('marked_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Stale Rollup Day',
+                'verbose_name_plural': 'Stale Rollup Days',
+            },
+        ),
+    ]
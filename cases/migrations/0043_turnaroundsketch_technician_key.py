@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 20:06
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def populate_technician_key(apps, schema_editor):
+    """Copy technician_id into the key and merge unassigned rows that were duplicated"""
+    TurnaroundSketch = apps.get_model('cases', 'TurnaroundSketch')
+    TurnaroundSketch.objects.filter(technician__isnull=False).update(technician_key=models.F('technician_id'))
+
+    groups = defaultdict(list)
+    for sketch in TurnaroundSketch.objects.filter(technician__isnull=True).order_by('id'):
+        groups[(sketch.metric, sketch.tier, sketch.month)].append(sketch)
+    for sketches in groups.values():
+        if len(sketches) < 2:
+            continue
+        kept, duplicates = sketches[0], sketches[1:]
+        bins = defaultdict(int, {key: count for key, count in kept.bins.items()})
+        for duplicate in duplicates:
+            for key, count in duplicate.bins.items():
+                bins[key] += count
+            kept.zero_count += duplicate.zero_count
+            kept.count += duplicate.count
+        kept.bins = dict(bins)
+        kept.save(update_fields=['bins', 'zero_count', 'count'])
+        TurnaroundSketch.objects.filter(id__in=[duplicate.id for duplicate in duplicates]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0042_stalerollupday'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='turnaroundsketch',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='turnaroundsketch',
+            name='technician_key',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='technician_id, or 0 when unassigned'),
+        ),
+        migrations.RunPython(populate_technician_key, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='turnaroundsketch',
+            unique_together={('metric', 'technician_key', 'tier', 'month')},
+        ),
+    ]
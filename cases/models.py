@@ -1,12 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from tinymce.models import HTMLField
+import logging
 import os
+import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 def case_document_upload_path(instance, filename):
     """
@@ -244,6 +248,13 @@ class Case(models.Model):
         help_text='Actual date/time when case was released to member (auto-set when status allows release)'
     )
     
+    scheduled_release_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Exact time the case is due for release (kept in sync with scheduled_release_date; '
+                  'midnight CST of that date when no time was chosen)'
+    )
+    
     # Email Notification Fields (tied to release schedule)
     scheduled_email_date = models.DateField(
         null=True,
@@ -251,6 +262,12 @@ class Case(models.Model):
         help_text='Date when member notification email will be sent (tied to release date)'
     )
     
+    scheduled_email_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Exact time the notification email is due (kept in sync with scheduled_email_date)'
+    )
+    
     actual_email_sent_date = models.DateTimeField(
         null=True,
         blank=True,
@@ -457,11 +474,67 @@ class Case(models.Model):
             models.Index(fields=['status', '-date_submitted']),
             models.Index(fields=['member', '-date_submitted']),
             models.Index(fields=['assigned_to', 'status']),
+            # Cases changed since the last rollup run (rollup_service)
+            models.Index(fields=['updated_at']),
+            # Scheduler and sync scans (cases/services/query_plan_service.py lists them):
+            # equality on status, IS NULL on the "done" column, then the range/ORDER BY column.
+            # Composite rather than partial indexes, which MySQL does not support.
+            models.Index(fields=['status', 'actual_release_date', 'scheduled_release_at']),
+            models.Index(fields=['status', 'actual_email_sent_date', 'scheduled_email_at']),
+            models.Index(fields=['status', 'api_sync_status', 'created_at']),
         ]
     
     def __str__(self):
         return f"Case {self.external_case_id} - {self.employee_first_name} {self.employee_last_name}"
     
+    def save(self, *args, **kwargs):
+        # auto_now only writes updated_at when it is among update_fields; include it so
+        # partial saves still invalidate caches keyed on updated_at (dashboard rows)
+        update_fields = kwargs.get('update_fields')
+        if update_fields and 'updated_at' not in update_fields:
+            kwargs['update_fields'] = update_fields = list(update_fields) + ['updated_at']
+        
+        self._sync_scheduled_times()
+        if update_fields:
+            for date_field, time_field in self.SCHEDULED_TIME_FIELDS:
+                if date_field in update_fields and time_field not in update_fields:
+                    kwargs['update_fields'] = update_fields = list(update_fields) + [time_field]
+        super().save(*args, **kwargs)
+    
+    # (date field, exact due time field) pairs read by the run_scheduler daemon
+    SCHEDULED_TIME_FIELDS = [
+        ('scheduled_release_date', 'scheduled_release_at'),
+        ('scheduled_email_date', 'scheduled_email_at'),
+    ]
+    
+    def _sync_scheduled_times(self):
+        """
+        Keep the exact due times consistent with the scheduled dates. Code that
+        knows the hour sets both; a date set on its own (admin edits, older code
+        paths) is due at midnight CST of that date, as before.
+        """
+        from django.utils import timezone
+        
+        for date_field, time_field in self.SCHEDULED_TIME_FIELDS:
+            scheduled_date = getattr(self, date_field)
+            due_at = getattr(self, time_field)
+            if scheduled_date is None:
+                setattr(self, time_field, None)
+            elif due_at is None or timezone.localtime(due_at).date() != scheduled_date:
+                setattr(self, time_field, timezone.make_aware(
+                    datetime.combine(scheduled_date, datetime.min.time())
+                ))
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as loaded, so post_save receivers can tell when a case leaves hold
+        instance._loaded_status = instance.__dict__.get('status')
+        # Submission date as loaded, so a moved case marks its old rollup day stale
+        if 'date_submitted' in instance.__dict__:
+            instance._loaded_date_submitted = instance.date_submitted
+        return instance
+    
     @property
     def employee_full_name(self):
         return f"{self.employee_first_name} {self.employee_last_name}"
@@ -766,21 +839,53 @@ class CreditAuditLog(models.Model):
         return f"Case {self.case.external_case_id}: {self.credit_value_before} → {self.credit_value_after} ({self.adjusted_at})"
 
 
+class PendingStorageDeletion(models.Model):
+    """
+    Stored file waiting to be removed after its CaseDocument or CaseReport
+    was deleted. Written in the deleting transaction, so deletes never wait
+    on storage; the files are removed in batches (one S3 DeleteObjects call
+    per 1,000 keys) by: python manage.py process_storage_deletions
+    See cases/services/storage_deletion_service.py.
+    """
+    
+    name = models.CharField(
+        max_length=500,
+        help_text='File name in the default storage'
+    )
+    
+    queued_at = models.DateTimeField(auto_now_add=True)
+    
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text='Failed deletion attempts so far'
+    )
+    
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        verbose_name = 'Pending Storage Deletion'
+        verbose_name_plural = 'Pending Storage Deletions'
+        indexes = [
+            models.Index(fields=['attempts', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} (queued {self.queued_at:%Y-%m-%d %H:%M})"
+
+
 # Signal handlers for file cleanup
 @receiver(post_delete, sender=CaseDocument)
 def delete_case_document_file(sender, instance, **kwargs):
-    """Delete physical file when CaseDocument is deleted"""
+    """Queue the stored file for deletion when CaseDocument is deleted"""
     if instance.file:
-        if os.path.isfile(instance.file.path):
-            os.remove(instance.file.path)
+        PendingStorageDeletion.objects.create(name=instance.file.name)
 
 
 @receiver(post_delete, sender=CaseReport)
 def delete_case_report_file(sender, instance, **kwargs):
-    """Delete physical file when CaseReport is deleted"""
+    """Queue the stored file for deletion when CaseReport is deleted"""
     if instance.report_file:
-        if os.path.isfile(instance.report_file.path):
-            os.remove(instance.report_file.path)
+        PendingStorageDeletion.objects.create(name=instance.report_file.name)
 
 class CaseNotification(models.Model):
     """
@@ -886,6 +991,39 @@ class CaseNotification(models.Model):
             self.save()
 
 
+@receiver(post_save, sender=CaseNotification)
+def push_case_notification(sender, instance, created, **kwargs):
+    """Push newly created notifications to the member's open event streams"""
+    if not created:
+        return
+    from cases.services.realtime_service import publish
+    publish(instance.member_id, 'notification', {
+        'id': instance.id,
+        'case_id': instance.case_id,
+        'notification_type': instance.notification_type,
+        'title': instance.title,
+    })
+
+
+@receiver(post_save, sender=CaseNotification)
+@receiver(post_delete, sender=CaseNotification)
+def bump_notification_version(sender, instance, **kwargs):
+    """Invalidate the member's cached notification and badge responses"""
+    from cases.services.version_stamp_service import bump_user_version
+    bump_user_version(instance.member_id)
+
+
+@receiver(post_save, sender='accounts.UserPreference')
+@receiver(post_delete, sender='accounts.UserPreference')
+def bump_preference_version(sender, instance, **kwargs):
+    """Invalidate the user's cached preferences and column-config ETags (admin edits included)"""
+    from cases.services.preference_service import bump_preferences_version
+    from cases.services.version_stamp_service import bump_user_version
+    bump_user_version(instance.user_id)
+    # After commit, so no worker re-caches the old rows under the new version
+    transaction.on_commit(lambda: bump_preferences_version(instance.user_id))
+
+
 class CaseChangeRequest(models.Model):
     """
     Member requests for case changes (extend due date, cancel, add docs)
@@ -1042,6 +1180,43 @@ class CaseMessage(models.Model):
         return f"Message by {self.author.username if self.author else 'Unknown'} on Case {self.case.external_case_id}"
 
 
+@receiver(post_save, sender=CaseMessage)
+@receiver(post_delete, sender=CaseMessage)
+def bump_case_message_version(sender, instance, **kwargs):
+    """Invalidate cached message lists for the case"""
+    from cases.services.version_stamp_service import bump_case_version
+    bump_case_version(instance.case_id)
+
+
+@receiver(pre_delete, sender=CaseMessage)
+def discard_unread_message(sender, instance, **kwargs):
+    """The message's UnreadMessage rows go with it (CASCADE); take them off the counters too"""
+    from cases.services.unread_counter_service import discard_unread_message as discard
+    discard(instance)
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_delete, sender=Case)
+@receiver(post_save, sender=CaseDocument)
+@receiver(post_delete, sender=CaseDocument)
+@receiver(post_save, sender=CaseReport)
+@receiver(post_delete, sender=CaseReport)
+@receiver(post_save, sender=CaseNote)
+@receiver(post_delete, sender=CaseNote)
+@receiver(post_save, sender=CaseMessage)
+@receiver(post_delete, sender=CaseMessage)
+@receiver(post_save, sender=CaseReviewHistory)
+@receiver(post_save, sender=CaseChangeRequest)
+def invalidate_case_page(sender, instance, **kwargs):
+    """Invalidate cached case_detail pages when a case or anything shown on it changes"""
+    from cases.services.page_cache_service import bump_case_page_version
+    if sender is Case:
+        # A new modification case is listed on its original case's page
+        bump_case_page_version(instance.id, instance.original_case_id)
+    else:
+        bump_case_page_version(instance.case_id)
+
+
 class UnreadMessage(models.Model):
     """
     Track which users have read which messages.
@@ -1086,4 +1261,460 @@ class UnreadMessage(models.Model):
         ]
     
     def __str__(self):
-        return f"Unread message for {self.user.username} on Case {self.case.external_case_id}"
\ No newline at end of file
+        return f"Unread message for {self.user.username} on Case {self.case.external_case_id}"
+
+class UnreadCounter(models.Model):
+    """
+    Denormalized unread message count per (user, case).
+    Incremented when an UnreadMessage is recorded and deleted when the user
+    reads the case, so badge state is one indexed query instead of grouping
+    UnreadMessage and loading each case separately.
+    Rebuild from UnreadMessage with: python manage.py rebuild_unread_counters
+    """
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='unread_counters',
+        help_text='User with unread messages'
+    )
+    
+    case = models.ForeignKey(
+        Case,
+        on_delete=models.CASCADE,
+        related_name='unread_counters',
+        help_text='Case the unread messages belong to'
+    )
+    
+    count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of unread messages for this user on this case'
+    )
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='When the counter last changed'
+    )
+    
+    class Meta:
+        verbose_name = 'Unread Counter'
+        verbose_name_plural = 'Unread Counters'
+        unique_together = [['user', 'case']]
+    
+    def __str__(self):
+        return f"{self.count} unread for user {self.user_id} on case {self.case_id}"
+
+
+class VersionStamp(models.Model):
+    """
+    Monotonic change counter per case or per user.
+    Bumped whenever a case's messages or a user's unread counts, notifications
+    or preferences change, so polling endpoints can answer If-None-Match with
+    304 Not Modified by reading one row instead of rebuilding their payload.
+    The case_page scope versions cached case_detail pages, so every worker
+    process sees an invalidation. See cases/services/version_stamp_service.py.
+    """
+    
+    SCOPE_CHOICES = [
+        ('case', 'Case'),
+        ('user', 'User'),
+        ('case_page', 'Case Page'),
+    ]
+    
+    scope = models.CharField(
+        max_length=10,
+        choices=SCOPE_CHOICES,
+        help_text='What object_id refers to'
+    )
+    
+    object_id = models.PositiveIntegerField(
+        help_text='Case id or user id'
+    )
+    
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text='Incremented on every tracked write'
+    )
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='When the version last changed'
+    )
+    
+    class Meta:
+        verbose_name = 'Version Stamp'
+        verbose_name_plural = 'Version Stamps'
+        unique_together = [['scope', 'object_id']]
+    
+    def __str__(self):
+        return f"{self.scope} {self.object_id} v{self.version}"
+
+
+class CaseDailyFact(models.Model):
+    """
+    Daily rollup of cases for the reports page.
+    One row per (submission date, technician, member, status, urgency, workshop)
+    with counts, credit sums and processing-time sums, so any date range is
+    answered by summing a few rows instead of scanning Case.
+    Built incrementally by: python manage.py build_case_rollups
+    See cases/services/rollup_service.py.
+    """
+    
+    date = models.DateField(
+        null=True,
+        help_text='Submission date (CST); null for cases without date_submitted'
+    )
+    
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        help_text='Assigned technician'
+    )
+    
+    member = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+',
+        help_text='Member who submitted the cases'
+    )
+    
+    status = models.CharField(max_length=20)
+    urgency = models.CharField(max_length=10)
+    workshop_code = models.CharField(max_length=50)
+    
+    case_count = models.PositiveIntegerField(default=0)
+    
+    credit_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Cases with a credit value'
+    )
+    
+    credit_sum = models.DecimalField(
+        max_digits=12,
+        decimal_places=1,
+        default=0,
+        help_text='Sum of credit values'
+    )
+    
+    processing_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Completed cases with submission and completion dates'
+    )
+    
+    processing_seconds = models.BigIntegerField(
+        default=0,
+        help_text='Sum of submission-to-completion seconds for processing_count cases'
+    )
+    
+    built_at = models.DateTimeField(
+        help_text='Start of the rollup run that wrote this row'
+    )
+    
+    class Meta:
+        verbose_name = 'Case Daily Fact'
+        verbose_name_plural = 'Case Daily Facts'
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['-built_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.status}/{self.urgency}: {self.case_count} case(s)"
+
+
+class StaleRollupDay(models.Model):
+    """
+    Submission day whose CaseDailyFact rows must be rebuilt although no case
+    saved on it carries a recent updated_at: a case was deleted, its
+    submission date moved away, or its technician or member was deleted.
+    Written by receivers below, consumed by build_case_rollups.
+    See cases/services/rollup_service.py.
+    """
+    
+    date = models.DateField(
+        null=True,
+        help_text='Submission date (CST); null for cases without date_submitted'
+    )
+    
+    marked_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Stale Rollup Day'
+        verbose_name_plural = 'Stale Rollup Days'
+    
+    def __str__(self):
+        return f"Stale rollup day {self.date}"
+
+
+@receiver(post_save, sender=Case)
+def mark_moved_rollup_day(sender, instance, created, raw=False, **kwargs):
+    """A case whose submission date changed leaves its old day's rollups stale"""
+    if raw or created or not hasattr(instance, '_loaded_date_submitted'):
+        return
+    from cases.services.rollup_service import local_date, mark_days_stale
+    old_day = local_date(instance._loaded_date_submitted)
+    if old_day != local_date(instance.date_submitted):
+        mark_days_stale(old_day)
+    instance._loaded_date_submitted = instance.date_submitted
+
+
+@receiver(post_delete, sender=Case)
+def mark_deleted_case_rollup_day(sender, instance, **kwargs):
+    from cases.services.rollup_service import local_date, mark_days_stale
+    mark_days_stale(local_date(instance.date_submitted))
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def mark_deleted_user_rollup_days(sender, instance, **kwargs):
+    """Deleting a user clears Case.assigned_to/member with a plain UPDATE (SET_NULL)"""
+    from cases.services.rollup_service import mark_user_days_stale
+    mark_user_days_stale(instance)
+
+
+class TurnaroundSketch(models.Model):
+    """
+    Mergeable quantile sketch of case turnaround durations (seconds) for one
+    metric, technician, tier and month. Sketches for any set of technicians,
+    tiers or months merge by adding bucket counts, so p50/p90/p99 over any
+    slice are read from a handful of rows. See cases/services/turnaround_service.py.
+    """
+    
+    METRIC_CHOICES = [
+        ('submit_to_accept', 'Submission to Acceptance'),
+        ('accept_to_complete', 'Acceptance to Completion'),
+        ('submit_to_complete', 'Submission to Completion'),
+        ('hold', 'Time on Hold'),
+    ]
+    
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    
+    technician = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='turnaround_sketches',
+        help_text='Assigned technician (null = unassigned)'
+    )
+    
+    # NULLs never collide in a unique index (SQLite, MySQL), so the unique key
+    # uses this non-null copy of technician_id instead
+    technician_key = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='technician_id, or 0 when unassigned'
+    )
+    
+    tier = models.CharField(max_length=10, blank=True)
+    
+    month = models.DateField(help_text='First day of the month (CST) the duration ended in')
+    
+    bins = models.JSONField(
+        default=dict,
+        help_text='Log-bucket index -> count'
+    )
+    
+    zero_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Durations under one second'
+    )
+    
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Turnaround Sketch'
+        verbose_name_plural = 'Turnaround Sketches'
+        unique_together = [['metric', 'technician_key', 'tier', 'month']]
+        indexes = [
+            models.Index(fields=['metric', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.metric} {self.month:%Y-%m} tech={self.technician_id} {self.tier or '-'} (n={self.count})"
+    
+    def save(self, *args, **kwargs):
+        self.technician_key = self.technician_id or 0
+        super().save(*args, **kwargs)
+
+
+class CaseTurnaround(models.Model):
+    """
+    Turnaround durations recorded for a case and the sketch each was added to,
+    so a later change (re-acceptance, reassignment, tier change) moves the
+    sample instead of counting it twice.
+    """
+    
+    case = models.OneToOneField(
+        Case,
+        on_delete=models.CASCADE,
+        related_name='turnaround',
+    )
+    
+    recorded = models.JSONField(
+        default=dict,
+        help_text='metric -> [seconds, technician_id, tier, month] currently in the sketches'
+    )
+    
+    hold_seconds = models.BigIntegerField(
+        default=0,
+        help_text='Total time spent on hold across all holds'
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Case Turnaround'
+        verbose_name_plural = 'Case Turnarounds'
+    
+    def __str__(self):
+        return f"Turnaround for case {self.case_id}"
+
+
+# Case fields the turnaround samples are computed from
+TURNAROUND_FIELDS = {
+    'date_submitted', 'date_accepted', 'date_completed', 'status', 'hold_start_date', 'assigned_to', 'tier',
+}
+
+
+@receiver(post_save, sender=Case)
+def record_case_turnaround(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keep turnaround percentile sketches in line with the case's dates and holds"""
+    if raw:
+        return
+    if update_fields is not None and not TURNAROUND_FIELDS.intersection(update_fields):
+        return
+    from cases.services.turnaround_service import record_case_turnaround as record
+    hold_ended = getattr(instance, '_loaded_status', None) == 'hold' and instance.status != 'hold'
+    try:
+        # Savepoint: a sketch failure must not break the transaction that saved the case
+        with transaction.atomic():
+            record(instance, hold_ended=hold_ended)
+    except Exception:
+        logger.exception(f'Could not record turnaround for case {instance.pk}')
+    instance._loaded_status = instance.status
+
+
+@receiver(pre_delete, sender=Case)
+def remove_case_turnaround(sender, instance, **kwargs):
+    """Take a deleted case's durations back out of the sketches"""
+    from cases.services.turnaround_service import remove_case_turnaround as remove
+    remove(instance.id)
+
+
+class SchedulerLock(models.Model):
+    """
+    Lease row used for leader election between run_scheduler processes.
+    The holder renews expires_at on every loop; another process takes over
+    once the lease has expired.
+    """
+    
+    name = models.CharField(max_length=50, unique=True)
+    owner = models.CharField(max_length=255, help_text='host:pid of the current holder')
+    expires_at = models.DateTimeField()
+    acquired_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Scheduler Lock'
+        verbose_name_plural = 'Scheduler Locks'
+    
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
+
+
+class ChunkedUpload(models.Model):
+    """
+    Resumable upload of one large document, sent in fixed-size chunks that
+    may arrive in any order and be retried. Chunks are written straight to
+    storage: as S3 multipart parts on Spaces, or at their offset in a file
+    under chunked_uploads/ on local storage. Completing the upload attaches
+    the file to the case as a CaseDocument.
+    See cases/services/chunked_upload_service.py.
+    """
+    
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('aborted', 'Aborted'),
+        ('failed', 'Failed'),
+    ]
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='chunked_uploads')
+    
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    
+    filename = models.CharField(max_length=255, help_text='Name of the file on the client')
+    total_size = models.BigIntegerField(help_text='File size in bytes')
+    chunk_size = models.PositiveIntegerField(help_text='Bytes per chunk; only the last chunk is shorter')
+    document_type = models.CharField(max_length=20)
+    notes = models.TextField(blank=True)
+    
+    storage_name = models.CharField(
+        max_length=500,
+        help_text='Name the completed file is stored under'
+    )
+    
+    multipart_id = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='S3 multipart UploadId (empty on local storage)'
+    )
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    
+    document = models.ForeignKey(
+        CaseDocument,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Document created on completion'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Chunked Upload'
+        verbose_name_plural = 'Chunked Uploads'
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} for case {self.case_id} ({self.status})"
+    
+    @property
+    def chunk_count(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+
+class ChunkedUploadPart(models.Model):
+    """A received chunk of a ChunkedUpload; rewritten when the same chunk is sent again"""
+    
+    upload = models.ForeignKey(ChunkedUpload, on_delete=models.CASCADE, related_name='parts')
+    index = models.PositiveIntegerField(help_text='Chunk number from 0; the byte offset is index * chunk_size')
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    etag = models.CharField(max_length=255, blank=True, help_text='S3 part ETag')
+    received_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Chunked Upload Part'
+        verbose_name_plural = 'Chunked Upload Parts'
+        unique_together = [['upload', 'index']]
+    
+    def __str__(self):
+        return f"Chunk {self.index} of upload {self.upload_id}"
+
+
+@receiver(post_delete, sender=ChunkedUpload)
+def delete_chunked_upload_file(sender, instance, **kwargs):
+    """Queue the partial file of an unfinished local upload, e.g. when its case is deleted"""
+    if instance.status == 'uploading' and not instance.multipart_id:
+        from cases.services.chunked_upload_service import partial_name
+        PendingStorageDeletion.objects.create(name=partial_name(instance))
@@ -4,13 +4,23 @@ Handles communication with benefits-software API.
 """
 import requests
 import logging
+import time
 from typing import Dict, Optional, Tuple
 from django.conf import settings
 from django.utils import timezone
 from cases.models import Case, APICallLog
+from core.prometheus import BENEFITS_API_DURATION
 
 logger = logging.getLogger(__name__)
 
+# Error message prefix -> outcome label of BENEFITS_API_DURATION
+_OUTCOME_PREFIXES = (
+    ('API request timed out', 'timeout'),
+    ('Connection error', 'connection_error'),
+    ('API returned status', 'http_error'),
+    ('API response missing', 'bad_response'),
+)
+
 
 class BenefitsSoftwareAPI:
     """Client for benefits-software API integration"""
@@ -31,6 +41,20 @@ class BenefitsSoftwareAPI:
         Returns:
             Tuple of (success: bool, case_id: str, error_message: str)
         """
+        started = time.perf_counter()
+        result = self._submit_case(case)
+        success, _, error = result
+        if success:
+            outcome = 'success'
+        else:
+            outcome = next(
+                (label for prefix, label in _OUTCOME_PREFIXES if (error or '').startswith(prefix)),
+                'error'
+            )
+        BENEFITS_API_DURATION.observe(time.perf_counter() - started, outcome=outcome)
+        return result
+    
+    def _submit_case(self, case: Case) -> Tuple[bool, Optional[str], Optional[str]]:
         endpoint = f"{self.base_url}/cases/submit"
         
         # Build payload from case data
@@ -196,16 +220,21 @@ def submit_case_to_benefits_software(case: Case) -> Tuple[bool, Optional[str], O
     return success, case_id, error
 
 
+def get_failed_submissions():
+    """Submitted cases whose benefits-software sync failed, oldest first"""
+    return Case.objects.filter(
+        status='submitted',
+        api_sync_status='failed',
+        external_case_id__isnull=True
+    ).order_by('created_at')
+
+
 def retry_failed_cases():
     """
     Background task to retry failed case submissions.
     Can be called by management command or scheduled task.
     """
-    failed_cases = Case.objects.filter(
-        status='submitted',
-        api_sync_status='failed',
-        external_case_id__isnull=True
-    ).order_by('created_at')
+    failed_cases = get_failed_submissions()
     
     logger.info(f"Found {failed_cases.count()} failed cases to retry")
     
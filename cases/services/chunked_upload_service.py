@@ -0,0 +1,433 @@
+"""
+Service for resumable chunked uploads of large case documents.
+
+A client starts an upload (start_upload), sends the file in chunk_size pieces
+in any order and in parallel (write_chunk), and completes it
+(complete_upload), which attaches the file to the case as a CaseDocument.
+After a dropped connection the client asks which chunks arrived and resends
+only the others.
+
+Every chunk carries the SHA-256 of its bytes. It is spooled and verified
+before anything is written, and goes straight to storage:
+
+- S3/Spaces: each chunk is one part of an S3 multipart upload to the final
+  key, so the object only exists once complete_multipart_upload succeeds.
+  chunk_size is at least 5 MiB, the S3 minimum part size. If the database
+  commit fails after that, the object is queued for deletion and the upload
+  is marked failed.
+- Local storage: each chunk is written at its offset into
+  chunked_uploads/<upload_id>.part, which is hard-linked under its final name
+  on completion.
+
+Resending a chunk is idempotent: a chunk that already arrived with the same
+checksum is acknowledged without being written again.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from cases.models import CaseDocument, ChunkedUpload, ChunkedUploadPart, PendingStorageDeletion
+from cases.services.document_upload_service import save_documents
+
+logger = logging.getLogger(__name__)
+
+MiB = 1024 * 1024
+
+# S3 rejects multipart parts under 5 MiB (except the last) and uploads over 10,000 parts
+MIN_CHUNK_SIZE = 5 * MiB
+MAX_CHUNK_SIZE = 64 * MiB
+MAX_PARTS = 10000
+
+# Local storage folder for uploads in progress (not reconciled by reconcile_storage)
+PARTIAL_PREFIX = 'chunked_uploads/'
+
+READ_SIZE = 1 * MiB
+
+
+class ChunkedUploadError(Exception):
+    """A request that cannot be applied to the upload; carries the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _uses_bucket(storage):
+    return hasattr(storage, 'bucket')
+
+
+def _bucket_key(storage, name):
+    return storage._normalize_name(storage._clean_name(name))
+
+
+def partial_name(upload):
+    """Storage name of a local upload's partial file"""
+    return f'{PARTIAL_PREFIX}{upload.upload_id}.part'
+
+
+# ============================================================================
+# START
+# ============================================================================
+
+def choose_chunk_size(total_size, requested=None):
+    """Chunk size for an upload: the client's request or the default, within S3's part limits"""
+    chunk_size = requested or settings.CHUNKED_UPLOAD_CHUNK_SIZE_MB * MiB
+    chunk_size = min(max(chunk_size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+    # Grow the chunks for files that would need more than MAX_PARTS of them
+    return max(chunk_size, -(-total_size // MAX_PARTS))
+
+
+def start_upload(case, user, filename, total_size, document_type, notes='', chunk_size=None, storage=None):
+    """
+    Create an upload and open its destination in storage.
+
+    Returns:
+        ChunkedUpload
+    """
+    storage = storage or default_storage
+    filename = os.path.basename(filename or '').strip()
+    if not filename:
+        raise ChunkedUploadError('filename is required')
+    if total_size <= 0:
+        raise ChunkedUploadError('size must be greater than 0')
+    if total_size > settings.CHUNKED_UPLOAD_MAX_SIZE_MB * MiB:
+        raise ChunkedUploadError(f'Files are limited to {settings.CHUNKED_UPLOAD_MAX_SIZE_MB} MB', status=413)
+
+    # Same stored name as a regular upload (case_document_upload_path)
+    name = CaseDocument._meta.get_field('file').generate_filename(CaseDocument(case=case), filename)
+    upload = ChunkedUpload(
+        case=case,
+        uploaded_by=user,
+        filename=filename,
+        total_size=total_size,
+        chunk_size=choose_chunk_size(total_size, chunk_size),
+        document_type=document_type,
+        notes=notes,
+        storage_name=name,
+    )
+
+    if _uses_bucket(storage):
+        upload.storage_name = storage.get_available_name(name)
+        key = _bucket_key(storage, upload.storage_name)
+        response = storage.bucket.meta.client.create_multipart_upload(
+            Bucket=storage.bucket_name,
+            Key=key,
+            **storage._get_write_parameters(key),
+        )
+        upload.multipart_id = response['UploadId']
+    else:
+        path = storage.path(partial_name(upload))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.truncate(total_size)  # Sparse; chunks are written at their offsets
+
+    upload.save()
+    logger.info(f'Chunked upload {upload.upload_id} started: {filename} ({total_size:,} bytes) for case {case.id}')
+    return upload
+
+
+# ============================================================================
+# CHUNKS
+# ============================================================================
+
+def expected_chunk_size(upload, index):
+    """Length of chunk index; only the last chunk is shorter than chunk_size"""
+    offset = index * upload.chunk_size
+    return min(upload.chunk_size, upload.total_size - offset)
+
+
+def _spool(stream, expected_size):
+    """Copy a request body into a temporary file, returning (file, size, sha256 hex)"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=READ_SIZE)
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        data = stream.read(READ_SIZE)
+        if not data:
+            break
+        size += len(data)
+        if size > expected_size:
+            spooled.close()
+            raise ChunkedUploadError(f'Chunk is larger than the expected {expected_size} bytes')
+        digest.update(data)
+        spooled.write(data)
+    spooled.seek(0)
+    return spooled, size, digest.hexdigest()
+
+
+def write_chunk(upload, offset, stream, sha256, storage=None):
+    """
+    Verify one chunk and write it to storage. The status is re-checked under
+    the upload's row lock, so a chunk cannot land after complete_upload.
+
+    Args:
+        upload: ChunkedUpload still uploading
+        offset: Byte offset of the chunk, a multiple of upload.chunk_size
+        stream: File-like object with the chunk's bytes (the request)
+        sha256: Hex SHA-256 the client computed for the chunk
+
+    Returns:
+        tuple: (ChunkedUploadPart, True if the chunk was written, False if it had already arrived)
+    """
+    storage = storage or default_storage
+    if upload.status != 'uploading':
+        raise ChunkedUploadError(f'Upload is {upload.status}', status=409)
+    if offset < 0 or offset >= upload.total_size or offset % upload.chunk_size:
+        raise ChunkedUploadError(f'Offset must be a multiple of {upload.chunk_size} below {upload.total_size}')
+    sha256 = (sha256 or '').strip().lower()
+    if len(sha256) != 64:
+        raise ChunkedUploadError('X-Chunk-SHA256 header with the chunk checksum is required')
+
+    index = offset // upload.chunk_size
+    existing = upload.parts.filter(index=index).first()
+    if existing is not None and existing.sha256 == sha256:
+        return existing, False
+
+    expected_size = expected_chunk_size(upload, index)
+    spooled, size, digest = _spool(stream, expected_size)
+    with spooled:
+        if size != expected_size:
+            raise ChunkedUploadError(f'Chunk at offset {offset} must be {expected_size} bytes, got {size}')
+        if digest != sha256:
+            raise ChunkedUploadError('Chunk checksum does not match; resend the chunk', status=422)
+
+        if upload.multipart_id:
+            # Parallel parts are not serialized: S3 rejects a part sent after completion
+            with transaction.atomic():
+                _lock_uploading(upload)
+            response = storage.bucket.meta.client.upload_part(
+                Bucket=storage.bucket_name,
+                Key=_bucket_key(storage, upload.storage_name),
+                UploadId=upload.multipart_id,
+                PartNumber=index + 1,
+                Body=spooled,
+                ContentLength=size,
+            )
+            with transaction.atomic():
+                _lock_uploading(upload)
+                part = _record_part(upload, index, size, sha256, response['ETag'])
+        else:
+            # The partial file becomes the document's file on completion (hard link),
+            # so hold the lock complete_upload takes for as long as the write lasts
+            with transaction.atomic():
+                _lock_uploading(upload)
+                with open(storage.path(partial_name(upload)), 'r+b') as handle:
+                    handle.seek(offset)
+                    while True:
+                        data = spooled.read(READ_SIZE)
+                        if not data:
+                            break
+                        handle.write(data)
+                part = _record_part(upload, index, size, sha256, '')
+    return part, True
+
+
+def _lock_uploading(upload):
+    """Re-read the upload's status under its row lock; the caller's transaction holds the lock"""
+    status = ChunkedUpload.objects.select_for_update().values_list('status', flat=True).get(pk=upload.pk)
+    if status != 'uploading':
+        raise ChunkedUploadError(f'Upload is {status}', status=409)
+
+
+def _record_part(upload, index, size, sha256, etag):
+    part, _ = ChunkedUploadPart.objects.update_or_create(
+        upload=upload,
+        index=index,
+        defaults={'size': size, 'sha256': sha256, 'etag': etag},
+    )
+    return part
+
+
+def received_chunks(upload):
+    """Indexes of the chunks that have arrived, in order"""
+    return list(upload.parts.order_by('index').values_list('index', flat=True))
+
+
+# ============================================================================
+# COMPLETE / ABORT
+# ============================================================================
+
+def _link_into_place(storage, upload):
+    """Hard-link the partial file under its final name, without copying it; returns the name used"""
+    source = storage.path(partial_name(upload))
+    name = upload.storage_name
+    while True:
+        name = storage.get_available_name(name)
+        target = storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(source, target)
+            break
+        except FileExistsError:
+            continue  # Taken since get_available_name checked; pick another name
+    return name
+
+
+def complete_upload(upload_id, storage=None):
+    """
+    Assemble the chunks under the upload's final name and attach the file to
+    the case. Completing an already completed upload returns its document again.
+
+    Returns:
+        tuple: (ChunkedUpload, CaseDocument)
+    """
+    storage = storage or default_storage
+    assembled = []  # S3 key completed inside the transaction, if the commit then fails
+    try:
+        with transaction.atomic():
+            upload, document = _complete_locked(upload_id, storage, assembled)
+    except Exception:
+        if assembled:
+            _fail_assembled_upload(upload_id, assembled[0])
+        raise
+    logger.info(f'Chunked upload {upload.upload_id} complete: document {document.id} on case {upload.case_id}')
+    return upload, document
+
+
+def _complete_locked(upload_id, storage, assembled):
+    """
+    complete_upload's work, inside its transaction. The rows are written
+    before the file is assembled, so a failed insert leaves the upload
+    retryable; completing the S3 multipart upload is the last step.
+    """
+    upload = ChunkedUpload.objects.select_for_update().select_related('case').get(upload_id=upload_id)
+    if upload.status == 'complete':
+        return upload, upload.document
+    if upload.status != 'uploading':
+        raise ChunkedUploadError(f'Upload is {upload.status}', status=409)
+
+    parts = list(upload.parts.order_by('index'))
+    missing = sorted(set(range(upload.chunk_count)) - {part.index for part in parts})
+    if missing:
+        raise ChunkedUploadError(
+            f'{len(missing)} chunk(s) missing, first at offset {missing[0] * upload.chunk_size}', status=409
+        )
+
+    linked_name = None
+    if not upload.multipart_id:
+        linked_name = upload.storage_name = _link_into_place(storage, upload)
+        transaction.on_commit(lambda: storage.delete(partial_name(upload)))
+
+    try:
+        document = CaseDocument(
+            case=upload.case,
+            document_type=upload.document_type,
+            original_filename=f"{upload.case.employee_last_name}_{upload.filename}",
+            file_size=upload.total_size,
+            uploaded_by=upload.uploaded_by,
+            notes=upload.notes,
+            file=upload.storage_name,
+        )
+        save_documents([document])
+        upload.document = document
+        upload.status = 'complete'
+        upload.save()
+        upload.parts.all().delete()
+
+        if upload.multipart_id:
+            storage.bucket.meta.client.complete_multipart_upload(
+                Bucket=storage.bucket_name,
+                Key=_bucket_key(storage, upload.storage_name),
+                UploadId=upload.multipart_id,
+                MultipartUpload={'Parts': [{'ETag': part.etag, 'PartNumber': part.index + 1} for part in parts]},
+            )
+            assembled.append(upload.storage_name)
+    except Exception:
+        # Rolled back: drop the final-name link; the partial file stays for a retry
+        if linked_name:
+            storage.delete(linked_name)
+        raise
+    return upload, document
+
+
+def _fail_assembled_upload(upload_id, name):
+    """
+    The S3 object was assembled but the transaction did not commit. Its
+    multipart upload no longer exists, so the upload cannot be retried: queue
+    the object for deletion and mark the upload failed.
+    """
+    logger.error(f'Chunked upload {upload_id} was assembled as {name} but not saved; discarding it')
+    try:
+        with transaction.atomic():
+            PendingStorageDeletion.objects.create(name=name)
+            upload = ChunkedUpload.objects.select_for_update().get(upload_id=upload_id)
+            upload.status = 'failed'
+            upload.save(update_fields=['status', 'updated_at'])
+            upload.parts.all().delete()
+    except Exception:
+        logger.exception(f'Could not record the failure of chunked upload {upload_id}; reconcile_storage reports {name}')
+
+
+def abort_upload(upload, storage=None):
+    """Discard an unfinished upload and whatever chunks reached storage"""
+    storage = storage or default_storage
+    if upload.status != 'uploading':
+        return
+    if upload.multipart_id:
+        storage.bucket.meta.client.abort_multipart_upload(
+            Bucket=storage.bucket_name,
+            Key=_bucket_key(storage, upload.storage_name),
+            UploadId=upload.multipart_id,
+        )
+    else:
+        PendingStorageDeletion.objects.create(name=partial_name(upload))
+    upload.status = 'aborted'
+    upload.save(update_fields=['status', 'updated_at'])
+    upload.parts.all().delete()
+
+
+def abort_stale_uploads(max_age_hours=None, storage=None):
+    """
+    Abort uploads that received nothing for max_age_hours
+    (default CHUNKED_UPLOAD_EXPIRE_HOURS).
+
+    Returns:
+        tuple: (aborted, failed)
+    """
+    storage = storage or default_storage
+    if max_age_hours is None:
+        max_age_hours = settings.CHUNKED_UPLOAD_EXPIRE_HOURS
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    aborted = failed = 0
+    stale = ChunkedUpload.objects.filter(status='uploading', updated_at__lt=cutoff)
+    for upload in stale.iterator(chunk_size=200):
+        # Chunks touch their part rows, not the upload row
+        if upload.parts.filter(received_at__gte=cutoff).exists():
+            continue
+        try:
+            abort_upload(upload, storage)
+            aborted += 1
+        except Exception as e:
+            logger.warning(f'Could not abort chunked upload {upload.upload_id}: {str(e)}')
+            failed += 1
+    if _uses_bucket(storage):
+        aborted += _abort_untracked_multipart_uploads(storage, cutoff)
+    return aborted, failed
+
+
+def _abort_untracked_multipart_uploads(storage, cutoff):
+    """
+    Abort S3 multipart uploads under case_documents/ that no uploading row
+    tracks, e.g. because their case was deleted. Returns how many were aborted.
+    """
+    client = storage.bucket.meta.client
+    location = f'{storage.location.strip("/")}/' if storage.location else ''
+    tracked = set(ChunkedUpload.objects.filter(status='uploading').values_list('multipart_id', flat=True))
+    aborted = 0
+    for page in client.get_paginator('list_multipart_uploads').paginate(
+        Bucket=storage.bucket_name,
+        Prefix=f'{location}case_documents/',
+    ):
+        for item in page.get('Uploads', []):
+            if item['UploadId'] in tracked or item['Initiated'] >= cutoff:
+                continue
+            client.abort_multipart_upload(Bucket=storage.bucket_name, Key=item['Key'], UploadId=item['UploadId'])
+            aborted += 1
+    return aborted
@@ -0,0 +1,126 @@
+"""
+Service for storing uploaded case documents.
+
+The files of one form post are written to storage concurrently by a bounded
+thread pool (DOCUMENT_UPLOAD_WORKERS), so 20 attachments cost about as long
+as the slowest few PUTs instead of 20 sequential ones. The CaseDocument rows
+are then created with one bulk_create. If any upload or the database
+transaction fails, the blobs already written are deleted again, so a failed
+submission leaves no orphaned files behind.
+
+On Spaces, S3Boto3Storage uploads through s3transfer: files above
+AWS_S3_TRANSFER_CONFIG's multipart threshold go up as multipart uploads read
+from the request's temporary file (Django spools uploads over
+FILE_UPLOAD_MAX_MEMORY_SIZE to disk), never held in memory whole.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from cases.models import CaseDocument, PendingStorageDeletion
+from cases.services import storage_deletion_service
+from cases.services.page_cache_service import bump_case_page_version
+
+logger = logging.getLogger(__name__)
+
+
+def build_documents(case, files, document_type, uploaded_by, notes=''):
+    """
+    Unsaved CaseDocument rows for uploaded files.
+
+    case may itself be unsaved: the stored name only needs the employee's last
+    name (case_document_upload_path), and the case id is read at save time.
+    """
+    return [
+        CaseDocument(
+            case=case,
+            document_type=document_type,
+            original_filename=f"{case.employee_last_name}_{uploaded_file.name}",
+            file_size=uploaded_file.size,
+            uploaded_by=uploaded_by,
+            notes=notes,
+            file=uploaded_file,
+        )
+        for uploaded_file in files
+    ]
+
+
+def _store(document):
+    uploaded_file = document.file.file
+    document.file.save(uploaded_file.name, uploaded_file, save=False)
+
+
+def upload_files(documents):
+    """
+    Write the documents' files to storage in parallel and set their stored names.
+
+    Raises the first upload error after deleting the files that were stored.
+    """
+    if not documents:
+        return
+    if len(documents) == 1:
+        _store(documents[0])
+        return
+
+    workers = min(settings.DOCUMENT_UPLOAD_WORKERS, len(documents))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='document-upload') as executor:
+        futures = [executor.submit(_store, document) for document in documents]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        stored = [document for document, future in zip(documents, futures) if future.exception() is None]
+        discard_files(stored)
+        raise errors[0]
+
+
+def discard_files(documents):
+    """Delete stored files of documents whose rows were not created; queue them if storage fails"""
+    names = [document.file.name for document in documents if document.file and document.file._committed]
+    if not names:
+        return
+    try:
+        failed = storage_deletion_service.delete_files(names)
+    except Exception as e:
+        logger.error(f"Could not remove {len(names)} uploaded file(s) after a failed upload: {str(e)}")
+        failed = names
+    if failed:
+        PendingStorageDeletion.objects.bulk_create([PendingStorageDeletion(name=name) for name in failed])
+
+
+def save_documents(documents):
+    """
+    Create the rows with one INSERT. bulk_create skips post_save, so the case
+    page cache is invalidated here, in the same transaction.
+    """
+    CaseDocument.objects.bulk_create(documents)
+    if documents and documents[0].pk is None:
+        # Backends without INSERT ... RETURNING (MySQL): read the ids back by stored name
+        ids = dict(
+            CaseDocument.objects.filter(
+                case_id=documents[0].case_id,
+                file__in=[document.file.name for document in documents],
+            ).values_list('file', 'id')
+        )
+        for document in documents:
+            document.pk = ids.get(document.file.name)
+    case_ids = {document.case_id for document in documents}
+    bump_case_page_version(*case_ids)
+
+
+def create_case_documents(case, files, document_type, uploaded_by, notes=''):
+    """
+    Upload files and create their CaseDocument rows for a saved case.
+
+    Returns:
+        list: The created CaseDocument objects
+    """
+    documents = build_documents(case, files, document_type, uploaded_by, notes)
+    upload_files(documents)
+    try:
+        with transaction.atomic():
+            save_documents(documents)
+    except Exception:
+        discard_files(documents)
+        raise
+    return documents
@@ -8,7 +8,9 @@ from django.utils.html import strip_tags
 from django.conf import settings
 from django.utils import timezone
 from core.models import SystemSettings, AuditLog
+from core.prometheus import EMAIL_SEND_DURATION
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,7 @@ def send_email_notification(
         logger.warning(f'No recipient email for: {subject}')
         return False
     
+    send_started = time.perf_counter()
     try:
         # Render template
         html_message = render_to_string(f'emails/{template_name}', context)
@@ -66,6 +69,7 @@ def send_email_notification(
             html_message=html_message,
             fail_silently=False,
         )
+        EMAIL_SEND_DURATION.observe(time.perf_counter() - send_started, template=template_name, outcome='success')
         
         # Log to audit trail
         AuditLog.log_activity(
@@ -85,6 +89,7 @@ def send_email_notification(
         
     except Exception as e:
         logger.error(f'Failed to send email {subject} to {recipient_email}: {str(e)}')
+        EMAIL_SEND_DURATION.observe(time.perf_counter() - send_started, template=template_name, outcome='failure')
         
         # Log failure to audit trail
         AuditLog.log_activity(
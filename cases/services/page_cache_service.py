@@ -0,0 +1,104 @@
+"""
+Service for caching rendered case_detail pages of released cases.
+
+A case that is completed with actual_release_date set rarely changes, but
+members keep reopening it. Its rendered page is cached per case and per
+viewer (the page embeds the viewer's name, font size and role-specific
+controls) for members and technicians. Admin and manager pages embed the
+live audit trail and are never cached.
+
+Validity is tracked with a per-case VersionStamp row (scope case_page), so an
+invalidation made by any process - another worker, the admin, run_scheduler -
+is seen by every worker even with the per-process locmem cache. A hit costs
+one indexed stamp query and one cache get:
+    VersionStamp(case_page, <case_id>)   -> version, bumped on every change
+    case_page:<case_id>:<user_id>:<role> -> {'version', 'html'}
+Receivers in cases/models.py call bump_case_page_version() when the case
+(including admin edits and status changes) or its documents, notes, reports,
+messages, review history or change requests are saved or deleted. The bump
+runs in the writer's transaction, so a rolled-back change invalidates nothing.
+
+CSRF tokens are stripped before storing and the viewer's own token is put
+back on every hit.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+
+from cases.services import version_stamp_service
+
+CACHED_ROLES = ('member', 'technician')
+
+_CSRF_PLACEHOLDER = '__CASE_PAGE_CSRF_TOKEN__'
+_CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([A-Za-z0-9]+)"')
+
+
+def _page_key(case_id, user):
+    return f'case_page:{case_id}:{user.id}:{user.role}:{user.font_size}'
+
+
+def is_released(case):
+    """Released cases are the only ones whose pages are cached"""
+    return case.status == 'completed' and case.actual_release_date is not None
+
+
+def bump_case_page_version(*case_ids):
+    """Invalidate cached pages for the given cases (all viewers, all processes)"""
+    version_stamp_service.bump_case_page_version(*case_ids)
+
+
+def _is_cacheable_request(request):
+    if request.method != 'GET' or request.GET:
+        return False
+    if request.user.role not in CACHED_ROLES:
+        return False
+    # Pages that render pending flash messages or a session font-size override are not shared
+    if request.session.get('user_font_size'):
+        return False
+    return len(get_messages(request)) == 0
+
+
+def get_cached_page(request, case_id):
+    """
+    Look up the rendered page for this viewer. Costs one stamp query and one
+    cache round trip.
+
+    Call before loading the case: on a miss the returned version is the one
+    current before rendering started, so a change that lands mid-render
+    leaves the stored copy already invalid.
+
+    Returns:
+        tuple: (html or None, version to pass to store_page)
+    """
+    if not _is_cacheable_request(request):
+        return None, None
+
+    version = version_stamp_service.get_case_page_version(case_id)
+    entry = cache.get(_page_key(case_id, request.user))
+    if entry is None or entry['version'] != version:
+        return None, version
+    return entry['html'].replace(_CSRF_PLACEHOLDER, get_token(request)), version
+
+
+def store_page(request, case, html, version):
+    """
+    Cache a freshly rendered page if the case is released and the request is
+    cacheable. Call only after the view's permission checks have passed.
+    """
+    if version is None or not is_released(case) or not _is_cacheable_request(request):
+        return
+
+    # Every {% csrf_token %} / {{ csrf_token }} in one render shares a single token value
+    match = _CSRF_INPUT_RE.search(html)
+    if not match:
+        return
+    html = html.replace(match.group(1), _CSRF_PLACEHOLDER)
+
+    cache.set(
+        _page_key(case.id, request.user),
+        {'version': version, 'html': html},
+        settings.CASE_PAGE_CACHE_TIMEOUT
+    )
@@ -2,9 +2,15 @@
 Handle PDF form field operations using pypdf library
 """
 import os
+import html
 import logging
+import threading
 from pypdf import PdfReader, PdfWriter
 from io import BytesIO
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.html import strip_tags
+from cases.constants import PDF_TEMPLATE_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -111,3 +117,150 @@ def extract_pdf_field_values(pdf_bytes):
     except Exception as e:
         logger.error(f"Error extracting field values: {str(e)}")
         return {}
+
+
+# ============================================================================
+# FEDERAL FACT FINDER TEMPLATE FILLING
+# ============================================================================
+# Text fields of Federal-Fact-Finder-Template.pdf -> dotted path in fact_finder_data
+FACT_FINDER_TEXT_FIELDS = {
+    'A 1': 'basic_information.employee_name',
+    'A 2': 'basic_information.spouse_name',
+    'A 3': 'basic_information.address',
+    'A 4': 'basic_information.dob',
+    'C 2': 'mad.notes',
+}
+
+# Checkboxes -> (dotted path, value that ticks the box)
+FACT_FINDER_CHECKBOX_FIELDS = {
+    'B 1': ('retirement_system', 'CSRS'),
+    'B 2': ('retirement_system', 'CSRS Offset'),
+    'B 3': ('retirement_system', 'FERS'),
+    'B 4': ('retirement_system', 'FERS Transfer'),
+    'B 5': ('employee_type', 'Regular'),
+    'B 6': ('employee_type', 'Offset'),
+    'B 7': ('employee_type', 'Postal Worker'),
+    'B 8': ('employee_type', 'Unsure'),
+}
+
+_fact_finder_template = None
+_fact_finder_template_lock = threading.Lock()
+
+
+def _load_fact_finder_template():
+    """
+    Parse the Fact Finder template once per process.
+    
+    Returns:
+        tuple: (PdfReader, {checkbox field name: its "on" appearance state})
+    """
+    global _fact_finder_template
+    if _fact_finder_template is None:
+        with _fact_finder_template_lock:
+            if _fact_finder_template is None:
+                path = os.path.join(settings.BASE_DIR, PDF_TEMPLATE_PATH)
+                with open(path, 'rb') as handle:
+                    reader = PdfReader(BytesIO(handle.read()))
+                on_states = {}
+                for page in reader.pages:
+                    for annotation in page.get('/Annots') or []:
+                        widget = annotation.get_object()
+                        parent = widget.get('/Parent')
+                        name = widget.get('/T') or (parent.get_object().get('/T') if parent else None)
+                        if name in FACT_FINDER_CHECKBOX_FIELDS and '/AP' in widget:
+                            states = [state for state in widget['/AP']['/N'] if state != '/Off']
+                            if states:
+                                on_states[name] = states[0]
+                logger.info(f"Loaded Fact Finder template: {len(reader.pages)} pages, {len(reader.get_fields() or {})} fields")
+                _fact_finder_template = (reader, on_states)
+    return _fact_finder_template
+
+
+def unmapped_template_fields():
+    """Form fields of the Fact Finder template that neither field map fills"""
+    reader, _ = _load_fact_finder_template()
+    mapped = set(FACT_FINDER_TEXT_FIELDS) | set(FACT_FINDER_CHECKBOX_FIELDS)
+    return sorted(set(reader.get_fields() or {}) - mapped)
+
+
+def check_fact_finder_renderer():
+    """
+    Refuse FACT_FINDER_PDF_RENDERER = 'form' until the field maps cover the
+    template; otherwise cases would get a mostly blank Fact Finder marked completed.
+    
+    Raises:
+        ImproperlyConfigured: If the setting is unknown, or 'form' is selected and
+        the template is missing or has unmapped fields
+    """
+    renderer = settings.FACT_FINDER_PDF_RENDERER
+    if renderer not in ('html', 'form'):
+        raise ImproperlyConfigured(f"FACT_FINDER_PDF_RENDERER must be 'html' or 'form', not {renderer!r}")
+    if renderer != 'form':
+        return
+    try:
+        unmapped = unmapped_template_fields()
+    except OSError as e:
+        raise ImproperlyConfigured(f"FACT_FINDER_PDF_RENDERER is 'form' but the template cannot be read: {e}")
+    if unmapped:
+        raise ImproperlyConfigured(
+            f"FACT_FINDER_PDF_RENDERER is 'form' but {len(unmapped)} field(s) of {PDF_TEMPLATE_PATH} "
+            f"are not mapped in cases/services/pdf_form_handler.py (first: {', '.join(unmapped[:5])}); "
+            f"use 'html' until the map covers the template"
+        )
+
+
+def _lookup(data, path):
+    value = data
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return ''
+        value = value.get(key, '')
+    return value
+
+
+def fact_finder_field_values(data):
+    """
+    Map fact_finder_data onto the Fact Finder template's form fields.
+    
+    Args:
+        data (dict): Case.fact_finder_data
+    
+    Returns:
+        dict: field_name -> value, ready for fill_fact_finder_template
+    """
+    _, on_states = _load_fact_finder_template()
+    field_values = {}
+    for field_name, path in FACT_FINDER_TEXT_FIELDS.items():
+        value = _lookup(data, path)
+        if value not in ('', None):
+            # Notes come from TinyMCE as HTML; form fields hold plain text
+            field_values[field_name] = html.unescape(strip_tags(str(value))).strip()
+    for field_name, (path, checked_value) in FACT_FINDER_CHECKBOX_FIELDS.items():
+        if _lookup(data, path) == checked_value:
+            field_values[field_name] = on_states.get(field_name, '/Yes')
+    return field_values
+
+
+def fill_fact_finder_template(data):
+    """
+    Fill the official Federal Fact Finder template from fact_finder_data.
+    
+    Much faster than laying out the HTML template with WeasyPrint: the
+    template is parsed once per process and only field values are written.
+    
+    Args:
+        data (dict): Case.fact_finder_data
+    
+    Returns:
+        tuple: (PDF bytes, page count)
+    """
+    reader, _ = _load_fact_finder_template()
+    field_values = fact_finder_field_values(data)
+    # PdfReader resolves objects lazily from its stream, so cloning is serialized
+    with _fact_finder_template_lock:
+        writer = PdfWriter(clone_from=reader)
+    writer.update_page_form_field_values(None, field_values, auto_regenerate=True)
+    
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue(), len(writer.pages)
@@ -1,28 +1,70 @@
 """
 PDF Generation Service for Federal Fact Finder Forms
-Uses WeasyPrint to convert HTML templates to PDF
+Uses WeasyPrint to convert HTML templates to PDF, or fills the official
+template's form fields with pypdf (settings.FACT_FINDER_PDF_RENDERER = 'form')
 NOTE: Requires GTK libraries on Windows (works natively on Linux/production)
 """
 import io
 import logging
 import platform
+import time
+from django.conf import settings
 from django.template.loader import render_to_string
 from django.core.files.base import ContentFile
 from django.utils import timezone
+from cases.services.pdf_form_handler import fill_fact_finder_template
+from cases.services.pdf_renderer import render_pdf
+from core.prometheus import PDF_RENDER_DURATION, PDF_SIZE
 
 logger = logging.getLogger(__name__)
 
 # Check if WeasyPrint is available (may fail on Windows without GTK)
 WEASYPRINT_AVAILABLE = False
 try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
+    import weasyprint  # noqa: F401
     WEASYPRINT_AVAILABLE = True
 except OSError as e:
     logger.warning(f"WeasyPrint not fully functional: {e}. PDF generation will be skipped on this system.")
     logger.warning("This is expected on Windows without GTK libraries. PDFs will work on Linux/production server.")
 
 
+def render_fact_finder_html(case):
+    """
+    Render the Federal Fact Finder PDF template for a case.
+    
+    Args:
+        case: Case instance with fact_finder_data populated
+    
+    Returns:
+        HTML string, rendered with pdf_renderer's 'fact_finder' stylesheet
+    """
+    # Use fact_finder_data JSON which contains the complete form submission
+    # This includes all 236 fields: basic info, retirement, TSP, insurance, military service, 
+    # and most importantly - ALL NOTES FIELDS from every section
+    data = case.fact_finder_data or {}
+    
+    # Note: FederalFactFinder model exists for structured queries but fact_finder_data 
+    # is the authoritative source for PDF generation as it captures everything from the form
+    
+    # Prepare context data for template
+    # Template expects both nested (data.section.field) AND direct access (section.field)
+    context = {
+        'case': case,
+        'data': data,  # Nested structure for data.basic_information.X
+        'employee_name': f"{case.employee_first_name} {case.employee_last_name}",
+        'workshop_code': case.workshop_code,
+        'member_name': f"{case.member.first_name} {case.member.last_name}" if case.member else "Unknown",
+        'date_submitted': case.created_at,
+        # Legacy template references - aliases for renamed sections
+        'fact_finder': data.get('add_info', {}),
+        'military': data.get('mad', {}),  # Template uses 'military' but data saved as 'mad'
+        # Unpack all sections for direct access (tsp.X, fegli.X, etc.)
+        **data
+    }
+    
+    return render_to_string('cases/fact_finder_pdf_professional.html', context)
+
+
 def generate_fact_finder_pdf(case):
     """
     Generate PDF from Federal Fact Finder form data.
@@ -38,13 +80,16 @@ def generate_fact_finder_pdf(case):
     """
     from cases.models import CaseDocument
     
-    # Check if WeasyPrint is available
-    if not WEASYPRINT_AVAILABLE:
+    renderer = settings.FACT_FINDER_PDF_RENDERER
+    
+    # Check if WeasyPrint is available (the form renderer only needs pypdf)
+    if renderer != 'form' and not WEASYPRINT_AVAILABLE:
         logger.warning(f"PDF generation skipped for case {case.id} - WeasyPrint not available on this system")
         case.fact_finder_pdf_status = 'pending'
         case.save(update_fields=['fact_finder_pdf_status'])
         return None
     
+    render_started = time.perf_counter()
     try:
         logger.info(f"Starting PDF generation for case {case.id}")
         
@@ -52,41 +97,17 @@ def generate_fact_finder_pdf(case):
         case.fact_finder_pdf_status = 'generating'
         case.save(update_fields=['fact_finder_pdf_status'])
         
-        # Use fact_finder_data JSON which contains the complete form submission
-        # This includes all 236 fields: basic info, retirement, TSP, insurance, military service, 
-        # and most importantly - ALL NOTES FIELDS from every section
-        data = case.fact_finder_data or {}
-        
-        # Note: FederalFactFinder model exists for structured queries but fact_finder_data 
-        # is the authoritative source for PDF generation as it captures everything from the form
-        
-        # Prepare context data for template
-        # Template expects both nested (data.section.field) AND direct access (section.field)
-        context = {
-            'case': case,
-            'data': data,  # Nested structure for data.basic_information.X
-            'employee_name': f"{case.employee_first_name} {case.employee_last_name}",
-            'workshop_code': case.workshop_code,
-            'member_name': f"{case.member.first_name} {case.member.last_name}" if case.member else "Unknown",
-            'date_submitted': case.created_at,
-            # Legacy template references - aliases for renamed sections
-            'fact_finder': data.get('add_info', {}),
-            'military': data.get('mad', {}),  # Template uses 'military' but data saved as 'mad'
-            # Unpack all sections for direct access (tsp.X, fegli.X, etc.)
-            **data
-        }
-        
-        # Render HTML template
-        html_string = render_to_string('cases/fact_finder_pdf_professional.html', context)
-        
-        # Configure fonts for WeasyPrint
-        font_config = FontConfiguration()
-        
-        # Generate PDF in memory
         pdf_file = io.BytesIO()
-        html = HTML(string=html_string)
-        html.write_pdf(pdf_file, font_config=font_config)
+        if renderer == 'form':
+            # Fill the official template's AcroForm fields
+            pdf_bytes, _ = fill_fact_finder_template(case.fact_finder_data or {})
+        else:
+            # Render HTML template; stylesheet and fonts are shared per process
+            pdf_bytes, _ = render_pdf(render_fact_finder_html(case), 'fact_finder')
+        pdf_file.write(pdf_bytes)
         pdf_file.seek(0)
+        PDF_RENDER_DURATION.observe(time.perf_counter() - render_started, renderer=renderer, outcome='success')
+        PDF_SIZE.observe(pdf_file.getbuffer().nbytes)
         
         # Generate filename
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
@@ -115,6 +136,7 @@ def generate_fact_finder_pdf(case):
         
     except Exception as e:
         logger.exception(f"PDF generation failed for case {case.id}: {str(e)}")
+        PDF_RENDER_DURATION.observe(time.perf_counter() - render_started, renderer=renderer, outcome='failure')
         
         # Update status to failed
         case.fact_finder_pdf_status = 'failed'
@@ -140,3 +162,68 @@ def get_fact_finder_pdf(case):
         case=case,
         document_type='fact_finder'
     ).order_by('-uploaded_at').first()
+
+
+def render_report_notes_html(case):
+    """
+    Render the report notes PDF (technician notes to the advisor) for a case.
+    
+    Args:
+        case: Case instance with report_notes_to_member populated
+    
+    Returns:
+        HTML string, rendered with pdf_renderer's 'report_notes' stylesheet
+    """
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+    </head>
+    <body>
+        <div class="header">
+            <h1>Case Notes & Advisor Information</h1>
+            <p>Generated on {timezone.now().strftime('%B %d, %Y at %I:%M %p')}</p>
+        </div>
+
+        <div class="meta-info">
+            <div class="meta-item">
+                <div class="meta-label">Case ID:</div>
+                <div>{case.external_case_id}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Workshop Code:</div>
+                <div>{case.workshop_code}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Employee Name:</div>
+                <div>{case.employee_first_name} {case.employee_last_name}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Status:</div>
+                <div>{case.get_status_display()}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Completion Date:</div>
+                <div>{case.date_completed.strftime('%B %d, %Y') if case.date_completed else 'N/A'}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Report Count:</div>
+                <div>{case.num_reports_requested}</div>
+            </div>
+        </div>
+
+        <div class="notes-section">
+            <h2>Technical Notes to Advisor</h2>
+            <div class="notes-content">
+                {case.report_notes_to_member}
+            </div>
+        </div>
+
+        <div class="footer">
+            <p>These notes are confidential and intended for the case advisor only.</p>
+            <p>This document was automatically generated from the Advisor Portal.</p>
+        </div>
+    </body>
+    </html>
+    """
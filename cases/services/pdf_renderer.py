@@ -0,0 +1,106 @@
+"""
+Shared WeasyPrint Renderer
+Builds the FontConfiguration and compiles the PDF stylesheets
+(cases/static/css/pdf/) ahead of time, so each render only parses the
+per-case HTML. WeasyPrint's font configuration is not thread-safe, so the
+process keeps a pool of (font configuration, stylesheets) sets: a render
+checks one out, builds a new set only when the pool is empty, and returns it
+afterwards. Concurrent renders run in parallel on separate sets, and the
+pool holds as many sets as renders ever ran at once, whichever thread
+serves the request (sync workers, ASGI's per-request executors, runserver).
+One set is built synchronously when a web process loads config/wsgi.py or
+config/asgi.py (management commands never pay for it): with gunicorn
+--preload that happens in the master before it forks, otherwise in each
+worker before it accepts requests.
+"""
+import logging
+import queue
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STYLESHEET_DIR = Path(__file__).resolve().parent.parent / 'static' / 'css' / 'pdf'
+STYLESHEETS = {
+    'fact_finder': 'fact_finder_professional.css',
+    'report_notes': 'report_notes.css',
+}
+
+# Tiny document rendered during warm-up so fonts are resolved before the first real PDF
+WARM_UP_HTML = '<p>Warm-up <strong>bold</strong> <em>italic</em></p>'
+
+# Idle resource sets; LIFO so the most recently used (warmest) set is reused first
+_pool = queue.LifoQueue()
+
+
+def _build_resources():
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    stylesheets = {
+        name: CSS(filename=str(STYLESHEET_DIR / filename), font_config=font_config)
+        for name, filename in STYLESHEETS.items()
+    }
+    return font_config, stylesheets
+
+
+def _checkout_resources():
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _build_resources()
+
+
+def _return_resources(resources):
+    _pool.put(resources)
+
+
+def render_pdf(html_string, stylesheet):
+    """
+    Render HTML to PDF with a precompiled stylesheet.
+
+    Args:
+        html_string (str): Document HTML without its stylesheet
+        stylesheet (str): Key of STYLESHEETS
+
+    Returns:
+        tuple: (PDF bytes, page count)
+    """
+    from weasyprint import HTML
+
+    resources = _checkout_resources()
+    try:
+        font_config, stylesheets = resources
+        document = HTML(string=html_string).render(stylesheets=[stylesheets[stylesheet]], font_config=font_config)
+        return document.write_pdf(), len(document.pages)
+    finally:
+        _return_resources(resources)
+
+
+def warm_up():
+    """Pre-fill the pool with one resource set and resolve fonts with a throwaway render"""
+    from cases.services.pdf_generator import WEASYPRINT_AVAILABLE
+
+    if not WEASYPRINT_AVAILABLE:
+        return
+    started = time.perf_counter()
+    try:
+        for stylesheet in STYLESHEETS:
+            render_pdf(WARM_UP_HTML, stylesheet)
+    except Exception as e:
+        logger.warning(f"PDF renderer warm-up failed: {str(e)}")
+        return
+    logger.info(f"PDF renderer warmed up in {time.perf_counter() - started:.2f}s")
+
+
+def warm_up_on_startup():
+    """
+    Warm up in the loading thread, before the server accepts requests. Not in a
+    background thread: one racing gunicorn's fork would leave workers half warm.
+    """
+    if not settings.PDF_RENDERER_WARM_UP:
+        return
+    warm_up()
@@ -0,0 +1,103 @@
+"""
+Service for cached UserPreference lookups.
+
+Dashboards read several preferences per page (saved technician view, visible
+columns per dashboard) and the JS reads them again on load. Lookups go through
+two tiers:
+
+1. Request memo - the preference dict is kept on the User instance, which
+   lives for one request (request.user), so repeated reads are free.
+2. Django cache - all of a user's preferences under one key, loaded with a
+   single query on first access and kept for PREFERENCE_CACHE_TIMEOUT seconds.
+   The entry is tagged with a preference-only version counter that lives in
+   the cache itself; receivers in cases/models.py increment it after every
+   UserPreference save or delete commits (admin edits included), so a hit
+   costs no queries. With the shared file/redis cache a change made in one
+   worker is seen by all of them; the per-process locmem default only
+   invalidates the worker that made the change.
+
+Writes should go through set_preference() so the request memo is dropped too.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.models import UserPreference
+
+_MEMO_ATTR = '_preference_cache'
+
+
+def _cache_key(user_id):
+    return f'user_preferences:{user_id}'
+
+
+def _version_key(user_id):
+    return f'user_preferences_version:{user_id}'
+
+
+def bump_preferences_version(user_id):
+    """Supersede the user's cached preferences in every process sharing the cache"""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        # Never read or evicted: reseed with a value no cached entry carries
+        cache.add(_version_key(user_id), time.time_ns(), None)
+
+
+def get_preferences(user):
+    """
+    All preferences for a user as {preference_key: preference_value}.
+    Do not mutate the returned dict or its values - they are shared.
+    """
+    preferences = getattr(user, _MEMO_ATTR, None)
+    if preferences is not None:
+        return preferences
+
+    key, version_key = _cache_key(user.id), _version_key(user.id)
+    cached = cache.get_many([key, version_key])
+    version = cached.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key)
+
+    entry = cached.get(key)
+    if entry is not None and entry[0] == version:
+        preferences = entry[1]
+    else:
+        preferences = dict(
+            UserPreference.objects.filter(user=user).values_list('preference_key', 'preference_value')
+        )
+        cache.set(key, (version, preferences), settings.PREFERENCE_CACHE_TIMEOUT)
+
+    setattr(user, _MEMO_ATTR, preferences)
+    return preferences
+
+
+def get_preference(user, preference_key, default=None):
+    """Single preference value (default if the user never saved it)"""
+    return get_preferences(user).get(preference_key, default)
+
+
+def set_preference(user, preference_key, value):
+    """
+    Save a preference and invalidate the user's cached preferences (the
+    post_save receiver bumps the preference version).
+
+    Returns:
+        tuple: (UserPreference, created)
+    """
+    preference, created = UserPreference.objects.update_or_create(
+        user=user,
+        preference_key=preference_key,
+        defaults={'preference_value': value}
+    )
+    invalidate_preferences(user)
+    return preference, created
+
+
+def invalidate_preferences(user):
+    """Drop the request memo; the cache entry is superseded by the bumped preference version"""
+    if hasattr(user, _MEMO_ATTR):
+        delattr(user, _MEMO_ATTR)
@@ -0,0 +1,108 @@
+"""
+Service listing the hot queries that must stay index-backed, and checking
+their query plans.
+
+Each hot query is registered by name with a function returning the queryset
+(as the code that runs it builds it). explain_hot_queries runs EXPLAIN on
+every one and fails on a full table scan, so a dropped index or a changed
+filter that no index covers is caught before it reaches production.
+
+Full-scan detection per database:
+- SQLite:     'SCAN <table>' without an index in EXPLAIN QUERY PLAN
+- PostgreSQL: 'Seq Scan on <table>' (checked with enable_seqscan off, so
+              small development tables don't hide a missing index)
+- MySQL:      type = ALL with no possible_keys (type = ALL with a usable
+              index is the optimizer preferring a scan of a small table,
+              reported as a warning)
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+_HOT_QUERIES = {}
+
+
+def register_hot_query(name, queryset_factory):
+    """
+    Register a query to be plan-checked.
+
+    Args:
+        name: Dotted label, e.g. 'scheduler.due_releases'
+        queryset_factory: Callable returning the QuerySet to explain
+    """
+    _HOT_QUERIES[name] = queryset_factory
+
+
+def get_hot_queries():
+    _register_builtin_queries()
+    return dict(_HOT_QUERIES)
+
+
+def _register_builtin_queries():
+    if 'scheduler.due_releases' in _HOT_QUERIES:
+        return
+    from cases.services import api_integration, scheduler_service
+    from cases.services.rollup_service import REBUILD_OVERLAP
+    from cases.models import Case
+
+    register_hot_query('scheduler.due_releases', scheduler_service.due_releases)
+    register_hot_query('scheduler.due_emails', scheduler_service.due_emails)
+    register_hot_query('scheduler.pending_releases', lambda: scheduler_service.pending_releases()[:500])
+    register_hot_query('scheduler.pending_emails', lambda: scheduler_service.pending_emails()[:500])
+    register_hot_query('api_sync.failed_submissions', api_integration.get_failed_submissions)
+    register_hot_query('rollups.changed_cases', lambda: Case.objects.filter(
+        updated_at__gte=timezone.now() - timedelta(minutes=5) - REBUILD_OVERLAP
+    ))
+
+
+def explain(queryset):
+    """
+    Query plan of a queryset.
+
+    Returns:
+        tuple: (sql with params inlined, for display only; list of plan rows as dicts)
+    """
+    sql, params = queryset.query.sql_with_params()
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(prefix + sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    return sql % tuple(repr(param) for param in params), rows
+
+
+def find_full_scans(plan_rows):
+    """
+    Plan rows that are full table scans.
+
+    Returns:
+        tuple: (errors, warnings) - lists of plan descriptions
+    """
+    errors, warnings = [], []
+    for row in plan_rows:
+        if connection.vendor == 'sqlite':
+            detail = row.get('detail', '')
+            if detail.startswith('SCAN ') and ' INDEX ' not in detail:
+                errors.append(detail)
+        elif connection.vendor == 'postgresql':
+            line = next(iter(row.values()))
+            if 'Seq Scan on' in line:
+                errors.append(line.strip())
+        elif connection.vendor == 'mysql':
+            if row.get('type') == 'ALL':
+                description = f"{row.get('table')}: type=ALL, possible_keys={row.get('possible_keys')}"
+                (warnings if row.get('possible_keys') else errors).append(description)
+    return errors, warnings
+
+
+def format_plan(plan_rows):
+    """Plan rows as text lines for display"""
+    if connection.vendor == 'sqlite':
+        return [row['detail'] for row in plan_rows]
+    if connection.vendor == 'postgresql':
+        return [next(iter(row.values())) for row in plan_rows]
+    return [', '.join(f'{key}={value}' for key, value in row.items()) for row in plan_rows]
@@ -0,0 +1,111 @@
+"""
+Realtime push service for dashboard badges and member notifications.
+
+Views publish events here when messages are posted or read, when a case is put
+on hold, and when a CaseNotification is created. The Server-Sent Events stream
+(cases/views_events.py) subscribes once per open browser tab.
+
+Subscribers living in the same worker process are woken immediately. Streams
+served by other gunicorn workers pick the change up on their next DB poll, which
+is a single cheap aggregate per user instead of the full JSON endpoints.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+logger = logging.getLogger(__name__)
+
+# user_id -> set of (event_loop, asyncio.Queue) for each open stream in this process
+_subscribers = defaultdict(set)
+_lock = threading.Lock()
+
+
+def subscribe(user_id):
+    """
+    Register a stream for a user. Must be called from inside the stream's event loop.
+
+    Returns:
+        asyncio.Queue that receives published events for this user
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    with _lock:
+        _subscribers[user_id].add((loop, queue))
+    return queue
+
+
+def unsubscribe(user_id, queue):
+    """Remove a stream registered with subscribe()"""
+    with _lock:
+        entries = _subscribers.get(user_id)
+        if not entries:
+            return
+        for entry in list(entries):
+            if entry[1] is queue:
+                entries.discard(entry)
+        if not entries:
+            _subscribers.pop(user_id, None)
+
+
+def get_subscriber_count():
+    """Number of open streams in this process (for diagnostics)"""
+    with _lock:
+        return sum(len(entries) for entries in _subscribers.values())
+
+
+def _deliver(user_id, event):
+    with _lock:
+        entries = list(_subscribers.get(user_id, ()))
+    for loop, queue in entries:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:
+            # Event loop already closed - stream is going away
+            pass
+
+
+def publish(user_id, event_type, data=None):
+    """
+    Push an event to every open stream for a user in this process.
+
+    Delivery waits for the surrounding transaction to commit so a stream never
+    re-reads state that is not yet visible.
+
+    Args:
+        user_id: Recipient user id (None is ignored)
+        event_type: SSE event name (e.g. 'message', 'notification', 'case_status')
+        data: JSON-serializable payload
+    """
+    if not user_id:
+        return
+    event = {'event': event_type, 'data': data or {}}
+    transaction.on_commit(lambda: _deliver(user_id, event))
+
+
+def get_badge_state(user_id):
+    """
+    Current unread counters for a user.
+
+    This is what every stream compares between polls - two indexed aggregate
+    queries regardless of how many cases or notifications the user has.
+
+    Returns:
+        dict with total_unread, unread_notifications and latest_notification_id
+    """
+    from cases.models import CaseNotification
+    from cases.services.unread_counter_service import get_total_unread
+
+    total_unread = get_total_unread(user_id)
+    notifications = CaseNotification.objects.filter(member_id=user_id).aggregate(
+        unread=Count('id', filter=Q(is_read=False)),
+        latest=Max('id'),
+    )
+    return {
+        'total_unread': total_unread,
+        'unread_notifications': notifications['unread'] or 0,
+        'latest_notification_id': notifications['latest'],
+    }
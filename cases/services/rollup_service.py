@@ -0,0 +1,341 @@
+"""
+Service for the CaseDailyFact rollup table behind the reports page.
+
+build_case_rollups() rewrites only the days that changed since the previous
+run:
+- submission days of cases saved since the last run (Case.save always
+  stamps updated_at), and
+- days queued in StaleRollupDay by receivers in cases/models.py, for changes
+  that leave no updated_at trail: deleted cases, a case whose submission
+  date moved (its old day), and deleted technicians or members.
+
+Both come from indexed reads, so a run costs the same however large Case is.
+QuerySet.update() on date_submitted and raw SQL bypass the receivers; rebuild
+with --full after such changes.
+
+get_reports_data() answers the reports page for any date range from the
+rollups. Days are submission dates in the site time zone (CST), the same
+boundary the reports date filter has always used.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, FloatField, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import User
+from cases.models import Case, CaseDailyFact, StaleRollupDay
+
+# Re-scan cases saved this long before the previous run started, to cover
+# transactions that were still open while it ran
+REBUILD_OVERLAP = timedelta(minutes=10)
+
+STATUS_LABELS = {
+    'draft': 'Draft',
+    'submitted': 'Submitted',
+    'accepted': 'Accepted',
+    'hold': 'On Hold',
+    'pending_review': 'Pending Review',
+    'completed': 'Completed',
+}
+
+
+def local_date(value):
+    """Rollup day (CST date) of a submission time"""
+    return timezone.localtime(value).date() if value else None
+
+
+def mark_days_stale(*days):
+    """Queue days for the next build_case_rollups run"""
+    StaleRollupDay.objects.bulk_create([StaleRollupDay(date=day) for day in set(days)])
+
+
+def mark_user_days_stale(user):
+    """Queue the submission days of a user's cases (as technician or member)"""
+    days = Case.objects.filter(Q(assigned_to=user) | Q(member=user)).annotate(
+        day=TruncDate('date_submitted')
+    ).values_list('day', flat=True).order_by().distinct()
+    mark_days_stale(*days)
+
+
+def _filter_days(queryset, days, field):
+    """Restrict a queryset to a set of dates (None = rows without a date)"""
+    dated = [day for day in days if day is not None]
+    condition = Q(**{f'{field}__in': dated}) if dated else Q(pk__in=[])
+    if None in days:
+        null_field = field.replace('__date', '')
+        condition |= Q(**{f'{null_field}__isnull': True})
+    return queryset.filter(condition)
+
+
+def get_last_build_time():
+    """Start time of the most recent rollup run (None if never built)"""
+    return CaseDailyFact.objects.aggregate(last=Max('built_at'))['last']
+
+
+def find_stale_days(since):
+    """
+    Days whose rollups may be out of date.
+
+    Args:
+        since: Start time of the previous run
+
+    Returns:
+        tuple: (set of dates, may include None for cases without date_submitted;
+        id of the last StaleRollupDay read, or None)
+    """
+    days = set()
+    for date_submitted in Case.objects.filter(
+        updated_at__gte=since - REBUILD_OVERLAP
+    ).values_list('date_submitted', flat=True).iterator():
+        days.add(local_date(date_submitted))
+
+    last_marker = None
+    for marker_id, day in StaleRollupDay.objects.order_by('id').values_list('id', 'date').iterator():
+        days.add(day)
+        last_marker = marker_id
+    return days, last_marker
+
+
+def _clear_stale_markers(last_marker):
+    """Drop the markers a run has handled; later ones wait for the next run"""
+    if last_marker is not None:
+        StaleRollupDay.objects.filter(id__lte=last_marker).delete()
+
+
+def _rollup(cases):
+    """Aggregate case rows into {dimension key: measures}"""
+    cases = cases.values(
+        'date_submitted', 'date_completed', 'assigned_to_id', 'member_id',
+        'status', 'urgency', 'workshop_code', 'credit_value'
+    )
+    facts = defaultdict(lambda: {
+        'case_count': 0, 'credit_count': 0, 'credit_sum': Decimal('0'),
+        'processing_count': 0, 'processing_seconds': 0,
+    })
+    for case in cases.iterator(chunk_size=2000):
+        key = (
+            local_date(case['date_submitted']),
+            case['assigned_to_id'],
+            case['member_id'],
+            case['status'],
+            case['urgency'],
+            case['workshop_code'],
+        )
+        fact = facts[key]
+        fact['case_count'] += 1
+        if case['credit_value'] is not None:
+            fact['credit_count'] += 1
+            fact['credit_sum'] += case['credit_value']
+        if case['status'] == 'completed' and case['date_submitted'] and case['date_completed']:
+            fact['processing_count'] += 1
+            fact['processing_seconds'] += int(
+                (case['date_completed'] - case['date_submitted']).total_seconds()
+            )
+    return facts
+
+
+def _write_facts(facts, built_at):
+    CaseDailyFact.objects.bulk_create([
+        CaseDailyFact(
+            date=day,
+            assigned_to_id=assigned_to_id,
+            member_id=member_id,
+            status=status,
+            urgency=urgency,
+            workshop_code=workshop_code,
+            built_at=built_at,
+            **measures
+        )
+        for (day, assigned_to_id, member_id, status, urgency, workshop_code), measures in facts.items()
+    ], batch_size=1000)
+    return len(facts)
+
+
+def rebuild_days(days, built_at=None):
+    """
+    Recompute CaseDailyFact rows for the given days from Case.
+
+    Returns:
+        int: Number of fact rows written
+    """
+    if not days:
+        return 0
+    facts = _rollup(_filter_days(Case.objects.all(), days, 'date_submitted__date'))
+    with transaction.atomic():
+        _filter_days(CaseDailyFact.objects.all(), days, 'date').delete()
+        return _write_facts(facts, built_at or timezone.now())
+
+
+def build_case_rollups(full=False):
+    """
+    Bring CaseDailyFact up to date.
+
+    Args:
+        full: Rebuild every day instead of only the stale ones
+
+    Returns:
+        tuple: (days rebuilt, fact rows written)
+    """
+    started_at = timezone.now()
+    last_build = get_last_build_time()
+
+    if full or last_build is None:
+        last_marker = StaleRollupDay.objects.aggregate(last=Max('id'))['last']
+        facts = _rollup(Case.objects.all())
+        with transaction.atomic():
+            CaseDailyFact.objects.all().delete()
+            rows = _write_facts(facts, started_at)
+            _clear_stale_markers(last_marker)
+        return len({key[0] for key in facts}), rows
+
+    days, last_marker = find_stale_days(last_build)
+    with transaction.atomic():
+        rows = rebuild_days(days, built_at=started_at)
+        _clear_stale_markers(last_marker)
+    return len(days), rows
+
+
+def get_reports_data(date_from=None, date_to=None):
+    """
+    Reports page metrics for an optional submission date range, from rollups.
+
+    Args:
+        date_from: 'YYYY-MM-DD' or None
+        date_to: 'YYYY-MM-DD' or None
+
+    Returns:
+        dict: template context for core/view_reports.html
+    """
+    facts = CaseDailyFact.objects.all()
+    if date_from:
+        facts = facts.filter(date__gte=datetime.strptime(date_from, '%Y-%m-%d').date())
+    if date_to:
+        facts = facts.filter(date__lte=datetime.strptime(date_to, '%Y-%m-%d').date())
+
+    # === CASE ANALYTICS ===
+    totals = facts.aggregate(
+        total_cases=Sum('case_count'),
+        completed_cases=Sum('case_count', filter=Q(status='completed')),
+        submitted_cases=Sum('case_count', filter=Q(status='submitted')),
+        rush_cases=Sum('case_count', filter=Q(urgency='rush')),
+        standard_cases=Sum('case_count', filter=Q(urgency='normal')),
+        processed_cases=Sum('processing_count'),
+        processed_seconds=Sum('processing_seconds'),
+        credited_cases=Sum('credit_count'),
+        credit_total=Sum('credit_sum', output_field=FloatField()),
+        level_1_total=Sum('case_count', filter=Q(assigned_to__user_level='level_1')),
+        level_1_completed=Sum('case_count', filter=Q(assigned_to__user_level='level_1', status='completed')),
+        level_1_pending=Sum('case_count', filter=Q(assigned_to__user_level='level_1', status='pending_review')),
+        total_credits_issued=Sum('credit_sum', filter=Q(status__in=['accepted', 'completed']), output_field=FloatField()),
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    total_cases = totals['total_cases']
+
+    # Average processing time in whole days (submission to completion)
+    avg_processing_time = None
+    if totals['processed_cases']:
+        avg_processing_time = timedelta(
+            seconds=totals['processed_seconds'] / totals['processed_cases']
+        ).days
+
+    cases_by_urgency = facts.values('urgency').annotate(count=Sum('case_count')).order_by('urgency')
+
+    # === PERFORMANCE METRICS ===
+    cases_per_tech = [
+        {
+            'id': row['assigned_to__id'],
+            'username': row['assigned_to__username'],
+            'first_name': row['assigned_to__first_name'],
+            'last_name': row['assigned_to__last_name'],
+            'case_count': row['case_count'],
+        }
+        for row in facts.filter(assigned_to__isnull=False).values(
+            'assigned_to__id',
+            'assigned_to__username',
+            'assigned_to__first_name',
+            'assigned_to__last_name'
+        ).annotate(case_count=Sum('case_count')).order_by('-case_count')
+    ]
+
+    avg_credits = totals['credit_total'] / totals['credited_cases'] if totals['credited_cases'] else 0
+
+    level_1_total = totals['level_1_total']
+    approval_rate = (totals['level_1_completed'] / level_1_total) * 100 if level_1_total else 0
+
+    members_with_cases = facts.filter(member__isnull=False).values('member_id').distinct().count()
+
+    # === FINANCIAL REPORTS ===
+    credits_by_workshop = []
+    for row in facts.filter(status__in=['accepted', 'completed'], credit_count__gt=0).values(
+        'workshop_code'
+    ).annotate(
+        total_credits=Sum('credit_sum', output_field=FloatField()),
+        case_count=Sum('credit_count'),
+    ).order_by('-total_credits')[:10]:
+        row['avg_credits'] = row['total_credits'] / row['case_count']
+        credits_by_workshop.append(row)
+
+    # === STATUS REPORTS ===
+    cases_by_status = []
+    for item in facts.values('status').annotate(count=Sum('case_count')).order_by('status'):
+        percentage = (item['count'] / total_cases * 100) if total_cases > 0 else 0
+        cases_by_status.append({
+            'status': item['status'],
+            'label': STATUS_LABELS.get(item['status'], item['status']),
+            'count': item['count'],
+            'percentage': round(percentage, 1)
+        })
+
+    # === TECHNICIAN WORKLOAD ===
+    tech_levels = dict(
+        User.objects.filter(role='technician').values('user_level').annotate(
+            total=Count('id')
+        ).values_list('user_level', 'total').order_by()
+    )
+
+    if date_from or date_to:
+        recent_cases = total_cases
+    else:
+        thirty_days_ago = timezone.localdate() - timedelta(days=30)
+        recent_cases = CaseDailyFact.objects.filter(date__gte=thirty_days_ago).aggregate(
+            total=Sum('case_count')
+        )['total'] or 0
+
+    return {
+        # Case Analytics
+        'total_cases': total_cases,
+        'completed_cases': totals['completed_cases'],
+        'submitted_cases': totals['submitted_cases'],
+        'avg_processing_time': avg_processing_time,
+        'rush_cases': totals['rush_cases'],
+        'standard_cases': totals['standard_cases'],
+        'cases_by_urgency': cases_by_urgency,
+
+        # Performance Metrics
+        'cases_per_tech': cases_per_tech,
+        'avg_credits': avg_credits,
+        'level_1_approval_rate': approval_rate,
+        'level_1_completed': totals['level_1_completed'],
+        'level_1_pending': totals['level_1_pending'],
+        'level_1_total': level_1_total,
+        'total_members': User.objects.filter(role='member').count(),
+        'active_members': members_with_cases,
+
+        # Financial Reports
+        'total_credits_issued': totals['total_credits_issued'],
+        'credits_by_workshop': credits_by_workshop,
+
+        # Status Reports
+        'cases_by_status': cases_by_status,
+
+        # Technician Breakdown
+        'level_1_count': tech_levels.get('level_1', 0),
+        'level_2_count': tech_levels.get('level_2', 0),
+        'level_3_count': tech_levels.get('level_3', 0),
+        'recent_cases_30days': recent_cases,
+        'rollups_built_at': get_last_build_time(),
+    }
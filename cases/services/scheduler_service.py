@@ -0,0 +1,253 @@
+"""
+Service for scheduled case work: releases, member notification emails and
+benefits-software API retries.
+
+Due times come from the indexed Case.scheduled_release_at / scheduled_email_at
+columns, so hour-level release delays are honoured to the minute. The jobs are
+idempotent (each re-checks and claims the row under a lock before acting),
+so the run_scheduler daemon and the older per-job cron commands can overlap
+safely.
+
+Leader election: only the process holding the SchedulerLock lease runs jobs.
+The lease is renewed on every loop and taken over once it expires.
+"""
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from cases.models import Case, SchedulerLock
+from core.prometheus import EMAIL_SEND_DURATION, SCHEDULER_JOBS
+
+logger = logging.getLogger(__name__)
+
+JOB_RELEASE = 'release'
+JOB_EMAIL = 'email'
+
+# Order of jobs due at the same moment: release before its email
+JOB_PRIORITY = {JOB_RELEASE: 0, JOB_EMAIL: 1}
+
+LOCK_NAME = 'run_scheduler'
+
+
+def default_owner():
+    """Lock owner id for this process"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ============================================================================
+# LEADER ELECTION
+# ============================================================================
+
+def acquire_lock(owner, ttl_seconds, name=LOCK_NAME):
+    """
+    Take or renew the scheduler lease.
+
+    Returns:
+        bool: True if this owner holds the lease until now + ttl_seconds
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    locks = SchedulerLock.objects.filter(name=name)
+    if locks.filter(owner=owner).update(expires_at=expires_at):
+        return True
+    # Take over from a holder that stopped renewing
+    if locks.filter(expires_at__lt=now).update(owner=owner, expires_at=expires_at, acquired_at=now):
+        logger.info(f'Scheduler lease {name} taken by {owner}')
+        return True
+    try:
+        with transaction.atomic():
+            SchedulerLock.objects.create(name=name, owner=owner, expires_at=expires_at, acquired_at=now)
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lock(owner, name=LOCK_NAME):
+    """Give up the lease so a standby process can take over immediately"""
+    SchedulerLock.objects.filter(name=name, owner=owner).update(expires_at=timezone.now())
+
+
+# ============================================================================
+# DUE WORK
+# ============================================================================
+
+def due_releases(now=None):
+    """Completed cases whose release time has passed"""
+    return Case.objects.filter(
+        status='completed',
+        scheduled_release_at__lte=now or timezone.now(),
+        actual_release_date__isnull=True,
+    )
+
+
+def due_emails(now=None):
+    """Completed cases whose notification email is due"""
+    return Case.objects.filter(
+        status='completed',
+        scheduled_email_at__lte=now or timezone.now(),
+        actual_email_sent_date__isnull=True,
+        member__isnull=False,
+    )
+
+
+def pending_releases():
+    """Scheduled releases not yet done, earliest first"""
+    return Case.objects.filter(
+        status='completed',
+        scheduled_release_at__isnull=False,
+        actual_release_date__isnull=True,
+    ).order_by('scheduled_release_at')
+
+
+def pending_emails():
+    """Scheduled notification emails not yet sent, earliest first"""
+    return Case.objects.filter(
+        status='completed',
+        scheduled_email_at__isnull=False,
+        actual_email_sent_date__isnull=True,
+        member__isnull=False,
+    ).order_by('scheduled_email_at')
+
+
+def upcoming_jobs(limit=500):
+    """
+    The next pending releases and emails, earliest first, due or not.
+
+    Returns:
+        list of (due_at, job, case_id)
+    """
+    releases = pending_releases().values_list('scheduled_release_at', 'id')[:limit]
+    emails = pending_emails().values_list('scheduled_email_at', 'id')[:limit]
+    return (
+        [(due_at, JOB_RELEASE, case_id) for due_at, case_id in releases]
+        + [(due_at, JOB_EMAIL, case_id) for due_at, case_id in emails]
+    )
+
+
+def release_case(case_id, now=None):
+    """
+    Release one case if it is still due.
+
+    Returns:
+        Case or None: the released case, None if it was no longer due
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        case = due_releases(now).select_for_update().filter(pk=case_id).first()
+        if case is None:
+            SCHEDULER_JOBS.inc(job=JOB_RELEASE, outcome='skipped')
+            return None
+        case.actual_release_date = now
+        case.date_completed = now  # Set completion date when actually released
+        case.save()
+    SCHEDULER_JOBS.inc(job=JOB_RELEASE, outcome='done')
+    logger.info(f'Released case {case.external_case_id} (scheduled for {case.scheduled_release_at})')
+    return case
+
+
+def send_case_email(case_id, now=None):
+    """
+    Send one case's notification email if it is still due.
+
+    The case is claimed by stamping actual_email_sent_date in a short
+    transaction, and the email is sent after it commits, so no row lock is
+    held while talking to the mail server. A failed send releases the claim
+    for the next run; a process killed mid-send leaves the email marked sent
+    (at most once, never twice).
+
+    Returns:
+        Case or None: the case if the email was sent, None if not due or sending failed
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        case = due_emails(now).select_for_update().select_related('member').filter(pk=case_id).first()
+        if case is None:
+            SCHEDULER_JOBS.inc(job=JOB_EMAIL, outcome='skipped')
+            return None
+        claimed_at = case.actual_email_sent_date = timezone.now()
+        case.save()
+
+    claimed = Case.objects.filter(pk=case.pk, actual_email_sent_date=claimed_at)
+    if not send_case_notification_email(case):
+        with transaction.atomic():
+            released = claimed.select_for_update().first()
+            if released is not None:
+                released.actual_email_sent_date = None
+                released.save()
+        SCHEDULER_JOBS.inc(job=JOB_EMAIL, outcome='failed')
+        return None
+    # Record when the email actually went out
+    case.actual_email_sent_date = timezone.now()
+    claimed.update(actual_email_sent_date=case.actual_email_sent_date)
+    SCHEDULER_JOBS.inc(job=JOB_EMAIL, outcome='done')
+    return case
+
+
+def run_job(job, case_id, now=None):
+    """Run one queued job; returns the affected case or None"""
+    if job == JOB_RELEASE:
+        return release_case(case_id, now)
+    if job == JOB_EMAIL:
+        return send_case_email(case_id, now)
+    raise ValueError(f'Unknown scheduler job: {job}')
+
+
+def send_case_notification_email(case):
+    """
+    Send member notification email for completed case.
+
+    Args:
+        case: Case object with member to notify
+
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    send_started = time.perf_counter()
+    try:
+        if not case.member or not case.member.email:
+            logger.warning(f'Cannot send email: Case {case.external_case_id} has no member email')
+            return False
+
+        # Prepare email context
+        context = {
+            'member': case.member,
+            'case': case,
+            'case_url': f'{settings.SITE_URL}/cases/{case.id}/' if hasattr(settings, 'SITE_URL') else 'https://yoursite.com/cases/',
+            'employee_name': f'{case.employee_first_name} {case.employee_last_name}',
+        }
+
+        # Render email templates
+        subject = f'Your Case {case.external_case_id} is Now Available'
+        text_message = render_to_string('emails/case_released_notification.txt', context)
+        html_message = render_to_string('emails/case_released_notification.html', context)
+
+        # Send email
+        result = send_mail(
+            subject=subject,
+            message=text_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[case.member.email],
+            html_message=html_message,
+            fail_silently=False,
+        )
+
+        EMAIL_SEND_DURATION.observe(
+            time.perf_counter() - send_started, template='case_released_notification', outcome='success'
+        )
+        logger.info(f'Sent notification email for case {case.external_case_id} to {case.member.email}')
+        return result > 0
+
+    except Exception as e:
+        EMAIL_SEND_DURATION.observe(
+            time.perf_counter() - send_started, template='case_released_notification', outcome='failure'
+        )
+        logger.error(f'Error sending email for case {case.external_case_id}: {str(e)}')
+        return False
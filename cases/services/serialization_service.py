@@ -0,0 +1,106 @@
+"""
+Lean serializers for the polling JSON endpoints.
+
+Message and notification pages are read with values() - only the columns the
+payload needs, no model instances, no related-object instantiation - and their
+timestamps are converted to CST in one pass with timezone_service helpers.
+The output matches the original per-object serialization field for field.
+
+Benchmark against the model-based version with:
+    python manage.py benchmark_serializers
+"""
+from cases.models import CaseMessage, CaseNotification
+from cases.services.timezone_service import format_cst_fields
+
+MESSAGE_FIELDS = (
+    'id',
+    'author_id',
+    'author__first_name',
+    'author__last_name',
+    'author__username',
+    'author__role',
+    'message',
+    'created_at',
+    'updated_at',
+)
+
+NOTIFICATION_FIELDS = (
+    'id',
+    'case_id',
+    'case__external_case_id',
+    'notification_type',
+    'title',
+    'message',
+    'hold_reason',
+    'is_read',
+    'created_at',
+    'read_at',
+)
+
+_NOTIFICATION_TYPE_LABELS = dict(CaseNotification.NOTIFICATION_TYPE_CHOICES)
+
+
+def case_message_rows(case):
+    """Queryset of message rows for a case, ready to paginate"""
+    return CaseMessage.objects.filter(case=case).values(*MESSAGE_FIELDS)
+
+
+def serialize_case_messages(rows, viewer):
+    """
+    Build the get_case_messages payload for a page of message rows.
+
+    Args:
+        rows: iterable of dicts from case_message_rows()
+        viewer: User requesting the page (for is_author)
+
+    Returns:
+        list of message dicts
+    """
+    messages_data = []
+    for row in rows:
+        full_name = f"{row['author__first_name'] or ''} {row['author__last_name'] or ''}".strip()
+        messages_data.append({
+            'id': row['id'],
+            'author': full_name or row['author__username'] or 'Unknown',
+            'author_id': row['author_id'],
+            'author_role': row['author__role'],
+            'message': row['message'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'is_author': row['author_id'] is not None and row['author_id'] == viewer.id,
+        })
+    return format_cst_fields(messages_data, ('created_at', 'updated_at'))
+
+
+def member_notification_rows(member):
+    """Queryset of notification rows for a member, newest first, ready to paginate"""
+    return CaseNotification.objects.filter(
+        member=member
+    ).order_by('-created_at').values(*NOTIFICATION_FIELDS)
+
+
+def serialize_notifications(rows):
+    """
+    Build the get_member_notifications payload for a page of notification rows.
+
+    Returns:
+        list of notification dicts
+    """
+    notification_list = []
+    for row in rows:
+        notification_list.append({
+            'id': row['id'],
+            'case_id': row['case_id'],
+            'case_code': row['case__external_case_id'],
+            'notification_type': row['notification_type'],  # Raw type value for JS checking
+            'notification_type_display': _NOTIFICATION_TYPE_LABELS.get(
+                row['notification_type'], row['notification_type']
+            ),
+            'title': row['title'],
+            'message': row['message'],
+            'hold_reason': row['hold_reason'],
+            'is_read': row['is_read'],
+            'created_at': row['created_at'],
+            'read_at': row['read_at'],
+        })
+    return format_cst_fields(notification_list, ('created_at', 'read_at'))
@@ -0,0 +1,138 @@
+"""
+Service for removing stored files after their CaseDocument or CaseReport
+rows are deleted.
+
+The post_delete receivers in cases/models.py only write a
+PendingStorageDeletion row, so deleting a case with many documents costs one
+INSERT per file instead of one storage round-trip per file. The queue is
+drained in batches: on S3/Spaces with one DeleteObjects call per BATCH_SIZE
+keys (the API maximum), on local storage with an unlink loop.
+
+Names still referenced by a CaseDocument or CaseReport are dropped from the
+queue without deleting anything: with AWS_S3_FILE_OVERWRITE a new upload may
+reuse the name of a file queued for deletion.
+"""
+import logging
+
+from django.core.files.storage import default_storage
+from django.db.models import F
+
+from cases.models import CaseDocument, CaseReport, PendingStorageDeletion
+from core.prometheus import STORAGE_DELETIONS
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1,000 keys per request
+BATCH_SIZE = 1000
+
+# Rows that failed this many times are left for inspection in the admin
+MAX_ATTEMPTS = 5
+
+
+def _referenced_names(names):
+    """Names in names that a CaseDocument or CaseReport still points at"""
+    return (
+        set(CaseDocument.objects.filter(file__in=names).values_list('file', flat=True))
+        | set(CaseReport.objects.filter(report_file__in=names).values_list('report_file', flat=True))
+    )
+
+
+def _delete_from_bucket(storage, names):
+    """One DeleteObjects request; returns {name: error} for keys that were not deleted"""
+    keys = {storage._normalize_name(storage._clean_name(name)): name for name in names}
+    response = storage.bucket.delete_objects(
+        Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+    )
+    return {
+        keys.get(error['Key'], error['Key']): f"{error.get('Code')}: {error.get('Message')}"
+        for error in response.get('Errors', [])
+    }
+
+
+def _delete_local(storage, names):
+    """Unlink each file; returns {name: error} for files that could not be removed"""
+    failed = {}
+    for name in names:
+        try:
+            storage.delete(name)  # Already missing files are ignored
+        except OSError as e:
+            failed[name] = str(e)
+    return failed
+
+
+def delete_files(names, storage=None):
+    """
+    Delete stored files in one batch.
+
+    Args:
+        names: File names in storage, at most BATCH_SIZE
+        storage: Storage backend (default: default_storage)
+
+    Returns:
+        dict: {name: error message} for files that could not be deleted
+    """
+    storage = storage or default_storage
+    if hasattr(storage, 'bucket'):
+        return _delete_from_bucket(storage, names)
+    return _delete_local(storage, names)
+
+
+def process_batch(after_id=0, batch_size=BATCH_SIZE):
+    """
+    Delete the files of the next queued rows after after_id.
+
+    Returns:
+        tuple: (last row id processed or None if the queue is empty, deleted, skipped, failed)
+    """
+    rows = list(
+        PendingStorageDeletion.objects
+        .filter(id__gt=after_id, attempts__lt=MAX_ATTEMPTS)
+        .order_by('id')
+        .values_list('id', 'name')[:batch_size]
+    )
+    if not rows:
+        return None, 0, 0, 0
+
+    names = {name for _, name in rows}
+    referenced = _referenced_names(names)
+    to_delete = sorted(names - referenced)
+    failed = {}
+    if to_delete:
+        try:
+            failed = delete_files(to_delete)
+        except Exception as e:
+            logger.error(f"Storage batch deletion of {len(to_delete)} file(s) failed: {str(e)}")
+            failed = {name: str(e) for name in to_delete}
+
+    PendingStorageDeletion.objects.filter(id__in=[row_id for row_id, name in rows if name not in failed]).delete()
+    for name, error in failed.items():
+        PendingStorageDeletion.objects.filter(
+            id__in=[row_id for row_id, row_name in rows if row_name == name]
+        ).update(attempts=F('attempts') + 1, last_error=error[:1000])
+
+    deleted = len(to_delete) - len(failed)
+    for outcome, count in (('deleted', deleted), ('skipped', len(referenced)), ('failed', len(failed))):
+        if count:
+            STORAGE_DELETIONS.inc(count, outcome=outcome)
+    for name, error in failed.items():
+        logger.warning(f"Could not delete stored file {name}: {error}")
+    return rows[-1][0], deleted, len(referenced), len(failed)
+
+
+def process_pending(batch_size=BATCH_SIZE, max_batches=None):
+    """
+    Drain the deletion queue; rows that fail are retried on a later run.
+
+    Returns:
+        tuple: (deleted, skipped, failed) file counts
+    """
+    totals = [0, 0, 0]
+    after_id = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        after_id, *counts = process_batch(after_id, batch_size)
+        if after_id is None:
+            break
+        totals = [total + count for total, count in zip(totals, counts)]
+        batches += 1
+    return tuple(totals)
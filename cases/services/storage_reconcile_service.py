@@ -0,0 +1,192 @@
+"""
+Service for reconciling stored files with the CaseDocument and CaseReport
+file columns.
+
+The storage listing (paginated ListObjectsV2 on S3/Spaces, os.scandir on
+local storage) and the file names in the database are both read as streams
+sorted by name and merge-joined, so a run holds one listing page and one
+database page at a time whatever the number of objects:
+
+- orphan: a stored file no row points at
+- missing: a row whose file is not in storage
+
+Names are compared in code point order, which is the order S3 lists keys in
+(UTF-8 byte order). The database side is paged by keyset on the name under a
+binary collation, because MySQL's default collation sorts case-insensitively
+and MySQL drivers buffer whole result sets instead of streaming them.
+"""
+import heapq
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from cases.models import CaseDocument, CaseReport, PendingStorageDeletion
+
+# Folders written by CaseDocument.file and CaseReport.report_file (upload_to)
+DEFAULT_PREFIXES = ['case_documents/', 'case_reports/']
+
+DB_PAGE_SIZE = 5000
+
+# Collation giving code point order, per database vendor
+BINARY_COLLATIONS = {
+    'mysql': 'utf8mb4_bin',
+    'sqlite': 'BINARY',
+    'postgresql': 'C',
+}
+
+
+class StoredFile:
+    """One object from the storage listing"""
+
+    __slots__ = ('name', 'size', 'modified')
+
+    def __init__(self, name, size, modified):
+        self.name = name
+        self.size = size
+        self.modified = modified
+
+
+# ============================================================================
+# SORTED STREAMS
+# ============================================================================
+
+def _iter_bucket(storage, prefix):
+    """Objects under prefix from paginated ListObjectsV2 calls, in key order"""
+    location = f'{storage.location.strip("/")}/' if storage.location else ''
+    paginator = storage.connection.meta.client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=storage.bucket_name,
+        Prefix=location + prefix,
+        PaginationConfig={'PageSize': 1000},
+    )
+    for page in pages:
+        for item in page.get('Contents', []):
+            yield StoredFile(item['Key'][len(location):], item['Size'], item['LastModified'])
+
+
+def _iter_directory(root, relative):
+    """Files below root/relative in name order, one directory listing in memory at a time"""
+    try:
+        with os.scandir(os.path.join(root, relative)) as scanner:
+            # A directory sorts as "name/" so depth-first order matches the order of full paths
+            entries = sorted(
+                (entry.name + '/' if entry.is_dir(follow_symlinks=False) else entry.name, entry)
+                for entry in scanner
+            )
+    except FileNotFoundError:
+        return
+    for key, entry in entries:
+        name = relative + key
+        if key.endswith('/'):
+            yield from _iter_directory(root, name)
+        elif entry.is_file():
+            stat = entry.stat()
+            modified = datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc)
+            yield StoredFile(name, stat.st_size, modified)
+
+
+def iter_stored_files(prefix, storage=None):
+    """Stored files whose name starts with prefix (ending in "/"), sorted by name"""
+    storage = storage or default_storage
+    if hasattr(storage, 'bucket'):
+        return _iter_bucket(storage, prefix)
+    return _iter_directory(storage.location, prefix)
+
+
+def _iter_column(model, field, prefix, page_size):
+    """Distinct non-empty values of model.field starting with prefix, sorted by code point"""
+    collation = BINARY_COLLATIONS.get(connection.vendor)
+    queryset = model.objects.filter(**{f'{field}__startswith': prefix})
+    if collation:
+        queryset = queryset.annotate(sort_name=Collate(field, collation))
+    else:
+        queryset = queryset.annotate(sort_name=F(field))
+    last = ''
+    while True:
+        page = list(
+            queryset.filter(sort_name__gt=last)
+            .order_by('sort_name')
+            .values_list('sort_name', flat=True)
+            .distinct()[:page_size]
+        )
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+
+
+def iter_referenced_names(prefix, page_size=DB_PAGE_SIZE):
+    """File names under prefix referenced by any CaseDocument or CaseReport, sorted and distinct"""
+    previous = None
+    for name in heapq.merge(
+        _iter_column(CaseDocument, 'file', prefix, page_size),
+        _iter_column(CaseReport, 'report_file', prefix, page_size),
+    ):
+        if name != previous:
+            yield name
+            previous = name
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+def merge_join(stored_files, referenced_names):
+    """
+    Walk both sorted streams once.
+
+    Yields:
+        tuple: ('orphan', StoredFile) or ('missing', name)
+    """
+    stored = next(stored_files, None)
+    referenced = next(referenced_names, None)
+    while stored is not None or referenced is not None:
+        if referenced is None or (stored is not None and stored.name < referenced):
+            yield 'orphan', stored
+            stored = next(stored_files, None)
+        elif stored is None or referenced < stored.name:
+            yield 'missing', referenced
+            referenced = next(referenced_names, None)
+        else:
+            stored = next(stored_files, None)
+            referenced = next(referenced_names, None)
+
+
+def reconcile(prefixes=None, storage=None, page_size=DB_PAGE_SIZE):
+    """
+    Compare storage with the database under each prefix.
+
+    Yields:
+        tuple: ('orphan', StoredFile) or ('missing', name)
+    """
+    for prefix in prefixes or DEFAULT_PREFIXES:
+        yield from merge_join(
+            iter(iter_stored_files(prefix, storage)),
+            iter(iter_referenced_names(prefix, page_size)),
+        )
+
+
+def is_recent(stored_file, min_age_minutes):
+    """True for files too new to call orphans: a document's file is written before its row"""
+    return stored_file.modified > timezone.now() - timedelta(minutes=min_age_minutes)
+
+
+def queue_orphans(names):
+    """
+    Hand orphans to the storage deletion worker (process_storage_deletions),
+    which re-checks that no row references a name before deleting it.
+
+    Returns:
+        int: Names queued; names already in the queue are not added again
+    """
+    already_queued = set(PendingStorageDeletion.objects.filter(name__in=names).values_list('name', flat=True))
+    created = PendingStorageDeletion.objects.bulk_create(
+        [PendingStorageDeletion(name=name) for name in names if name not in already_queued],
+        batch_size=1000,
+    )
+    return len(created)
@@ -90,3 +90,53 @@ def convert_to_scheduled_date_cst(release_datetime: datetime) -> date:
         return release_datetime.date()
     
     return release_datetime
+
+
+# Display format used by the JSON endpoints (e.g. "Mar 04, 2026 02:15 PM CST")
+CST_DISPLAY_FORMAT = '%b %d, %Y %I:%M %p %Z'
+
+
+def to_cst(value: datetime) -> datetime:
+    """
+    Convert a datetime to CST. Naive values are treated as UTC.
+    """
+    if value.tzinfo is None:
+        value = pytz.UTC.localize(value)
+    return value.astimezone(CST)
+
+
+def format_cst(value: datetime, fmt: str = CST_DISPLAY_FORMAT):
+    """Format a single datetime in CST (None stays None)"""
+    if value is None:
+        return None
+    return to_cst(value).strftime(fmt)
+
+
+def format_cst_fields(rows, fields, fmt: str = CST_DISPLAY_FORMAT):
+    """
+    Format datetime columns of a list of dicts in place, in one pass.
+    
+    The display format only has minute resolution, so each distinct minute is
+    converted and formatted once - created_at/updated_at pairs and bursts of
+    messages on a page share the work.
+    
+    Args:
+        rows: list of dicts (e.g. from QuerySet.values())
+        fields: keys holding datetimes (None values are left as None)
+        fmt: strftime format
+        
+    Returns:
+        The same list, for chaining
+    """
+    formatted = {}
+    for row in rows:
+        for field in fields:
+            value = row[field]
+            if value is None:
+                continue
+            minute = value.replace(second=0, microsecond=0)
+            text = formatted.get(minute)
+            if text is None:
+                text = formatted[minute] = to_cst(minute).strftime(fmt)
+            row[field] = text
+    return rows
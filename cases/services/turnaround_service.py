@@ -0,0 +1,317 @@
+"""
+Service for case turnaround percentiles.
+
+Durations are recorded as cases change (Case post_save in cases/models.py):
+- submit_to_accept:   date_submitted -> date_accepted   (month of acceptance)
+- accept_to_complete: date_accepted  -> date_completed  (month of completion)
+- submit_to_complete: date_submitted -> date_completed  (month of completion)
+- hold:               total time on hold, added when a case leaves hold
+                      (month the last hold ended)
+
+Each duration goes into a QuantileSketch stored in TurnaroundSketch per
+metric, technician, tier and month. Sketches merge by adding bucket counts,
+so p50/p90/p99 for any technician, tier or month range come from a few rows
+whatever the case volume. CaseTurnaround remembers where each case's sample
+went, so re-acceptance, reassignment or a tier change moves the sample
+instead of counting it twice.
+
+Rebuild from scratch with: python manage.py rebuild_turnaround_sketches
+"""
+import math
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from cases.models import Case, CaseTurnaround, TurnaroundSketch
+
+METRICS = ('submit_to_accept', 'accept_to_complete', 'submit_to_complete', 'hold')
+
+# Quantile answers are within 1% of the true duration
+RELATIVE_ACCURACY = 0.01
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch) over durations in seconds.
+
+    A value v lands in bucket ceil(log_gamma(v)); every value in a bucket is
+    within RELATIVE_ACCURACY of the bucket's representative value. Durations
+    under one second are counted in zero_count. Adding with n=-1 removes a
+    previously added value.
+    """
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self, bins=None, zero_count=0):
+        self.bins = defaultdict(int, {int(key): count for key, count in (bins or {}).items()})
+        self.zero_count = zero_count
+
+    @property
+    def count(self):
+        return self.zero_count + sum(self.bins.values())
+
+    @classmethod
+    def bucket(cls, value):
+        return math.ceil(math.log(value) / cls._log_gamma)
+
+    def add(self, value, n=1):
+        if value < 1:
+            self.zero_count += n
+            return
+        key = self.bucket(value)
+        self.bins[key] += n
+        if self.bins[key] <= 0:
+            del self.bins[key]
+
+    def merge(self, other):
+        for key, count in other.bins.items():
+            self.bins[key] += count
+        self.zero_count += other.zero_count
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q (0-1), or None for an empty sketch"""
+        total = self.count
+        if total <= 0:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_json(self):
+        return {str(key): count for key, count in self.bins.items() if count}
+
+
+def _month(value):
+    """First day of the site-time-zone month a timestamp falls in"""
+    return timezone.localtime(value).date().replace(day=1)
+
+
+def _seconds(start, end):
+    if not start or not end or end < start:
+        return None
+    return int((end - start).total_seconds())
+
+
+def _case_samples(case, hold_seconds, hold_month):
+    """The samples a case should currently contribute: {metric: [seconds, tech_id, tier, month]}"""
+    samples = {}
+    durations = {
+        'submit_to_accept': (_seconds(case.date_submitted, case.date_accepted), case.date_accepted),
+        'accept_to_complete': (_seconds(case.date_accepted, case.date_completed), case.date_completed),
+        'submit_to_complete': (_seconds(case.date_submitted, case.date_completed), case.date_completed),
+    }
+    for metric, (seconds, ended_at) in durations.items():
+        if seconds is not None:
+            samples[metric] = [seconds, case.assigned_to_id, case.tier or '', _month(ended_at).isoformat()]
+    if hold_seconds and hold_month:
+        samples['hold'] = [hold_seconds, case.assigned_to_id, case.tier or '', hold_month]
+    return samples
+
+
+def _apply(metric, sample, n):
+    """Add (n=1) or remove (n=-1) one sample in its sketch row"""
+    seconds, technician_id, tier, month = sample
+    # technician_key, not technician_id: unassigned rows are unique on 0, not NULL
+    lookup = {'metric': metric, 'technician_key': technician_id or 0, 'tier': tier, 'month': month}
+    with transaction.atomic():
+        rows = TurnaroundSketch.objects.select_for_update()
+        sketch = rows.filter(**lookup).first()
+        if sketch is None:
+            # Gone with a deleted technician, or wiped by a rebuild
+            if n < 0:
+                return
+            try:
+                with transaction.atomic():
+                    sketch = TurnaroundSketch.objects.create(
+                        metric=metric, technician_id=technician_id, tier=tier, month=month,
+                    )
+            except IntegrityError:
+                # Created by a concurrent save; lock that row instead
+                sketch = rows.get(**lookup)
+        values = QuantileSketch(sketch.bins, sketch.zero_count)
+        values.add(seconds, n)
+        sketch.bins = values.to_json()
+        sketch.zero_count = max(values.zero_count, 0)
+        sketch.count = max(sketch.count + n, 0)
+        sketch.save(update_fields=['bins', 'zero_count', 'count', 'updated_at'])
+
+
+def record_case_turnaround(case, hold_ended=False):
+    """
+    Bring a case's sketch samples in line with its current dates.
+
+    Args:
+        case: Case instance that was just saved
+        hold_ended: True when this save took the case out of hold
+    """
+    if not (case.date_accepted or case.date_completed or hold_ended):
+        return
+
+    turnaround = CaseTurnaround.objects.filter(case_id=case.id).first()
+    recorded = turnaround.recorded if turnaround else {}
+    hold_seconds = turnaround.hold_seconds if turnaround else 0
+    hold_month = recorded.get('hold', [None] * 4)[3]
+
+    if hold_ended and case.hold_start_date:
+        now = timezone.now()
+        hold_seconds += _seconds(case.hold_start_date, now) or 0
+        hold_month = _month(now).isoformat()
+
+    samples = _case_samples(case, hold_seconds, hold_month)
+    if samples == recorded and turnaround:
+        return
+
+    for metric in METRICS:
+        old, new = recorded.get(metric), samples.get(metric)
+        if old == new:
+            continue
+        if old:
+            _apply(metric, old, -1)
+        if new:
+            _apply(metric, new, 1)
+
+    CaseTurnaround.objects.update_or_create(
+        case_id=case.id,
+        defaults={'recorded': samples, 'hold_seconds': hold_seconds},
+    )
+
+
+def remove_case_turnaround(case_id):
+    """Take a deleted case's samples back out of the sketches"""
+    turnaround = CaseTurnaround.objects.filter(case_id=case_id).first()
+    if not turnaround:
+        return
+    for metric, sample in turnaround.recorded.items():
+        _apply(metric, sample, -1)
+
+
+def rebuild_sketches():
+    """
+    Recompute every sketch from Case dates. Hold totals cannot be derived
+    from Case (it keeps only the latest hold), so recorded hold samples are
+    carried over as they are.
+
+    Returns:
+        tuple: (cases with samples, sketch rows written)
+    """
+    holds = {
+        case_id: (hold_seconds, recorded.get('hold', [None] * 4)[3])
+        for case_id, hold_seconds, recorded in CaseTurnaround.objects.values_list(
+            'case_id', 'hold_seconds', 'recorded'
+        ).iterator()
+    }
+    sketches = defaultdict(QuantileSketch)
+    turnarounds = []
+    cases = Case.objects.only(
+        'id', 'assigned_to_id', 'tier', 'date_submitted', 'date_accepted', 'date_completed'
+    )
+    for case in cases.iterator(chunk_size=2000):
+        hold_seconds, hold_month = holds.get(case.id, (0, None))
+        samples = _case_samples(case, hold_seconds, hold_month)
+        if not samples:
+            continue
+        for metric, (seconds, technician_id, tier, month) in samples.items():
+            sketches[(metric, technician_id, tier, month)].add(seconds)
+        turnarounds.append(CaseTurnaround(case_id=case.id, recorded=samples, hold_seconds=hold_seconds))
+
+    with transaction.atomic():
+        TurnaroundSketch.objects.all().delete()
+        CaseTurnaround.objects.all().delete()
+        TurnaroundSketch.objects.bulk_create([
+            TurnaroundSketch(
+                metric=metric, technician_id=technician_id, technician_key=technician_id or 0,
+                tier=tier, month=month, bins=sketch.to_json(), zero_count=sketch.zero_count, count=sketch.count,
+            )
+            for (metric, technician_id, tier, month), sketch in sketches.items()
+        ], batch_size=1000)
+        CaseTurnaround.objects.bulk_create(turnarounds, batch_size=1000)
+    return len(turnarounds), len(sketches)
+
+
+def get_sketch(metric, technician=None, tier=None, month_from=None, month_to=None):
+    """
+    Merged sketch for a metric over an optional technician, tier and month range.
+
+    Args:
+        metric: One of METRICS
+        technician: User or user id (None = all technicians)
+        tier: Case tier value (None = all tiers)
+        month_from / month_to: dates; compared by month
+    """
+    rows = TurnaroundSketch.objects.filter(metric=metric, count__gt=0)
+    if technician is not None:
+        rows = rows.filter(technician_id=getattr(technician, 'pk', technician))
+    if tier is not None:
+        rows = rows.filter(tier=tier)
+    if month_from:
+        rows = rows.filter(month__gte=month_from.replace(day=1))
+    if month_to:
+        rows = rows.filter(month__lte=month_to.replace(day=1))
+
+    merged = QuantileSketch()
+    for bins, zero_count in rows.values_list('bins', 'zero_count'):
+        merged.merge(QuantileSketch(bins, zero_count))
+    return merged
+
+
+def get_percentiles(metric, quantiles=DEFAULT_QUANTILES, **filters):
+    """
+    Turnaround percentiles in seconds.
+
+    Returns:
+        dict: {'count': n, 'p50': seconds or None, 'p90': ..., 'p99': ...}
+    """
+    sketch = get_sketch(metric, **filters)
+    result = {'count': sketch.count}
+    for q in quantiles:
+        result[f'p{round(q * 100):g}'] = sketch.quantile(q)
+    return result
+
+
+def get_percentiles_by_technician(metric, quantiles=DEFAULT_QUANTILES, **filters):
+    """
+    Percentiles per technician, from one query.
+
+    Returns:
+        dict: {technician_id: {'count', 'p50', ...}} (None key = unassigned)
+    """
+    rows = TurnaroundSketch.objects.filter(metric=metric, count__gt=0)
+    if filters.get('tier') is not None:
+        rows = rows.filter(tier=filters['tier'])
+    if filters.get('month_from'):
+        rows = rows.filter(month__gte=filters['month_from'].replace(day=1))
+    if filters.get('month_to'):
+        rows = rows.filter(month__lte=filters['month_to'].replace(day=1))
+
+    merged = defaultdict(QuantileSketch)
+    for technician_id, bins, zero_count in rows.values_list('technician_id', 'bins', 'zero_count'):
+        merged[technician_id].merge(QuantileSketch(bins, zero_count))
+
+    results = {}
+    for technician_id, sketch in merged.items():
+        results[technician_id] = {'count': sketch.count}
+        for q in quantiles:
+            results[technician_id][f'p{round(q * 100):g}'] = sketch.quantile(q)
+    return results
+
+
+def format_duration(seconds):
+    """Compact display of a duration: '3.2d', '5.1h', '12m'"""
+    if seconds is None:
+        return 'N/A'
+    if seconds >= 86400:
+        return f'{seconds / 86400:.1f}d'
+    if seconds >= 3600:
+        return f'{seconds / 3600:.1f}h'
+    return f'{seconds / 60:.0f}m'
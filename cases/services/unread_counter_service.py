@@ -0,0 +1,160 @@
+"""
+Service for per-user unread message counters.
+
+UnreadMessage remains the record of which messages a user has not read;
+UnreadCounter is a denormalized (user, case) count kept in step with it so
+badges and dashboards never have to group UnreadMessage rows.
+All code that marks messages unread or read should go through this service.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from cases.models import UnreadMessage, UnreadCounter
+from cases.services.version_stamp_service import bump_user_version
+
+
+def record_unread_message(message, user):
+    """
+    Mark a message as unread for a user and bump their counter for the case.
+
+    Args:
+        message: CaseMessage instance
+        user: Recipient who has not read the message yet
+
+    Returns:
+        tuple: (UnreadMessage, created)
+    """
+    with transaction.atomic():
+        unread, created = UnreadMessage.objects.get_or_create(
+            message=message,
+            user=user,
+            defaults={'case_id': message.case_id}
+        )
+        if created:
+            updated = UnreadCounter.objects.filter(
+                user=user, case_id=message.case_id
+            ).update(count=F('count') + 1)
+            if not updated:
+                counter, counter_created = UnreadCounter.objects.get_or_create(
+                    user=user, case_id=message.case_id, defaults={'count': 1}
+                )
+                if not counter_created:
+                    # Another request created the row between our update and get_or_create
+                    UnreadCounter.objects.filter(pk=counter.pk).update(count=F('count') + 1)
+            bump_user_version(user.id)
+    return unread, created
+
+
+def clear_unread_messages(user, case):
+    """
+    Mark every message on a case as read for a user.
+
+    Returns:
+        int: Number of UnreadMessage records removed
+    """
+    with transaction.atomic():
+        deleted, _ = UnreadMessage.objects.filter(case=case, user=user).delete()
+        cleared, _ = UnreadCounter.objects.filter(case=case, user=user).delete()
+        if cleared:
+            bump_user_version(user.id)
+    return deleted
+
+
+def discard_unread_message(message):
+    """
+    Take a message that is about to be deleted off its recipients' counters.
+    Its UnreadMessage records are removed by the cascade.
+    """
+    with transaction.atomic():
+        user_ids = list(UnreadMessage.objects.filter(message=message).values_list('user_id', flat=True))
+        if user_ids:
+            UnreadCounter.objects.filter(
+                user_id__in=user_ids, case_id=message.case_id, count__gt=0
+            ).update(count=F('count') - 1)
+            bump_user_version(*user_ids)
+
+
+def get_unread_counts_by_case(user):
+    """
+    Unread message counts for a user keyed by case id (one query).
+    Cases without unread messages are absent from the dict.
+    """
+    return dict(
+        UnreadCounter.objects.filter(user=user, count__gt=0).values_list('case_id', 'count')
+    )
+
+
+def get_total_unread(user_id):
+    """Total unread messages for a user across all cases"""
+    total = UnreadCounter.objects.filter(user_id=user_id).aggregate(total=Sum('count'))['total']
+    return total or 0
+
+
+def get_unread_badge_state(user):
+    """
+    Badge state for the unread message endpoint.
+
+    Reads the user's counters joined to case and member labels in one query.
+
+    Returns:
+        dict with total_unread and unread_by_case (sorted by count, highest first)
+    """
+    counters = UnreadCounter.objects.filter(
+        user=user, count__gt=0
+    ).select_related('case__member').only(
+        'count',
+        'case__id',
+        'case__external_case_id',
+        'case__employee_first_name',
+        'case__employee_last_name',
+        'case__member__first_name',
+        'case__member__last_name',
+    ).order_by('-count')
+
+    unread_cases = []
+    total_unread = 0
+    for counter in counters:
+        case = counter.case
+        total_unread += counter.count
+        unread_cases.append({
+            'case_id': case.id,
+            'external_case_id': case.external_case_id,
+            'member_name': case.member.get_full_name() if case.member else 'Unknown',
+            'employee_name': f"{case.employee_first_name} {case.employee_last_name}",
+            'unread_count': counter.count
+        })
+
+    return {
+        'total_unread': total_unread,
+        'unread_by_case': unread_cases,
+    }
+
+
+def rebuild_unread_counters(user=None):
+    """
+    Recompute counters from UnreadMessage.
+
+    Args:
+        user: Only rebuild this user's counters (None = everyone)
+
+    Returns:
+        int: Number of counter rows written
+    """
+    unread = UnreadMessage.objects.all()
+    counters = UnreadCounter.objects.all()
+    if user is not None:
+        unread = unread.filter(user=user)
+        counters = counters.filter(user=user)
+
+    rows = unread.values('user_id', 'case_id').annotate(total=Count('id')).order_by()
+
+    with transaction.atomic():
+        affected_users = set(counters.values_list('user_id', flat=True))
+        counters.delete()
+        created = UnreadCounter.objects.bulk_create(
+            [UnreadCounter(user_id=row['user_id'], case_id=row['case_id'], count=row['total']) for row in rows],
+            batch_size=1000,
+        )
+        affected_users.update(counter.user_id for counter in created)
+        bump_user_version(*affected_users)
+    return len(created)
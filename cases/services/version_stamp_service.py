@@ -0,0 +1,89 @@
+"""
+Service for per-case and per-user version stamps.
+
+Polling endpoints (case messages, member notifications, unread counts, column
+config) derive their ETag from these stamps, so an idle poll is answered with
+304 Not Modified after reading a single row - the message and notification
+tables are never touched.
+
+Stamps are bumped by:
+- CaseMessage save/delete (case) - receiver in cases/models.py
+- CaseNotification save/delete (member) - receiver in cases/models.py
+- unread_counter_service writes (user)
+- Dashboard view and column preference saves (user)
+- Changes to anything shown on a case_detail page (case_page) - see
+  page_cache_service.bump_case_page_version
+
+Bumps run inside the caller's transaction, so a rolled-back write never
+changes the stamp.
+"""
+import hashlib
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from cases.models import VersionStamp
+
+
+def _bump(scope, object_id):
+    with transaction.atomic():
+        updated = VersionStamp.objects.filter(
+            scope=scope, object_id=object_id
+        ).update(version=F('version') + 1, updated_at=timezone.now())
+        if not updated:
+            stamp, created = VersionStamp.objects.get_or_create(
+                scope=scope, object_id=object_id, defaults={'version': 1}
+            )
+            if not created:
+                # Another request created the row between our update and get_or_create
+                VersionStamp.objects.filter(pk=stamp.pk).update(version=F('version') + 1)
+
+
+def _get(scope, object_id):
+    version = VersionStamp.objects.filter(
+        scope=scope, object_id=object_id
+    ).values_list('version', flat=True).first()
+    return version or 0
+
+
+def bump_case_version(case_id):
+    """Mark a case's messages as changed"""
+    if case_id:
+        _bump('case', case_id)
+
+
+def bump_case_page_version(*case_ids):
+    """Mark the rendered case_detail pages of each case as stale"""
+    for case_id in {case_id for case_id in case_ids if case_id}:
+        _bump('case_page', case_id)
+
+
+def bump_user_version(*user_ids):
+    """Mark each user's unread counts, notifications and preferences as changed"""
+    for user_id in {user_id for user_id in user_ids if user_id}:
+        _bump('user', user_id)
+
+
+def get_case_version(case_id):
+    """Current version for a case (0 if it has never changed)"""
+    return _get('case', case_id)
+
+
+def get_case_page_version(case_id):
+    """Current version of a case's rendered pages (0 if never invalidated)"""
+    return _get('case_page', case_id)
+
+
+def get_user_version(user_id):
+    """Current version for a user (0 if nothing has changed yet)"""
+    return _get('user', user_id)
+
+
+def build_etag(*parts):
+    """
+    Build an opaque ETag from a version and whatever else shapes the response
+    (endpoint name, viewer id, page number, ...).
+    """
+    key = ':'.join(str(part) for part in parts)
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
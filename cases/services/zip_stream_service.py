@@ -0,0 +1,204 @@
+"""
+Service for streaming ZIP archives of case files.
+
+The archive is written on the fly into a small in-memory buffer that is
+drained after every chunk, so nothing is assembled in memory or on disk.
+zipfile switches to data descriptors when the output is not seekable, which
+lets entries be written without knowing their compressed size up front.
+
+Storage reads are overlapped with compression by a bounded read-ahead pool:
+up to READ_AHEAD_FILES files are fetched concurrently, each into a queue of
+at most READ_AHEAD_CHUNKS chunks. Memory therefore stays below roughly
+READ_AHEAD_FILES * READ_AHEAD_CHUNKS * CHUNK_SIZE whatever the archive
+size. S3/Spaces objects are streamed from the response body, because
+S3Boto3Storage.open() would download the whole object first.
+
+Files whose format is already compressed (PDF, images, Office documents)
+are stored rather than deflated.
+"""
+import logging
+import os
+import queue
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+READ_AHEAD_FILES = 4
+READ_AHEAD_CHUNKS = 8
+
+STORED_EXTENSIONS = {
+    '.pdf', '.zip', '.gz', '.7z', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.docx', '.xlsx', '.pptx', '.mp4', '.mov',
+}
+
+# zipfile needs to know up front that an entry may exceed the classic 4 GiB limits
+ZIP64_THRESHOLD = 2 ** 31
+
+_END_OF_FILE = object()
+
+
+class ZipEntry:
+    """A file to add to the archive: its name inside the ZIP and its FieldFile"""
+
+    def __init__(self, arcname, field_file, size=None, modified=None):
+        self.arcname = arcname
+        self.field_file = field_file
+        self.size = size
+        self.modified = modified
+
+
+class _StreamBuffer:
+    """Write-only, non-seekable sink for ZipFile; drained after every write"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        if data:
+            self._chunks.append(bytes(data))
+            self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Yield what has been written since the last drain, if anything"""
+        if self._chunks:
+            data = b''.join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+
+def _iter_storage_chunks(field_file):
+    """Yield a stored file in CHUNK_SIZE pieces without reading it whole"""
+    storage = field_file.storage
+    if hasattr(storage, 'bucket'):
+        # S3Boto3Storage (Spaces): stream the object body
+        key = storage._normalize_name(storage._clean_name(field_file.name))
+        body = storage.bucket.Object(key).get()['Body']
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+        return
+    with storage.open(field_file.name, 'rb') as handle:
+        while True:
+            chunk = handle.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+class _ReadAhead:
+    """Reads one file into a bounded queue on a pool thread"""
+
+    def __init__(self, entry, cancelled):
+        self.entry = entry
+        self.cancelled = cancelled
+        self.chunks = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            for chunk in _iter_storage_chunks(self.entry.field_file):
+                if not self._put(chunk):
+                    return
+            self._put(_END_OF_FILE)
+        except Exception as e:
+            self._put(e)
+
+    def __iter__(self):
+        while True:
+            item = self.chunks.get()
+            if item is _END_OF_FILE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def _zip_info(entry):
+    date_time = timezone.localtime(entry.modified).timetuple()[:6] if entry.modified else (1980, 1, 1, 0, 0, 0)
+    info = zipfile.ZipInfo(entry.arcname, date_time=date_time)
+    extension = os.path.splitext(entry.arcname)[1].lower()
+    info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def stream_zip(entries):
+    """
+    Generate the bytes of a ZIP archive of entries, for StreamingHttpResponse.
+
+    A file that cannot be read is left out and listed in a MISSING_FILES.txt
+    entry at the end of the archive, so one missing object doesn't abort a
+    download that has already started.
+    """
+    entries = list(entries)
+    buffer = _StreamBuffer()
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=READ_AHEAD_FILES, thread_name_prefix='zip-read-ahead')
+    pending = deque()
+    missing = []
+
+    def schedule(index):
+        if index < len(entries):
+            reader = _ReadAhead(entries[index], cancelled)
+            executor.submit(reader.run)
+            pending.append(reader)
+
+    try:
+        for index in range(min(READ_AHEAD_FILES, len(entries))):
+            schedule(index)
+        next_index = len(pending)
+
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            while pending:
+                reader = pending.popleft()
+                entry = reader.entry
+                force_zip64 = entry.size is None or entry.size >= ZIP64_THRESHOLD
+                chunks = iter(reader)
+                try:
+                    first_chunk = next(chunks, b'')
+                except Exception as e:
+                    # Unreadable before anything was written: skip it, the archive stays valid
+                    logger.warning(f"Leaving {entry.arcname} out of ZIP download: {str(e)}")
+                    missing.append(entry.arcname)
+                else:
+                    # A failure past this point truncates the download, as with any broken stream
+                    with archive.open(_zip_info(entry), 'w', force_zip64=force_zip64) as member:
+                        member.write(first_chunk)
+                        yield from buffer.drain()
+                        for chunk in chunks:
+                            member.write(chunk)
+                            yield from buffer.drain()
+                yield from buffer.drain()
+                schedule(next_index)
+                next_index += 1
+
+            if missing:
+                archive.writestr('MISSING_FILES.txt', 'These files could not be read:\n' + '\n'.join(missing) + '\n')
+        yield from buffer.drain()
+    finally:
+        # Also runs when the client disconnects and the response closes this generator
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,3 +1,587 @@
-from django.test import TestCase
+import hashlib
+import shutil
+import sys
+import tempfile
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_started
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User, UserPreference
+from cases.models import (
+    Case, CaseDailyFact, CaseDocument, CaseMessage, ChunkedUpload, PendingStorageDeletion, TurnaroundSketch,
+    UnreadMessage, VersionStamp,
+)
+from cases.services import (
+    page_cache_service, pdf_form_handler, pdf_renderer, preference_service, rollup_service, scheduler_service,
+    storage_deletion_service, unread_counter_service,
+)
+from cases.services.chunked_upload_service import MIN_CHUNK_SIZE
+from cases.services.storage_reconcile_service import StoredFile, merge_join
+from core import models as core_models
+from core.models import SystemSettings
+
+
+def make_case(external_case_id, member, **overrides):
+    """A minimal valid Case; keyword arguments set any other field"""
+    fields = {
+        'workshop_code': 'W',
+        'employee_first_name': 'A',
+        'employee_last_name': 'B',
+        'client_email': 'a@b.c',
+    }
+    fields.update(overrides)
+    return Case.objects.create(external_case_id=external_case_id, member=member, **fields)
+
+
+class PollingETagTests(TestCase):
+    """Polling endpoints answer If-None-Match with 304 until the data changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            username='member', password='x', role='member', first_name='Mem', last_name='Ber'
+        )
+        cls.technician = User.objects.create_user(
+            username='technician', password='x', role='technician', user_level='level_2'
+        )
+        cls.case = make_case('T-1', member=cls.member, assigned_to=cls.technician, status='accepted')
+
+    def setUp(self):
+        self.member_client = self.client_class()
+        self.member_client.force_login(self.member)
+        self.technician_client = self.client_class()
+        self.technician_client.force_login(self.technician)
+
+    def polled_urls(self):
+        return [
+            (reverse('cases:get_column_config', args=['technician_dashboard']), self.technician_client),
+            (reverse('cases:get_unread_message_count'), self.technician_client),
+            (reverse('cases:get_case_messages', args=[self.case.id]), self.technician_client),
+            (reverse('cases:get_member_notifications'), self.member_client),
+        ]
+
+    def test_responses_carry_etag(self):
+        for url, client in self.polled_urls():
+            with self.subTest(url=url):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.has_header('ETag'))
+
+    def test_matching_etag_returns_304(self):
+        for url, client in self.polled_urls():
+            with self.subTest(url=url):
+                etag = client.get(url)['ETag']
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_304_skips_building_the_payload(self):
+        for url, client in self.polled_urls():
+            with self.subTest(url=url):
+                etag = client.get(url)['ETag']
+                with CaptureQueriesContext(connection) as conditional:
+                    client.get(url, HTTP_IF_NONE_MATCH=etag)
+                # Session, user and the version stamp row
+                self.assertLessEqual(len(conditional.captured_queries), 3)
+
+    def test_new_message_changes_unread_count_etag(self):
+        url = reverse('cases:get_unread_message_count')
+        etag = self.technician_client.get(url)['ETag']
+        self.member_client.post(reverse('cases:add_case_message', args=[self.case.id]), {'message': 'hey'})
+        response = self.technician_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class UnreadCounterTests(TestCase):
+    """UnreadCounter stays equal to the user's UnreadMessage rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+        cls.technician = User.objects.create_user(username='technician', password='x', role='technician')
+        cls.case = make_case('M-1', member=cls.member, assigned_to=cls.technician, status='accepted')
+
+    def setUp(self):
+        self.client.force_login(self.technician)
+
+    def assertCounterMatches(self, expected):
+        unread = UnreadMessage.objects.filter(user=self.member).count()
+        self.assertEqual(unread, expected)
+        self.assertEqual(unread_counter_service.get_unread_counts_by_case(self.member).get(self.case.id, 0), unread)
+        self.assertEqual(unread_counter_service.get_total_unread(self.member.id), unread)
+
+    def post_message(self, text):
+        response = self.client.post(reverse('cases:add_case_message', args=[self.case.pk]), {'message': text})
+        self.assertEqual(response.status_code, 200)
+
+    def test_counter_follows_post_delete_and_read(self):
+        self.post_message('first')
+        self.post_message('second')
+        self.assertCounterMatches(2)
+
+        CaseMessage.objects.get(message='first').delete()
+        self.assertCounterMatches(1)
+
+        self.client.force_login(self.member)
+        response = self.client.post(reverse('cases:mark_messages_as_read', args=[self.case.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertCounterMatches(0)
+
+        self.client.force_login(self.technician)
+        self.post_message('third')
+        self.assertCounterMatches(1)
+
+
+class CasePageCacheTests(TestCase):
+    """Cached case_detail pages are invalidated through the database, not the cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+        cls.case = make_case(
+            'T-2',
+            member=cls.member,
+            status='completed',
+            actual_release_date=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.member)
+        self.request = self.client.get(reverse('cases:get_member_notifications')).wsgi_request
+        self.page = '<input type="hidden" name="csrfmiddlewaretoken" value="abc123">'
+
+    def test_page_is_served_until_the_stamp_changes(self):
+        html, version = page_cache_service.get_cached_page(self.request, self.case.id)
+        self.assertIsNone(html)
+        page_cache_service.store_page(self.request, self.case, self.page, version)
+        self.assertIsNotNone(page_cache_service.get_cached_page(self.request, self.case.id)[0])
+
+        # Another worker shares only the database: change the stamp row behind this process's cache
+        VersionStamp.objects.update_or_create(
+            scope='case_page', object_id=self.case.id, defaults={'version': version + 1}
+        )
+        self.assertIsNone(page_cache_service.get_cached_page(self.request, self.case.id)[0])
+
+    def test_case_save_invalidates_page(self):
+        version = page_cache_service.get_cached_page(self.request, self.case.id)[1]
+        page_cache_service.store_page(self.request, self.case, self.page, version)
+        self.case.save()
+        self.assertIsNone(page_cache_service.get_cached_page(self.request, self.case.id)[0])
+
+
+class DashboardRowCacheTests(TestCase):
+    """Cached dashboard rows follow changes to the users they show"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(
+            username='member', password='x', role='member', first_name='Mem', last_name='Ber'
+        )
+        cls.technician = User.objects.create_user(
+            username='technician', password='x', role='technician', user_level='level_2'
+        )
+        make_case('D-1', member=cls.member, assigned_to=cls.technician, status='accepted')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.technician)
+
+    def test_renamed_member_is_shown(self):
+        url = reverse('cases:technician_dashboard')
+        self.assertContains(self.client.get(url), 'Mem Ber')
+
+        self.member.first_name = 'Renamed'
+        self.member.save()
+        self.assertContains(self.client.get(url), 'Renamed Ber')
+
+
+class PreferenceCacheTests(TestCase):
+    """Cached preferences follow the preference version held in the cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tech', password='x', role='technician')
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh_user(self):
+        # A new request: no memo on the User instance
+        return User.objects.get(pk=self.user.pk)
+
+    def test_set_preference_is_read_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            preference_service.set_preference(self.user, 'technician_view', 'mine')
+        self.assertEqual(preference_service.get_preference(self.fresh_user(), 'technician_view'), 'mine')
+
+    def test_cache_hit_costs_no_queries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            preference_service.set_preference(self.user, 'technician_view', 'mine')
+        preference_service.get_preferences(self.fresh_user())
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(preference_service.get_preference(user, 'technician_view'), 'mine')
+
+    def test_edit_outside_the_service_invalidates_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            preference_service.set_preference(self.user, 'technician_view', 'mine')
+        preference_service.get_preferences(self.fresh_user())
+
+        # Admin edit (or another worker): only the database changes
+        preference = UserPreference.objects.get(user=self.user, preference_key='technician_view')
+        preference.preference_value = 'all'
+        with self.captureOnCommitCallbacks(execute=True):
+            preference.save()
+        self.assertEqual(preference_service.get_preference(self.fresh_user(), 'technician_view'), 'all')
+
+
+class RollupStaleDayTests(TestCase):
+    """Changes without an updated_at trail still reach the rollups"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+
+    def create_case(self, external_case_id, submitted):
+        case = make_case(external_case_id, member=self.member, status='submitted')
+        # date_submitted is auto_now_add
+        Case.objects.filter(pk=case.pk).update(date_submitted=submitted)
+        return Case.objects.get(pk=case.pk)
+
+    def day_counts(self):
+        return {
+            fact.date: fact.case_count
+            for fact in CaseDailyFact.objects.all()
+        }
+
+    def build_later(self):
+        # The next run only picks up cases saved since the previous one started
+        CaseDailyFact.objects.update(built_at=datetime.now(timezone.utc) - timedelta(hours=1))
+        rollup_service.build_case_rollups()
+
+    def test_deleted_case_leaves_its_day(self):
+        submitted = datetime(2026, 3, 2, 15, tzinfo=timezone.utc)
+        self.create_case('R-1', submitted)
+        doomed = self.create_case('R-2', submitted)
+        rollup_service.build_case_rollups(full=True)
+        self.assertEqual(self.day_counts(), {rollup_service.local_date(submitted): 2})
+
+        doomed.delete()
+        self.build_later()
+        self.assertEqual(self.day_counts(), {rollup_service.local_date(submitted): 1})
+
+    def test_moved_case_leaves_its_old_day(self):
+        first = datetime(2026, 3, 2, 15, tzinfo=timezone.utc)
+        second = datetime(2026, 3, 9, 15, tzinfo=timezone.utc)
+        self.create_case('R-3', first)
+        rollup_service.build_case_rollups(full=True)
+
+        case = Case.objects.get(external_case_id='R-3')
+        case.date_submitted = second
+        case.save()
+        self.build_later()
+        self.assertEqual(self.day_counts(), {rollup_service.local_date(second): 1})
+
+
+class ScheduledEmailTests(TestCase):
+    """Notification emails are claimed under the lock and sent outside it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member', email='m@b.c')
+
+    def setUp(self):
+        self.case = make_case('S-1', member=self.member, status='completed', scheduled_email_date=date(2026, 1, 5))
+
+    def test_email_is_sent_outside_the_transaction(self):
+        # TestCase's own atomic blocks; the claim's block must be closed while sending
+        outer_blocks = len(connection.atomic_blocks)
+        blocks_while_sending = []
+
+        def send(case):
+            blocks_while_sending.append(len(connection.atomic_blocks))
+            return True
+
+        with mock.patch.object(scheduler_service, 'send_case_notification_email', side_effect=send):
+            self.assertIsNotNone(scheduler_service.send_case_email(self.case.id))
+        self.assertEqual(blocks_while_sending, [outer_blocks])
+        self.case.refresh_from_db()
+        self.assertIsNotNone(self.case.actual_email_sent_date)
+
+    def test_failed_send_releases_the_claim(self):
+        with mock.patch.object(scheduler_service, 'send_case_notification_email', return_value=False):
+            self.assertIsNone(scheduler_service.send_case_email(self.case.id))
+        self.case.refresh_from_db()
+        self.assertIsNone(self.case.actual_email_sent_date)
+        self.assertTrue(scheduler_service.due_emails().filter(pk=self.case.pk).exists())
+
+
+class TurnaroundReceiverTests(TestCase):
+    """The turnaround receiver skips unrelated partial saves and never breaks a save"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+        cls.case = make_case('U-1', member=cls.member, status='accepted')
+
+    def test_unrelated_partial_save_skips_recording(self):
+        with mock.patch('cases.services.turnaround_service.record_case_turnaround') as record:
+            self.case.save(update_fields=['fact_finder_pdf_status'])
+            record.assert_not_called()
+            self.case.save(update_fields=['status'])
+            record.assert_called_once()
+
+    def test_recording_failure_does_not_fail_the_save(self):
+        with mock.patch('cases.services.turnaround_service.record_case_turnaround', side_effect=RuntimeError):
+            with self.assertLogs('cases.models', 'ERROR'):
+                self.case.save()
+        self.assertTrue(Case.objects.filter(pk=self.case.pk).exists())
+
+    def test_unassigned_samples_share_one_sketch_row(self):
+        # After date_submitted, which is auto_now_add
+        accepted = datetime.now(timezone.utc) + timedelta(hours=1)
+        for external_case_id in ('U-2', 'U-3'):
+            case = make_case(external_case_id, member=self.member, status='accepted')
+            case.date_accepted = accepted
+            case.save()
+
+        sketches = TurnaroundSketch.objects.filter(metric='submit_to_accept', technician__isnull=True)
+        self.assertEqual([sketch.count for sketch in sketches], [2])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TurnaroundSketch.objects.create(
+                metric='submit_to_accept', tier=sketches[0].tier, month=sketches[0].month,
+            )
+
+
+class SystemSettingsVersionTests(TestCase):
+    """Every save gets a new version, even from stale copies"""
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        first = SystemSettings.get_settings(cached=False)
+        second = SystemSettings.objects.get(pk=first.pk)
+        first.save()
+        second.save()
+        self.assertEqual(second.version, first.version + 1)
+        self.assertEqual(SystemSettings.objects.get(pk=first.pk).version, second.version)
+
+
+class SystemSettingsCacheTests(TestCase):
+    """get_settings() reads the database at most once per request cycle"""
+
+    def setUp(self):
+        SystemSettings.get_settings(cached=False)
+        patcher = mock.patch.dict(core_models._settings_cache, {'instance': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        request_started.send(sender=self.__class__)
+
+    def test_repeated_calls_within_a_request(self):
+        with self.assertNumQueries(1):
+            SystemSettings.get_settings()
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                SystemSettings.get_settings()
+
+    def test_next_request_checks_the_version(self):
+        cached = SystemSettings.get_settings()
+        request_started.send(sender=self.__class__)
+        with self.assertNumQueries(1):
+            self.assertIs(SystemSettings.get_settings(), cached)
+        with self.assertNumQueries(0):
+            SystemSettings.get_settings()
+
+    def test_next_request_reloads_after_a_save(self):
+        cached = SystemSettings.get_settings()
+        # Saved by another process: this one only sees the version change
+        SystemSettings.objects.filter(pk=cached.pk).update(version=cached.version + 1)
+        request_started.send(sender=self.__class__)
+        with self.assertNumQueries(2):
+            self.assertIsNot(SystemSettings.get_settings(), cached)
+        with self.assertNumQueries(0):
+            SystemSettings.get_settings()
+
+
+class PdfRendererPoolTests(SimpleTestCase):
+    """Renders reuse pooled fonts and stylesheets whichever thread runs them"""
+
+    def setUp(self):
+        pool = pdf_renderer.queue.LifoQueue()
+        patcher = mock.patch.object(pdf_renderer, '_pool', pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        document = types.SimpleNamespace(write_pdf=lambda: b'%PDF', pages=[None])
+        fake_weasyprint = types.SimpleNamespace(HTML=lambda string: types.SimpleNamespace(
+            render=lambda **kwargs: document
+        ))
+        modules = mock.patch.dict(sys.modules, {'weasyprint': fake_weasyprint})
+        modules.start()
+        self.addCleanup(modules.stop)
+
+        build = mock.patch.object(
+            pdf_renderer, '_build_resources', side_effect=lambda: (object(), {'fact_finder': object()})
+        )
+        self.build = build.start()
+        self.addCleanup(build.stop)
+
+    def test_new_threads_reuse_pooled_resources(self):
+        for _ in range(3):
+            # A fresh thread per render, as under ASGI and runserver
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(executor.submit(pdf_renderer.render_pdf, '<p>x</p>', 'fact_finder').result(), (b'%PDF', 1))
+        self.assertEqual(self.build.call_count, 1)
+        self.assertEqual(pdf_renderer._pool.qsize(), 1)
+
+
+class FactFinderRendererCheckTests(SimpleTestCase):
+    """The form renderer is refused until its field map covers the template"""
+
+    @override_settings(FACT_FINDER_PDF_RENDERER='html')
+    def test_html_renderer_is_accepted(self):
+        pdf_form_handler.check_fact_finder_renderer()
+
+    @override_settings(FACT_FINDER_PDF_RENDERER='pdf')
+    def test_unknown_renderer_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            pdf_form_handler.check_fact_finder_renderer()
+
+    @override_settings(FACT_FINDER_PDF_RENDERER='form')
+    def test_form_renderer_with_unmapped_fields_is_refused(self):
+        with mock.patch.object(pdf_form_handler, 'unmapped_template_fields', return_value=['D 1']):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'D 1'):
+                pdf_form_handler.check_fact_finder_renderer()
+
+    @override_settings(FACT_FINDER_PDF_RENDERER='form')
+    def test_form_renderer_with_complete_map_is_accepted(self):
+        with mock.patch.object(pdf_form_handler, 'unmapped_template_fields', return_value=[]):
+            pdf_form_handler.check_fact_finder_renderer()
+
+
+class StorageDeletionTests(TestCase):
+    """Queued file deletions skip files still in use and retry failures"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+        cls.case = make_case('D-1', member=cls.member)
+
+    def test_referenced_name_is_skipped(self):
+        CaseDocument.objects.create(
+            case=self.case, file='case_documents/in_use.pdf', original_filename='in_use.pdf', file_size=10
+        )
+        PendingStorageDeletion.objects.create(name='case_documents/in_use.pdf')
+        with mock.patch.object(storage_deletion_service, 'delete_files') as delete_files:
+            last_id, deleted, skipped, failed = storage_deletion_service.process_batch()
+        delete_files.assert_not_called()
+        self.assertEqual((deleted, skipped, failed), (0, 1, 0))
+        self.assertFalse(PendingStorageDeletion.objects.exists())
+
+    def test_failed_delete_increments_attempts(self):
+        queued = PendingStorageDeletion.objects.create(name='case_documents/gone.pdf')
+        with mock.patch.object(
+            storage_deletion_service, 'delete_files', return_value={'case_documents/gone.pdf': 'AccessDenied'}
+        ):
+            last_id, deleted, skipped, failed = storage_deletion_service.process_batch()
+        self.assertEqual((last_id, deleted, skipped, failed), (queued.id, 0, 0, 1))
+        queued.refresh_from_db()
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual(queued.last_error, 'AccessDenied')
+
+
+class StorageReconcileTests(SimpleTestCase):
+    """merge_join reports files without rows and rows without files"""
+
+    def test_orphans_and_missing_files_are_reported(self):
+        modified = datetime(2026, 1, 5, tzinfo=timezone.utc)
+        stored = [StoredFile(name, 10, modified) for name in ('a.pdf', 'b.pdf', 'd.pdf')]
+        referenced = ['b.pdf', 'c.pdf', 'd.pdf', 'e.pdf']
+        results = [
+            (kind, item.name if kind == 'orphan' else item)
+            for kind, item in merge_join(iter(stored), iter(referenced))
+        ]
+        self.assertEqual(results, [('orphan', 'a.pdf'), ('missing', 'c.pdf'), ('missing', 'e.pdf')])
+
+
+class ChunkedUploadTests(TestCase):
+    """Resumable uploads through the API, on local storage"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user(username='member', password='x', role='member')
+        cls.case = make_case('C-1', member=cls.member, status='submitted')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.client.force_login(self.member)
+        self.data = bytes(range(256)) * (MIN_CHUNK_SIZE // 256) + b'tail'
+        response = self.client.post(
+            reverse('cases:start_chunked_upload', args=[self.case.id]),
+            {'filename': 'packet.pdf', 'size': len(self.data), 'chunk_size': MIN_CHUNK_SIZE},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.upload_id = response.json()['upload_id']
+
+    def put_chunk(self, offset, data=None, sha256=None):
+        if data is None:
+            data = self.data[offset:offset + MIN_CHUNK_SIZE]
+        return self.client.put(
+            reverse('cases:upload_chunk', args=[self.upload_id, offset]),
+            data,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=sha256 or hashlib.sha256(data).hexdigest(),
+        )
+
+    def complete(self):
+        return self.client.post(reverse('cases:complete_chunked_upload', args=[self.upload_id]))
+
+    def test_out_of_order_chunks_assemble_the_file(self):
+        self.assertEqual(self.put_chunk(MIN_CHUNK_SIZE).status_code, 200)
+        self.assertEqual(self.put_chunk(0).status_code, 200)
+        response = self.complete()
+        self.assertEqual(response.status_code, 200)
+        document = CaseDocument.objects.get(pk=response.json()['document_id'])
+        with document.file.open('rb') as handle:
+            self.assertEqual(handle.read(), self.data)
+
+    def test_resending_a_chunk_is_acknowledged(self):
+        self.assertFalse(self.put_chunk(0).json()['already_received'])
+        response = self.put_chunk(0)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['already_received'])
+
+    def test_checksum_mismatch_returns_422(self):
+        response = self.put_chunk(0, sha256='0' * 64)
+        self.assertEqual(response.status_code, 422)
+        upload = ChunkedUpload.objects.get(upload_id=self.upload_id)
+        self.assertFalse(upload.parts.exists())
+
+    def test_complete_is_idempotent(self):
+        self.put_chunk(0)
+        self.put_chunk(MIN_CHUNK_SIZE)
+        first = self.complete().json()['document_id']
+        second = self.complete()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['document_id'], first)
+        self.assertEqual(CaseDocument.objects.filter(case=self.case).count(), 1)
+
+    def test_chunk_after_complete_is_refused(self):
+        self.put_chunk(0)
+        self.put_chunk(MIN_CHUNK_SIZE)
+        self.complete()
+        self.assertEqual(self.put_chunk(0, data=b'x' * MIN_CHUNK_SIZE).status_code, 409)
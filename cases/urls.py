@@ -3,6 +3,8 @@ from . import views
 from . import views_pdf_template
 from . import views_quick_submit
 from . import views_submit_case
+from . import views_chunked_upload
+from . import views_events
 
 app_name = 'cases'
 
@@ -44,6 +46,7 @@ urlpatterns = [
     path('<int:pk>/mark-messages-read/', views.mark_messages_as_read, name='mark_messages_as_read'),
     path('<int:pk>/request-modification/', views.request_modification, name='request_modification'),
     path('unread-message-count/', views.get_unread_message_count, name='get_unread_message_count'),
+    path('events/', views_events.event_stream, name='event_stream'),
     path('upload-image/', views.upload_image_for_notes, name='upload_image_for_notes'),
     path('credit-audit-trail/', views.credit_audit_trail, name='credit_audit_trail_report'),
     path('<int:case_id>/credit-audit-trail/', views.credit_audit_trail, name='credit_audit_trail'),
@@ -75,6 +78,9 @@ urlpatterns = [
     path('api/column-preference/save/', views.save_column_preference, name='save_column_preference'),
     path('api/column-config/<str:dashboard_name>/', views.get_column_config, name='get_column_config'),
     
+    # Turnaround analytics API (managers/admins)
+    path('api/turnaround-percentiles/', views.get_turnaround_percentiles, name='get_turnaround_percentiles'),
+    
     # Quality Review Actions (integrated into case detail view)
     path('<int:case_id>/review/approve/', views.approve_case_review, name='approve_case_review'),
     path('<int:case_id>/review/request-revisions/', views.request_case_revisions, name='request_case_revisions'),
@@ -92,10 +98,17 @@ urlpatterns = [
     # API - Member document upload
     path('<int:case_id>/upload-member-documents/', views.upload_member_documents, name='upload_member_documents'),
     
+    # API - Resumable chunked upload of large documents
+    path('<int:case_id>/uploads/', views_chunked_upload.start_chunked_upload, name='start_chunked_upload'),
+    path('uploads/<uuid:upload_id>/', views_chunked_upload.chunked_upload_detail, name='chunked_upload_detail'),
+    path('uploads/<uuid:upload_id>/chunks/<int:offset>/', views_chunked_upload.upload_chunk, name='upload_chunk'),
+    path('uploads/<uuid:upload_id>/complete/', views_chunked_upload.complete_chunked_upload, name='complete_chunked_upload'),
+    
     # Reference PDF template with document upload
     path('<int:case_id>/fact-finder-template/', views_pdf_template.fact_finder_template, name='case_fact_finder'),
     path('<int:case_id>/view-fact-finder-pdf/', views_pdf_template.view_fact_finder_pdf, name='view_fact_finder_pdf'),
     path('document/<int:doc_id>/download/', views_pdf_template.download_document, name='download_document'),
+    path('<int:case_id>/documents/download-all/', views_pdf_template.download_all_documents, name='download_all_documents'),
     path('document/<int:doc_id>/delete/', views_pdf_template.delete_document, name='delete_document'),
     path('template/download/', views_pdf_template.download_template, name='download_template'),
     path('<int:case_id>/submit/', views_pdf_template.submit_case, name='submit_case'),
@@ -1,15 +1,21 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.conf import settings
 from django.db.models import Q
 from django.db import models
 from django.utils import timezone
-from django.http import HttpResponseForbidden, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.urls import reverse
 from django.core.paginator import Paginator
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_http_methods
 from accounts.models import User
 from .models import Case, CaseDocument, CaseChangeRequest, CaseMessage, UnreadMessage
+from .services import (
+    page_cache_service, preference_service, realtime_service, turnaround_service,
+    unread_counter_service, version_stamp_service,
+)
 import logging
 import json
 from urllib.parse import urlencode
@@ -61,12 +67,11 @@ def member_dashboard(request):
         messages.error(request, 'Access denied. Members only.')
         return redirect('home')
     
-    # Get all cases for this member with unread count annotation
+    # Get all cases for this member (unread counts come from UnreadCounter below)
     cases = Case.objects.filter(
         member=user
     ).prefetch_related(
-        'documents',
-        'unread_messages_for_users'
+        'documents'
     ).select_related(
         'assigned_to'
     ).order_by('-date_submitted')
@@ -91,14 +96,9 @@ def member_dashboard(request):
         )
     
     # Add unread message count to each case
+    unread_counts = unread_counter_service.get_unread_counts_by_case(user)
     for case in cases:
-        unread_count = UnreadMessage.objects.filter(
-            case=case,
-            user=user
-        ).count()
-        case.unread_message_count = unread_count
-        if unread_count > 0:
-            logger.info(f'Member dashboard: Case {case.external_case_id} has {unread_count} unread messages for {user.username}')
+        case.unread_message_count = unread_counts.get(case.id, 0)
     
     # Convert to list to preserve the modified case objects with unread_message_count
     cases = list(cases)
@@ -165,6 +165,7 @@ def member_dashboard(request):
         'sort_by': sort_by,
         'visible_columns': visible_columns,
         'all_columns': DASHBOARD_COLUMN_CONFIG['member_dashboard']['available_columns'],
+        'row_cache_timeout': settings.DASHBOARD_ROW_CACHE_TIMEOUT,
         'filter_params': build_filter_params(request),
     }
     
@@ -181,17 +182,13 @@ def technician_dashboard(request):
         messages.error(request, 'Access denied. Technicians and Admins only.')
         return redirect('home')
     
-    # Load saved view preference
-    from accounts.models import UserPreference
-    saved_preference = UserPreference.objects.filter(
-        user=user,
-        preference_key='technician_dashboard_view'
-    ).first()
+    # Load saved view preference (all of the user's preferences load in one cached query)
+    saved_preference = preference_service.get_preference(user, 'technician_dashboard_view')
     
     # Get saved view type or default to 'all'
     default_view = 'all'
     if saved_preference:
-        default_view = saved_preference.preference_value.get('view', 'all')
+        default_view = saved_preference.get('view', 'all')
     
     # Get all cases (technicians see all, not just assigned)
     # BUT exclude draft cases unless assigned to them
@@ -270,9 +267,9 @@ def technician_dashboard(request):
     }
     
     # Add unread message count to each case
+    unread_counts = unread_counter_service.get_unread_counts_by_case(user)
     for case in cases:
-        unread_count = UnreadMessage.objects.filter(case=case, user=user).count()
-        case.unread_message_count = unread_count
+        case.unread_message_count = unread_counts.get(case.id, 0)
     
     # Get available technicians and administrators for assignment dropdown
     technicians = User.objects.filter(
@@ -297,6 +294,7 @@ def technician_dashboard(request):
     visible_columns = get_user_visible_columns(user, 'technician_dashboard')
     context['visible_columns'] = visible_columns
     context['all_columns'] = DASHBOARD_COLUMN_CONFIG['technician_dashboard']['available_columns']
+    context['row_cache_timeout'] = settings.DASHBOARD_ROW_CACHE_TIMEOUT
     
     return render(request, 'cases/technician_dashboard.html', context)
 
@@ -455,6 +453,7 @@ def admin_dashboard(request):
         'dashboard_type': 'admin',
         'visible_columns': get_user_visible_columns(user, 'admin_dashboard'),
         'all_columns': DASHBOARD_COLUMN_CONFIG['admin_dashboard']['available_columns'],
+        'row_cache_timeout': settings.DASHBOARD_ROW_CACHE_TIMEOUT,
         'filter_params': build_filter_params(request),
     }
     
@@ -587,6 +586,9 @@ def manager_dashboard(request):
     # Calculate resubmitted count
     resubmitted_count = all_cases.filter(status='resubmitted').count()
     
+    # Submission-to-completion percentiles from the turnaround sketches
+    turnaround = turnaround_service.get_percentiles('submit_to_complete')
+    
     stats = {
         'total': total_count,
         'submitted': submitted_count,
@@ -600,7 +602,10 @@ def manager_dashboard(request):
         'normal': max(0, total_count - rush_count),
         'total_members': User.objects.filter(role='member', is_active=True).count(),
         'total_technicians': User.objects.filter(role='technician', is_active=True).count(),
-        'avg_processing_time': 'N/A',  # Would require more complex calculation
+        'turnaround_p50': turnaround_service.format_duration(turnaround['p50']),
+        'turnaround_p90': turnaround_service.format_duration(turnaround['p90']),
+        'turnaround_p99': turnaround_service.format_duration(turnaround['p99']),
+        'turnaround_count': turnaround['count'],
         'submitted_pct': submitted_pct,
         'pending_review_pct': pending_review_pct,
         'completed_pct': completed_pct,
@@ -626,6 +631,7 @@ def manager_dashboard(request):
         'is_readonly': True,
         'visible_columns': get_user_visible_columns(user, 'manager_dashboard'),
         'all_columns': DASHBOARD_COLUMN_CONFIG['manager_dashboard']['available_columns'],
+        'row_cache_timeout': settings.DASHBOARD_ROW_CACHE_TIMEOUT,
         'filter_params': build_filter_params(request),
     }
     
@@ -952,6 +958,12 @@ def accept_case(request, case_id):
 def case_detail(request, pk):
     """Case detail view"""
     user = request.user
+    
+    # Released cases are served from the page cache (one stamp query and one cache read)
+    cached_page, page_version = page_cache_service.get_cached_page(request, pk)
+    if cached_page is not None:
+        return HttpResponse(cached_page)
+    
     case = get_object_or_404(Case, pk=pk)
     
     # Permission check
@@ -1091,7 +1103,9 @@ def case_detail(request, pk):
         'user': user,
     }
     
-    return render(request, 'cases/case_detail.html', context)
+    response = render(request, 'cases/case_detail.html', context)
+    page_cache_service.store_page(request, case, response.content.decode(response.charset), page_version)
+    return response
 
 
 @login_required
@@ -1232,6 +1246,8 @@ def put_case_on_hold(request, case_id):
                     'error': 'Failed to place case on hold. Please try again.'
                 }, status=500)
             
+            realtime_service.publish(case.member_id, 'case_status', {'case_id': case.id, 'status': case.status})
+            
             # ====================================================================
             # CREATE IN-APP NOTIFICATION
             # ====================================================================
@@ -2136,9 +2152,11 @@ def mark_case_completed(request, case_id):
                             # Convert to UTC for storage (Django ORM stores in UTC)
                             release_dt_utc = release_dt_cst.astimezone(pytz.UTC)
                             
-                            # Store as date only for scheduled_release_date (matches existing schema)
-                            case.scheduled_release_date = release_dt_utc.date()
-                            case.scheduled_email_date = release_dt_utc.date()
+                            # Date in CST for display/filters; exact time for the run_scheduler daemon
+                            case.scheduled_release_date = release_dt_cst.date()
+                            case.scheduled_email_date = release_dt_cst.date()
+                            case.scheduled_release_at = release_dt_utc
+                            case.scheduled_email_at = release_dt_utc
                             case.actual_release_date = None
                             case.actual_email_sent_date = None
                             case.date_completed = None
@@ -2181,6 +2199,8 @@ def mark_case_completed(request, case_id):
                             release_time_cst = calculate_release_time_cst(completion_delay_hours)
                             case.scheduled_release_date = convert_to_scheduled_date_cst(release_time_cst)
                             case.scheduled_email_date = convert_to_scheduled_date_cst(release_time_cst)
+                            case.scheduled_release_at = release_time_cst
+                            case.scheduled_email_at = release_time_cst
                             case.actual_release_date = None
                             case.actual_email_sent_date = None
                             case.date_completed = None
@@ -2209,18 +2229,14 @@ def mark_case_completed(request, case_id):
                         f"This case has been auto-assigned to you as the original technician who worked case {case.original_case.external_case_id}. "
                         f"This is a modification of your original case that the member has resubmitted with additional information."
                     )
-                    CaseMessage.objects.create(
+                    modification_msg = CaseMessage.objects.create(
                         case=case,
                         author=request.user,
                         message=modification_note
                     )
                     
                     # Mark as unread for the original technician
-                    UnreadMessage.objects.create(
-                        message=CaseMessage.objects.filter(case=case).latest('id'),
-                        user=case.original_case.assigned_to,
-                        case=case
-                    )
+                    unread_counter_service.record_unread_message(modification_msg, case.original_case.assigned_to)
             
             case.save()
             
@@ -2289,13 +2305,9 @@ def save_view_preference(request, view_type):
     
     if request.method == 'POST':
         try:
-            from accounts.models import UserPreference
-            
-            # Save or update the preference
-            preference, created = UserPreference.objects.update_or_create(
-                user=user,
-                preference_key='technician_dashboard_view',
-                defaults={'preference_value': {'view': view_type}}
+            # Save or update the preference (invalidates the preference cache)
+            preference, created = preference_service.set_preference(
+                user, 'technician_dashboard_view', {'view': view_type}
             )
             
             return JsonResponse({
@@ -2320,15 +2332,10 @@ def get_view_preference(request):
         return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
     
     try:
-        from accounts.models import UserPreference
-        
-        preference = UserPreference.objects.filter(
-            user=user,
-            preference_key='technician_dashboard_view'
-        ).first()
+        preference = preference_service.get_preference(user, 'technician_dashboard_view')
         
         if preference:
-            view_type = preference.preference_value.get('view', 'all')
+            view_type = preference.get('view', 'all')
         else:
             view_type = 'all'  # Default to All Cases
         
@@ -2972,25 +2979,19 @@ def add_case_message(request, pk):
             # Member posted - mark as unread for the assigned technician
             if case.assigned_to:
                 try:
-                    um, created = UnreadMessage.objects.get_or_create(
-                        message=msg,
-                        user=case.assigned_to,
-                        defaults={'case': case}
-                    )
+                    um, created = unread_counter_service.record_unread_message(msg, case.assigned_to)
                     logger.info(f'Member {user.username} message on case {case.external_case_id} - Created UnreadMessage for technician {case.assigned_to.username}: {created}')
+                    realtime_service.publish(case.assigned_to_id, 'message', {'case_id': case.id, 'message_id': msg.id})
                 except Exception as e:
                     logger.error(f'Error creating UnreadMessage for technician: {str(e)}')
         else:
             # Technician posted - mark as unread for the member
             if case.member:
                 try:
-                    um, created = UnreadMessage.objects.get_or_create(
-                        message=msg,
-                        user=case.member,
-                        defaults={'case': case}
-                    )
+                    um, created = unread_counter_service.record_unread_message(msg, case.member)
                     logger.info(f'Technician {user.username} message on case {case.external_case_id} - Created UnreadMessage for member {case.member.username}: {created}')
                     logger.info(f'UnreadMessage details: id={um.id}, case={um.case_id}, user={um.user_id}, message={um.message_id}')
+                    realtime_service.publish(case.member_id, 'message', {'case_id': case.id, 'message_id': msg.id})
                 except Exception as e:
                     logger.error(f'Error creating UnreadMessage for member: {str(e)}')
                     import traceback
@@ -3040,8 +3041,20 @@ def add_case_message(request, pk):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def _case_messages_etag(request, pk):
+    """ETag for a page of case messages (is_author makes it viewer-specific)"""
+    return version_stamp_service.build_etag(
+        'case_messages',
+        version_stamp_service.get_case_version(pk),
+        request.user.id,
+        request.GET.get('page', 1),
+    )
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_case_messages_etag)
 def get_case_messages(request, pk):
     """
     Retrieve all messages for a case (paginated).
@@ -3059,32 +3072,15 @@ def get_case_messages(request, pk):
         return JsonResponse({'error': 'Access denied'}, status=403)
     
     try:
-        # Get all messages for this case
-        messages_qs = CaseMessage.objects.filter(case=case).select_related('author')
+        from cases.services.serialization_service import case_message_rows, serialize_case_messages
         
-        # Paginate
+        # Paginate message rows (values() - no model instances)
         page = request.GET.get('page', 1)
-        paginator = Paginator(messages_qs, 20)
+        paginator = Paginator(case_message_rows(case), 20)
         page_obj = paginator.get_page(page)
         
-        messages_data = []
-        import pytz
-        cst_tz = pytz.timezone('America/Chicago')
-        for msg in page_obj:
-            # Convert timestamps to CST (Central Time Zone)
-            created_at_cst = msg.created_at.astimezone(cst_tz) if msg.created_at.tzinfo else pytz.UTC.localize(msg.created_at).astimezone(cst_tz)
-            updated_at_cst = msg.updated_at.astimezone(cst_tz) if msg.updated_at.tzinfo else pytz.UTC.localize(msg.updated_at).astimezone(cst_tz)
-            
-            messages_data.append({
-                'id': msg.id,
-                'author': msg.author.get_full_name() or msg.author.username,
-                'author_id': msg.author.id,
-                'author_role': msg.author.role,
-                'message': msg.message,
-                'created_at': created_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
-                'updated_at': updated_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
-                'is_author': msg.author == user
-            })
+        # Timestamps are converted to CST (Central Time Zone) in one pass
+        messages_data = serialize_case_messages(page_obj.object_list, user)
         
         return JsonResponse({
             'success': True,
@@ -3118,8 +3114,9 @@ def mark_messages_as_read(request, pk):
         return JsonResponse({'error': 'Access denied'}, status=403)
     
     try:
-        # Delete all UnreadMessage records for this user on this case
-        UnreadMessage.objects.filter(case=case, user=user).delete()
+        # Delete all UnreadMessage records and the counter for this user on this case
+        unread_counter_service.clear_unread_messages(user, case)
+        realtime_service.publish(user.id, 'read', {'case_id': case.id})
         
         logger.info(f'Messages marked as read for {user.username} on case {case.external_case_id}')
         
@@ -3133,8 +3130,18 @@ def mark_messages_as_read(request, pk):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def _unread_count_etag(request):
+    return version_stamp_service.build_etag(
+        'unread_count',
+        version_stamp_service.get_user_version(request.user.id),
+        request.user.id,
+    )
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_unread_count_etag)
 def get_unread_message_count(request):
     """
     Get count of unread messages for the current user across all cases.
@@ -3143,35 +3150,13 @@ def get_unread_message_count(request):
     user = request.user
     
     try:
-        # Get count of unread messages per case
-        unread_by_case = UnreadMessage.objects.filter(
-            user=user
-        ).values('case').annotate(
-            count=models.Count('id')
-        ).order_by('-count')
-        
-        # Also get total unread count
-        total_unread = UnreadMessage.objects.filter(user=user).count()
-        
-        # Build response with case details
-        unread_cases = []
-        for item in unread_by_case:
-            try:
-                case = Case.objects.get(pk=item['case'])
-                unread_cases.append({
-                    'case_id': case.id,
-                    'external_case_id': case.external_case_id,
-                    'member_name': case.member.get_full_name() if case.member else 'Unknown',
-                    'employee_name': f"{case.employee_first_name} {case.employee_last_name}",
-                    'unread_count': item['count']
-                })
-            except Case.DoesNotExist:
-                pass
+        # Per-case counters joined to case labels in a single query
+        badge_state = unread_counter_service.get_unread_badge_state(user)
         
         return JsonResponse({
             'success': True,
-            'total_unread': total_unread,
-            'unread_by_case': unread_cases
+            'total_unread': badge_state['total_unread'],
+            'unread_by_case': badge_state['unread_by_case']
         })
         
     except Exception as e:
@@ -3248,11 +3233,7 @@ def request_modification(request, pk):
         
         # Mark message as unread for assigned technician
         if case.assigned_to:
-            UnreadMessage.objects.get_or_create(
-                message=msg,
-                user=case.assigned_to,
-                case=case
-            )
+            unread_counter_service.record_unread_message(msg, case.assigned_to)
             # Send email notification about modification request
             send_modification_created_email(case, new_case, case.assigned_to)
         
@@ -3331,9 +3312,8 @@ def generate_report_notes_pdf(request, pk):
     Converts HTML notes to formatted PDF with case details.
     """
     from django.http import HttpResponse
-    from weasyprint import HTML, CSS
-    from io import BytesIO
-    import base64
+    from cases.services.pdf_generator import render_report_notes_html
+    from cases.services.pdf_renderer import render_pdf
     
     case = get_object_or_404(Case, pk=pk)
     user = request.user
@@ -3357,149 +3337,13 @@ def generate_report_notes_pdf(request, pk):
         return redirect('cases:case_detail', pk=pk)
     
     try:
-        # Prepare HTML content with professional styling
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    font-size: 12pt;
-                    line-height: 1.6;
-                    color: #333;
-                    background-color: white;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #007bff 0%, #0056b3 100%);
-                    color: white;
-                    padding: 30px;
-                    margin-bottom: 30px;
-                    border-radius: 4px;
-                }}
-                .header h1 {{
-                    font-size: 24pt;
-                    margin-bottom: 10px;
-                }}
-                .header p {{
-                    margin: 5px 0;
-                    font-size: 11pt;
-                }}
-                .meta-info {{
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    gap: 20px;
-                    margin-bottom: 20px;
-                    padding: 15px;
-                    background-color: #f8f9fa;
-                    border-left: 4px solid #007bff;
-                }}
-                .meta-item {{
-                    font-size: 11pt;
-                }}
-                .meta-label {{
-                    font-weight: bold;
-                    color: #0056b3;
-                    margin-bottom: 3px;
-                }}
-                .notes-section {{
-                    margin-top: 30px;
-                    padding: 20px;
-                    background-color: #ffffff;
-                    border: 1px solid #dee2e6;
-                    border-radius: 4px;
-                }}
-                .notes-section h2 {{
-                    font-size: 16pt;
-                    color: #0056b3;
-                    margin-bottom: 15px;
-                    padding-bottom: 10px;
-                    border-bottom: 2px solid #007bff;
-                }}
-                .notes-content {{
-                    font-size: 11pt;
-                    line-height: 1.8;
-                    color: #555;
-                }}
-                /* Preserve TinyMCE formatting */
-                .notes-content p {{ margin-bottom: 10px; }}
-                .notes-content strong {{ font-weight: bold; }}
-                .notes-content em {{ font-style: italic; }}
-                .notes-content u {{ text-decoration: underline; }}
-                .notes-content ul, .notes-content ol {{ margin-left: 20px; margin-bottom: 10px; }}
-                .notes-content li {{ margin-bottom: 5px; }}
-                .notes-content a {{ color: #007bff; text-decoration: underline; }}
-                .notes-content img {{ max-width: 100%; height: auto; margin: 15px 0; }}
-                .footer {{
-                    margin-top: 40px;
-                    padding-top: 20px;
-                    border-top: 1px solid #dee2e6;
-                    font-size: 10pt;
-                    color: #999;
-                    text-align: center;
-                }}
-                @page {{
-                    margin: 0.75in;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Case Notes & Advisor Information</h1>
-                <p>Generated on {timezone.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-            </div>
-            
-            <div class="meta-info">
-                <div class="meta-item">
-                    <div class="meta-label">Case ID:</div>
-                    <div>{case.external_case_id}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Workshop Code:</div>
-                    <div>{case.workshop_code}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Employee Name:</div>
-                    <div>{case.employee_first_name} {case.employee_last_name}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Status:</div>
-                    <div>{case.get_status_display()}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Completion Date:</div>
-                    <div>{case.date_completed.strftime('%B %d, %Y') if case.date_completed else 'N/A'}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Report Count:</div>
-                    <div>{case.num_reports_requested}</div>
-                </div>
-            </div>
-            
-            <div class="notes-section">
-                <h2>Technical Notes to Advisor</h2>
-                <div class="notes-content">
-                    {case.report_notes_to_member}
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p>These notes are confidential and intended for the case advisor only.</p>
-                <p>This document was automatically generated from the Advisor Portal.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Generate PDF using weasyprint
-        pdf_file = BytesIO()
-        HTML(string=html_content).write_pdf(pdf_file)
-        pdf_file.seek(0)
+        html_content = render_report_notes_html(case)
+        
+        # Generate PDF using weasyprint (stylesheet and fonts are shared per process)
+        pdf_bytes, _ = render_pdf(html_content, 'report_notes')
         
         # Create response
-        response = HttpResponse(pdf_file.read(), content_type='application/pdf')
+        response = HttpResponse(pdf_bytes, content_type='application/pdf')
         filename = f'Case_{case.external_case_id}_Notes_{timezone.now().strftime("%Y%m%d")}.pdf'
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
@@ -3983,17 +3827,10 @@ DASHBOARD_COLUMN_CONFIG = {
 
 def get_user_visible_columns(user, dashboard_name):
     """Get list of visible column IDs for the user on a specific dashboard"""
-    from accounts.models import UserPreference
-    
     # Try to get saved user preference
-    try:
-        pref = UserPreference.objects.get(
-            user=user,
-            preference_key=f'{dashboard_name}_visible_columns'
-        )
-        return pref.preference_value.get('visible_columns', [])
-    except UserPreference.DoesNotExist:
-        pass
+    pref = preference_service.get_preference(user, f'{dashboard_name}_visible_columns')
+    if pref is not None:
+        return pref.get('visible_columns', [])
     
     # Return default visible columns
     if dashboard_name in DASHBOARD_COLUMN_CONFIG:
@@ -4012,7 +3849,6 @@ def get_user_visible_columns(user, dashboard_name):
 @require_http_methods(["POST"])
 def save_column_preference(request):
     """Save user's column visibility preferences"""
-    from accounts.models import UserPreference
     import json
     
     try:
@@ -4023,10 +3859,10 @@ def save_column_preference(request):
         if not dashboard:
             return JsonResponse({'success': False, 'error': 'Dashboard not specified'}, status=400)
         
-        pref, created = UserPreference.objects.update_or_create(
-            user=request.user,
-            preference_key=f'{dashboard}_visible_columns',
-            defaults={'preference_value': {'visible_columns': visible_columns}}
+        pref, created = preference_service.set_preference(
+            request.user,
+            f'{dashboard}_visible_columns',
+            {'visible_columns': visible_columns}
         )
         
         return JsonResponse({'success': True, 'message': 'Preferences saved'})
@@ -4232,7 +4068,23 @@ def correct_case_review(request, case_id):
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
+# Changes whenever DASHBOARD_COLUMN_CONFIG is edited, so a deploy invalidates cached configs
+_COLUMN_CONFIG_TAG = version_stamp_service.build_etag(json.dumps(DASHBOARD_COLUMN_CONFIG, sort_keys=True))
+
+
+def _column_config_etag(request, dashboard_name):
+    return version_stamp_service.build_etag(
+        'column_config',
+        _COLUMN_CONFIG_TAG,
+        version_stamp_service.get_user_version(request.user.id),
+        request.user.id,
+        dashboard_name,
+    )
+
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_column_config_etag)
 def get_column_config(request, dashboard_name):
     """Get column configuration for a dashboard"""
     if dashboard_name not in DASHBOARD_COLUMN_CONFIG:
@@ -4256,12 +4108,65 @@ def get_column_config(request, dashboard_name):
     })
 
 
+@login_required
+@require_http_methods(["GET"])
+def get_turnaround_percentiles(request):
+    """
+    Turnaround percentiles (seconds) per technician for managers and administrators.
+    Query params: metric (default submit_to_complete), tier, month_from / month_to (YYYY-MM).
+    """
+    if request.user.role not in ['administrator', 'manager']:
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    
+    metric = request.GET.get('metric', 'submit_to_complete')
+    if metric not in turnaround_service.METRICS:
+        return JsonResponse({'success': False, 'error': 'Invalid metric'}, status=400)
+    
+    from datetime import datetime
+    filters = {'tier': request.GET.get('tier') or None}
+    try:
+        for param in ('month_from', 'month_to'):
+            if request.GET.get(param):
+                filters[param] = datetime.strptime(request.GET[param], '%Y-%m').date()
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Months must be YYYY-MM'}, status=400)
+    
+    by_technician = turnaround_service.get_percentiles_by_technician(metric, **filters)
+    names = {
+        user.id: user.get_full_name() or user.username
+        for user in User.objects.filter(id__in=[tech_id for tech_id in by_technician if tech_id])
+    }
+    
+    return JsonResponse({
+        'success': True,
+        'metric': metric,
+        'overall': turnaround_service.get_percentiles(metric, **filters),
+        'technicians': [
+            dict(percentiles, technician_id=tech_id, technician=names.get(tech_id, 'Unassigned'))
+            for tech_id, percentiles in sorted(
+                by_technician.items(), key=lambda item: -item[1]['count']
+            )
+        ],
+    })
+
+
 # ============================================================================
 # NOTIFICATION MANAGEMENT VIEWS - Option 3 Premium Features
 # ============================================================================
 
+def _member_notifications_etag(request):
+    return version_stamp_service.build_etag(
+        'member_notifications',
+        version_stamp_service.get_user_version(request.user.id),
+        request.user.id,
+        request.GET.get('page', 1),
+    )
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_member_notifications_etag)
 def get_member_notifications(request):
     """
     Get all notifications for the logged-in member.
@@ -4292,12 +4197,10 @@ def get_member_notifications(request):
         }, status=403)
     
     try:
-        # Get all notifications for this member
-        notifications = CaseNotification.objects.filter(
-            member=user
-        ).select_related(
-            'case'
-        ).order_by('-created_at')
+        from cases.services.serialization_service import member_notification_rows, serialize_notifications
+        
+        # Get all notifications for this member (values() rows, newest first)
+        notifications = member_notification_rows(user)
         
         # Get pagination
         page_num = request.GET.get('page', 1)
@@ -4305,35 +4208,15 @@ def get_member_notifications(request):
         page_obj = paginator.get_page(page_num)
         
         # Count unread notifications
-        unread_count = notifications.filter(is_read=False).count()
-        
-        # Format response
-        notification_list = []
-        import pytz
-        cst_tz = pytz.timezone('America/Chicago')
-        for notif in page_obj.object_list:
-            # Convert timestamps to CST (Central Time Zone)
-            created_at_cst = notif.created_at.astimezone(cst_tz) if notif.created_at.tzinfo else pytz.UTC.localize(notif.created_at).astimezone(cst_tz)
-            read_at_cst = notif.read_at.astimezone(cst_tz) if notif.read_at and notif.read_at.tzinfo else (pytz.UTC.localize(notif.read_at).astimezone(cst_tz) if notif.read_at else None)
-            
-            notification_list.append({
-                'id': notif.id,
-                'case_id': notif.case.id,
-                'case_code': notif.case.external_case_id,
-                'notification_type': notif.notification_type,  # Return raw type value for JS checking
-                'notification_type_display': notif.get_notification_type_display(),
-                'title': notif.title,
-                'message': notif.message,
-                'hold_reason': notif.hold_reason,
-                'is_read': notif.is_read,
-                'created_at': created_at_cst.strftime('%b %d, %Y %I:%M %p %Z'),
-                'read_at': read_at_cst.strftime('%b %d, %Y %I:%M %p %Z') if read_at_cst else None
-            })
+        unread_count = CaseNotification.objects.filter(member=user, is_read=False).count()
+        
+        # Format response - timestamps converted to CST (Central Time Zone) in one pass
+        notification_list = serialize_notifications(page_obj.object_list)
         
         return JsonResponse({
             'success': True,
             'notifications': notification_list,
-            'total_count': notifications.count(),
+            'total_count': paginator.count,
             'unread_count': unread_count,
             'current_page': page_num,
             'total_pages': paginator.num_pages
@@ -4801,23 +4684,20 @@ def upload_member_documents(request, case_id):
                 'error': f'Cannot upload documents for {case.get_status_display()} cases'
             }, status=400)
         
-        # Get file from request
-        document_file = request.FILES.get('document_file')
+        # Get files from request (one or several document_file parts)
+        document_files = request.FILES.getlist('document_file')
         document_notes = request.POST.get('document_notes', '').strip()
         
-        if not document_file:
+        if not document_files:
             return JsonResponse({'success': False, 'error': 'No file provided'}, status=400)
         
-        # Create CaseDocument record
-        filename_with_employee = f"{case.employee_last_name}_{document_file.name}"
-        
-        doc = CaseDocument.objects.create(
-            case=case,
-            document_type='supporting',  # Member uploads are supporting docs
-            original_filename=filename_with_employee,
-            file_size=document_file.size,
-            uploaded_by=user,
-            file=document_file,
+        # Store the files in parallel and create the CaseDocument records
+        from cases.services.document_upload_service import create_case_documents
+        docs = create_case_documents(
+            case,
+            document_files,
+            'supporting',  # Member uploads are supporting docs
+            user,
             notes=document_notes,
         )
         
@@ -4827,18 +4707,19 @@ def upload_member_documents(request, case_id):
         
         # Log to audit trail
         from core.models import AuditLog
-        AuditLog.log_activity(
-            user=user,
-            action_type='member_document_uploaded',
-            case=case,
-            description=f'Member uploaded document: {filename_with_employee}',
-            metadata={
-                'document_id': doc.id,
-                'original_filename': document_file.name,
-                'file_size': document_file.size,
-                'notes': document_notes
-            }
-        )
+        for doc, document_file in zip(docs, document_files):
+            AuditLog.log_activity(
+                user=user,
+                action_type='member_document_uploaded',
+                case=case,
+                description=f'Member uploaded document: {doc.original_filename}',
+                metadata={
+                    'document_id': doc.id,
+                    'original_filename': document_file.name,
+                    'file_size': document_file.size,
+                    'notes': document_notes
+                }
+            )
         
         # Count total member-uploaded documents (supporting docs)
         document_count = CaseDocument.objects.filter(
@@ -4851,9 +4732,10 @@ def upload_member_documents(request, case_id):
         
         return JsonResponse({
             'success': True,
-            'message': f'✓ Document uploaded successfully',
+            'message': f'✓ Document uploaded successfully' if len(docs) == 1 else f'✓ {len(docs)} documents uploaded successfully',
             'document_count': document_count,
-            'document_id': doc.id
+            'document_id': docs[0].id,
+            'document_ids': [doc.id for doc in docs],
         })
     
     except Exception as e:
@@ -0,0 +1,167 @@
+"""
+Resumable chunked upload API for large case documents (scanned Fact Finder
+packets of hundreds of MB). See cases/services/chunked_upload_service.py.
+
+    POST   /cases/<case_id>/uploads/                      start: {"filename", "size", "chunk_size"?, "notes"?}
+    GET    /cases/uploads/<upload_id>/                    chunks received so far, to resume
+    PUT    /cases/uploads/<upload_id>/chunks/<offset>/    raw chunk bytes, X-Chunk-SHA256 header
+    POST   /cases/uploads/<upload_id>/complete/           attach the file to the case
+    DELETE /cases/uploads/<upload_id>/                    abort
+
+Chunks may be sent in parallel and in any order; resending one is harmless.
+"""
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
+
+from cases.models import Case, ChunkedUpload
+from cases.services import chunked_upload_service
+from cases.services.chunked_upload_service import ChunkedUploadError
+
+logger = logging.getLogger(__name__)
+
+# Case statuses a member may add documents in (drafts, and the statuses upload_member_documents allows)
+UPLOAD_STATUSES = ['draft', 'submitted', 'accepted', 'hold', 'pending_review', 'resubmitted', 'needs_resubmission']
+
+
+def _upload_state(upload):
+    received = chunked_upload_service.received_chunks(upload)
+    return {
+        'success': True,
+        'upload_id': str(upload.upload_id),
+        'status': upload.status,
+        'size': upload.total_size,
+        'chunk_size': upload.chunk_size,
+        'chunk_count': upload.chunk_count,
+        'received_offsets': [index * upload.chunk_size for index in received],
+        'document_id': upload.document_id,
+    }
+
+
+def _get_own_upload(request, upload_id):
+    return get_object_or_404(ChunkedUpload, upload_id=upload_id, uploaded_by=request.user)
+
+
+@login_required
+@require_http_methods(["POST"])
+def start_chunked_upload(request, case_id):
+    """Start a resumable upload of one document to the member's case"""
+    case = get_object_or_404(Case, id=case_id)
+    if case.member != request.user:
+        return JsonResponse({'success': False, 'error': 'Not your case'}, status=403)
+    if case.status not in UPLOAD_STATUSES:
+        return JsonResponse({
+            'success': False,
+            'error': f'Cannot upload documents for {case.get_status_display()} cases'
+        }, status=400)
+
+    try:
+        payload = json.loads(request.body or b'{}')
+        total_size = int(payload.get('size', 0))
+        chunk_size = int(payload['chunk_size']) if payload.get('chunk_size') else None
+    except (ValueError, TypeError):
+        return JsonResponse({'success': False, 'error': 'Expected JSON with filename and size'}, status=400)
+
+    # Documents of a draft go with the Fact Finder; later ones are supporting documents
+    document_type = 'fact_finder' if case.status == 'draft' else 'supporting'
+    try:
+        upload = chunked_upload_service.start_upload(
+            case,
+            request.user,
+            payload.get('filename'),
+            total_size,
+            document_type,
+            notes=str(payload.get('notes', '')).strip(),
+            chunk_size=chunk_size,
+        )
+    except ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    except Exception as e:
+        logger.error(f'Error starting chunked upload for case {case_id}: {str(e)}', exc_info=True)
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    return JsonResponse(_upload_state(upload), status=201)
+
+
+@login_required
+@require_http_methods(["GET", "DELETE"])
+def chunked_upload_detail(request, upload_id):
+    """GET: chunks received so far. DELETE: abort the upload."""
+    upload = _get_own_upload(request, upload_id)
+    if request.method == 'DELETE':
+        try:
+            chunked_upload_service.abort_upload(upload)
+        except Exception as e:
+            logger.error(f'Error aborting chunked upload {upload_id}: {str(e)}', exc_info=True)
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    return JsonResponse(_upload_state(upload))
+
+
+@login_required
+@require_http_methods(["PUT"])
+def upload_chunk(request, upload_id, offset):
+    """Receive the chunk starting at offset; the body is the raw bytes"""
+    upload = _get_own_upload(request, upload_id)
+    try:
+        # Read from the request stream, so the chunk never goes through request.body
+        part, written = chunked_upload_service.write_chunk(
+            upload, offset, request, request.headers.get('X-Chunk-SHA256'),
+        )
+    except ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    except Exception as e:
+        logger.error(f'Error storing chunk {offset} of upload {upload_id}: {str(e)}', exc_info=True)
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    return JsonResponse({
+        'success': True,
+        'offset': offset,
+        'size': part.size,
+        'sha256': part.sha256,
+        'already_received': not written,
+    })
+
+
+@login_required
+@require_http_methods(["POST"])
+def complete_chunked_upload(request, upload_id):
+    """Assemble the chunks and attach the file to the case as a CaseDocument"""
+    upload = _get_own_upload(request, upload_id)
+    already_complete = upload.status == 'complete'
+    try:
+        upload, doc = chunked_upload_service.complete_upload(upload.upload_id)
+    except ChunkedUploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    except Exception as e:
+        logger.error(f'Error completing chunked upload {upload_id}: {str(e)}', exc_info=True)
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    case = upload.case
+    if not already_complete and case.status != 'draft':
+        # Same follow-up as upload_member_documents: flag the case and log the upload
+        case.has_member_new_info = True
+        case.save()
+
+        from core.models import AuditLog
+        AuditLog.log_activity(
+            user=request.user,
+            action_type='member_document_uploaded',
+            case=case,
+            description=f'Member uploaded document: {doc.original_filename}',
+            metadata={
+                'document_id': doc.id,
+                'original_filename': upload.filename,
+                'file_size': upload.total_size,
+                'notes': upload.notes
+            }
+        )
+
+    return JsonResponse({
+        'success': True,
+        'message': '✓ Document uploaded successfully',
+        'document_id': doc.id,
+    })
@@ -0,0 +1,88 @@
+"""
+Server-Sent Events stream for unread counts and member notifications.
+
+Dashboards and the case detail page open one EventSource to this endpoint
+instead of re-fetching the JSON polling endpoints. The stream must be served
+through config/asgi.py; under plain WSGI it answers 204 so browsers stop
+reconnecting and the pages keep their load-time fetches.
+"""
+import asyncio
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+
+from cases.services import realtime_service
+
+logger = logging.getLogger(__name__)
+
+
+def _format_event(event_type, data):
+    """Encode one SSE frame"""
+    return f'event: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+
+async def _event_stream(user_id):
+    """
+    Yield SSE frames for a user until the connection's lifetime runs out.
+
+    An 'unread' frame is sent on connect and whenever the badge state changes.
+    Events published in this process are forwarded as-is and trigger an
+    immediate state re-check; otherwise the state is re-read every
+    REALTIME_POLL_INTERVAL seconds to catch writes from other workers.
+    """
+    poll_interval = settings.REALTIME_POLL_INTERVAL
+    deadline = time.monotonic() + settings.REALTIME_STREAM_MAX_SECONDS
+    queue = realtime_service.subscribe(user_id)
+    get_state = sync_to_async(realtime_service.get_badge_state)
+    last_state = None
+
+    try:
+        # Tell the browser how long to wait before reconnecting after we close
+        yield f'retry: {poll_interval * 1000}\n\n'
+
+        while time.monotonic() < deadline:
+            state = await get_state(user_id)
+            if state != last_state:
+                yield _format_event('unread', state)
+                last_state = state
+
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                # Comment frame keeps proxies from closing an idle connection
+                yield ': keepalive\n\n'
+                continue
+
+            yield _format_event(event['event'], event['data'])
+    finally:
+        realtime_service.unsubscribe(user_id, queue)
+
+
+async def event_stream(request):
+    """
+    Open an SSE stream for the logged-in user.
+
+    EVENTS:
+    - unread: {total_unread, unread_notifications, latest_notification_id}
+    - message: {case_id, message_id} - new message addressed to this user
+    - read: {case_id} - this user read a case's messages in another tab
+    - notification: {id, case_id, notification_type, title}
+    - case_status: {case_id, status}
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would buffer the stream forever - 204 tells EventSource to give up
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(_event_stream(user.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable nginx proxy buffering
+    return response
@@ -229,6 +229,71 @@ def download_document(request, doc_id):
         filename=os.path.basename(doc.file.name)
     )
 
+# Folder per document type inside "download all" archives; 'case_report' is CaseReport.report_file
+ZIP_FOLDERS = {
+    'fact_finder': 'Federal Fact Finder',
+    'supporting': 'Supporting Documents',
+    'report': 'Reports',
+    'other': 'Other',
+    'case_report': 'Case Reports',
+}
+
+@login_required
+def download_all_documents(request, case_id):
+    """
+    Download a case's documents as one ZIP, streamed as it is built.
+    Optional ?type=<document_type> (repeatable; 'case_report' for CaseReport files) limits the contents.
+    """
+    from django.http import StreamingHttpResponse
+    from cases.models import CaseReport
+    from cases.services.zip_stream_service import ZipEntry, stream_zip
+    
+    case = get_object_or_404(Case, id=case_id)
+    
+    # Check permissions (same as download_document)
+    if request.user.role == 'member' and case.member != request.user:
+        return HttpResponse('Access denied', status=403)
+    
+    requested_types = request.GET.getlist('type') or list(ZIP_FOLDERS)
+    unknown_types = set(requested_types) - set(ZIP_FOLDERS)
+    if unknown_types:
+        return HttpResponse(f'Unknown document type: {", ".join(sorted(unknown_types))}', status=400)
+    
+    # Members only get the technician's reports once the case is released (as on case_detail)
+    if request.user.role == 'member' and case.status == 'completed' and case.actual_release_date is None:
+        requested_types = [t for t in requested_types if t not in ('report', 'case_report')]
+    
+    files = []
+    documents = CaseDocument.objects.filter(
+        case=case, document_type__in=requested_types
+    ).exclude(file='').order_by('document_type', 'uploaded_at')
+    for doc in documents:
+        name = doc.original_filename or os.path.basename(doc.file.name)
+        files.append((ZIP_FOLDERS[doc.document_type], name, doc.file, doc.file_size, doc.uploaded_at))
+    if 'case_report' in requested_types:
+        for report in CaseReport.objects.filter(case=case).exclude(report_file='').exclude(report_file__isnull=True):
+            name = f'Report {report.report_number} - {os.path.basename(report.report_file.name)}'
+            files.append((ZIP_FOLDERS['case_report'], name, report.report_file, None, report.updated_at))
+    
+    if not files:
+        return HttpResponse('No documents to download', status=404)
+    
+    entries = []
+    used_names = set()
+    for folder, name, field_file, size, modified in files:
+        arcname = f'{folder}/{name}'
+        stem, extension = os.path.splitext(arcname)
+        copy = 2
+        while arcname.lower() in used_names:
+            arcname = f'{stem} ({copy}){extension}'
+            copy += 1
+        used_names.add(arcname.lower())
+        entries.append(ZipEntry(arcname, field_file, size=size, modified=modified))
+    
+    response = StreamingHttpResponse(stream_zip(entries), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{case.external_case_id}-documents.zip"'
+    return response
+
 @login_required
 def delete_document(request, doc_id):
     """Delete an uploaded document (only if case is not submitted)"""
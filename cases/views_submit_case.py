@@ -7,6 +7,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.http import JsonResponse
+from django.db import transaction
 from datetime import timedelta, datetime
 import json
 from cases.models import Case
@@ -176,33 +177,28 @@ def submit_case(request):
                 special_notes=notes,  # Save notes to special_notes field
                 date_submitted=timezone.now() if action == 'submit' else None,
             )
-            case.save()
-            
-            # Calculate and set default credit value
-            from cases.services.credit_service import calculate_default_credit, set_case_credit
-            default_credit = calculate_default_credit(num_reports)
-            set_case_credit(case, default_credit, user, 'submission', f'Default: {num_reports} report(s) requested')
+            # Write attachments to storage in parallel before opening the transaction;
+            # all documents are stored together as one unified 'fact_finder' type
+            from cases.services.document_upload_service import (
+                build_documents, discard_files, save_documents, upload_files,
+            )
+            documents = build_documents(case, request.FILES.getlist('case_documents'), 'fact_finder', user)
+            upload_files(documents)
             
-            # Handle file uploads - Combined document upload
-            # All documents are now stored together as one unified type
-            if 'case_documents' in request.FILES:
-                files = request.FILES.getlist('case_documents')
-                for file in files:
-                    from cases.models import CaseDocument
-                    import os
+            try:
+                with transaction.atomic():
+                    case.save()
                     
-                    # Append employee last name to filename
-                    filename_with_employee = f"{fed_last_name}_{file.name}"
+                    # Calculate and set default credit value
+                    from cases.services.credit_service import calculate_default_credit, set_case_credit
+                    default_credit = calculate_default_credit(num_reports)
+                    set_case_credit(case, default_credit, user, 'submission', f'Default: {num_reports} report(s) requested')
                     
-                    # All documents stored as 'fact_finder' type (unified document type)
-                    CaseDocument.objects.create(
-                        case=case,
-                        document_type='fact_finder',
-                        original_filename=filename_with_employee,
-                        file_size=file.size,
-                        uploaded_by=user,
-                        file=file,
-                    )
+                    save_documents(documents)
+            except Exception:
+                # The case was rolled back, so remove the files stored for it
+                discard_files(documents)
+                raise
             
             # Get document count message using helper function
             from cases.services.document_count_service import get_document_count_message
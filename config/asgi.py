@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The realtime event stream (cases/views_events.py) needs this entry point - a
+WSGI worker cannot hold Server-Sent Events connections open. Serve it with:
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -14,3 +19,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Compile the PDF stylesheets and resolve fonts before the first PDF request
+from cases.services.pdf_renderer import warm_up_on_startup  # noqa: E402
+warm_up_on_startup()
@@ -49,11 +49,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SamplingProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -102,15 +104,62 @@ if DB_ENGINE == 'django.db.backends.mysql':
         }
     }
 else:
-    # Default to SQLite for development
+    # Default to SQLite for development (SQLITE_NAME points elsewhere, e.g. a benchmark dataset)
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'NAME': config('SQLITE_NAME', default=str(BASE_DIR / 'db.sqlite3')),
         }
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# CACHE_BACKEND selects the tier: 'locmem' (per process, development default),
+# 'file' (shared by all workers on one host) or 'redis' (shared across hosts).
+# Use file or redis whenever more than one worker serves the app, so cache
+# invalidations (preferences, dashboard rows, released case pages) are seen by all of them.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_DEFAULT_TIMEOUT = config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int)
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('CACHE_LOCATION', default='redis://127.0.0.1:6379/1'),
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+            'KEY_PREFIX': 'advisor_portal',
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.cache')),
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=20000, cast=int)},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'advisor-portal',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=20000, cast=int)},
+        }
+    }
+
+# Dashboard rows are cached per case, keyed on the case's and its member's, technician's
+# and reviewer's updated_at plus role and visible columns; this only bounds cache size.
+DASHBOARD_ROW_CACHE_TIMEOUT = config('DASHBOARD_ROW_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Rendered case_detail pages of released cases (cases/services/page_cache_service.py).
+# Case, document, note and message changes invalidate immediately; this bounds staleness
+# of data the page shows from elsewhere (technician list, user names).
+CASE_PAGE_CACHE_TIMEOUT = config('CASE_PAGE_CACHE_TIMEOUT', default=3600, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -172,6 +221,15 @@ USE_SPACES = config('USE_SPACES', default=False, cast=bool)
 if USE_SPACES and AWS_ACCESS_KEY_ID:
     # Use DigitalOcean Spaces for media storage
     DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+    # Uploads over AWS_S3_MULTIPART_THRESHOLD_MB are sent as s3transfer multipart uploads
+    # streamed from the request's temp file. Parts per file are limited because
+    # DOCUMENT_UPLOAD_WORKERS files of one form post are uploaded at the same time.
+    from boto3.s3.transfer import TransferConfig
+    AWS_S3_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=config('AWS_S3_MULTIPART_THRESHOLD_MB', default=8, cast=int) * 1024 * 1024,
+        multipart_chunksize=config('AWS_S3_MULTIPART_CHUNKSIZE_MB', default=8, cast=int) * 1024 * 1024,
+        max_concurrency=config('AWS_S3_MULTIPART_CONCURRENCY', default=4, cast=int),
+    )
     if AWS_S3_CUSTOM_DOMAIN:
         MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/{AWS_LOCATION}/'
     else:
@@ -204,6 +262,79 @@ BENEFITS_SOFTWARE_API_KEY = config('BENEFITS_SOFTWARE_API_KEY', default='placeho
 BENEFITS_SOFTWARE_API_TIMEOUT = config('BENEFITS_SOFTWARE_API_TIMEOUT', default=30, cast=int)
 BENEFITS_SOFTWARE_API_MAX_RETRIES = config('BENEFITS_SOFTWARE_API_MAX_RETRIES', default=3, cast=int)
 
+# Realtime updates (Server-Sent Events served via config/asgi.py)
+# Streams re-check unread counts every REALTIME_POLL_INTERVAL seconds to pick up
+# writes from other worker processes, and close after REALTIME_STREAM_MAX_SECONDS
+# so the browser reconnects and DB connections are recycled.
+REALTIME_POLL_INTERVAL = config('REALTIME_POLL_INTERVAL', default=15, cast=int)
+REALTIME_STREAM_MAX_SECONDS = config('REALTIME_STREAM_MAX_SECONDS', default=300, cast=int)
+
+# run_scheduler daemon (cases/management/commands/run_scheduler.py)
+# The due-time queue is reloaded every SCHEDULER_REFRESH_SECONDS to pick up releases
+# scheduled by web workers; the leader lease expires after SCHEDULER_LOCK_TTL seconds
+# without renewal, and failed benefits-software syncs are retried every
+# SCHEDULER_API_RETRY_INTERVAL seconds. Files of deleted documents and reports are
+# removed from storage every SCHEDULER_STORAGE_DELETION_INTERVAL seconds, at most
+# SCHEDULER_STORAGE_DELETION_BATCHES batches of 1000 per pass so the lease is renewed
+# in between; a pass that fills its quota is followed by another right after renewal.
+SCHEDULER_REFRESH_SECONDS = config('SCHEDULER_REFRESH_SECONDS', default=30, cast=int)
+SCHEDULER_LOCK_TTL = config('SCHEDULER_LOCK_TTL', default=90, cast=int)
+SCHEDULER_API_RETRY_INTERVAL = config('SCHEDULER_API_RETRY_INTERVAL', default=900, cast=int)
+SCHEDULER_STORAGE_DELETION_INTERVAL = config('SCHEDULER_STORAGE_DELETION_INTERVAL', default=60, cast=int)
+SCHEDULER_STORAGE_DELETION_BATCHES = config('SCHEDULER_STORAGE_DELETION_BATCHES', default=5, cast=int)
+
+# Files of one case submission or member upload are written to storage by up to
+# DOCUMENT_UPLOAD_WORKERS threads (cases/services/document_upload_service.py)
+DOCUMENT_UPLOAD_WORKERS = config('DOCUMENT_UPLOAD_WORKERS', default=4, cast=int)
+
+# Resumable chunked uploads (cases/services/chunked_upload_service.py)
+# Large documents are sent in CHUNKED_UPLOAD_CHUNK_SIZE_MB chunks (5 MB minimum, the
+# S3 part size limit); uploads that receive nothing for CHUNKED_UPLOAD_EXPIRE_HOURS are
+# aborted by: python manage.py expire_chunked_uploads
+CHUNKED_UPLOAD_CHUNK_SIZE_MB = config('CHUNKED_UPLOAD_CHUNK_SIZE_MB', default=8, cast=int)
+CHUNKED_UPLOAD_MAX_SIZE_MB = config('CHUNKED_UPLOAD_MAX_SIZE_MB', default=2048, cast=int)
+CHUNKED_UPLOAD_EXPIRE_HOURS = config('CHUNKED_UPLOAD_EXPIRE_HOURS', default=24, cast=int)
+
+# Request metrics (core/middleware.py, page at /metrics/requests/)
+# Per-request timings are buffered in memory (at most REQUEST_METRICS_BUFFER_SIZE per
+# process) and written to RequestMetric every REQUEST_METRICS_FLUSH_SECONDS. Rows older
+# than REQUEST_METRICS_RETENTION_DAYS are deleted by the prune_request_metrics command (cron).
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+REQUEST_METRICS_BUFFER_SIZE = config('REQUEST_METRICS_BUFFER_SIZE', default=5000, cast=int)
+REQUEST_METRICS_FLUSH_SECONDS = config('REQUEST_METRICS_FLUSH_SECONDS', default=30, cast=int)
+REQUEST_METRICS_RETENTION_DAYS = config('REQUEST_METRICS_RETENTION_DAYS', default=14, cast=int)
+
+# On-demand request profiler (core/views_profiler.py). Off by default: when enabled, each
+# process re-reads armed sessions every PROFILER_POLL_SECONDS, and nothing is sampled
+# unless an administrator arms one.
+PROFILER_ENABLED = config('PROFILER_ENABLED', default=False, cast=bool)
+PROFILER_POLL_SECONDS = config('PROFILER_POLL_SECONDS', default=5, cast=int)
+
+# Prometheus endpoint (/metrics, core/prometheus.py)
+# Under gunicorn with several workers set PROMETHEUS_MULTIPROC_DIR to a directory the
+# workers share (e.g. /run/advisor-portal/metrics, emptied on deploy) so /metrics reports
+# totals for all of them. Scrapes are allowed from METRICS_ALLOWED_IPS, or from anywhere
+# with "Authorization: Bearer <METRICS_TOKEN>" when a token is set.
+PROMETHEUS_MULTIPROC_DIR = config('PROMETHEUS_MULTIPROC_DIR', default='')
+PROMETHEUS_DUMP_SECONDS = config('PROMETHEUS_DUMP_SECONDS', default=5, cast=int)
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Fact Finder PDF renderer (cases/services/pdf_generator.py): 'html' lays out
+# fact_finder_pdf_professional.html with WeasyPrint; 'form' fills the AcroForm fields of
+# the official Federal-Fact-Finder-Template.pdf with pypdf, which is much faster but only
+# shows the fields mapped in cases/services/pdf_form_handler.py. Startup fails with 'form'
+# while the template has fields the map does not cover (the map is still partial).
+FACT_FINDER_PDF_RENDERER = config('FACT_FINDER_PDF_RENDERER', default='html')
+
+# Web processes compile the PDF stylesheets and load fonts at startup, before serving
+# (cases/services/pdf_renderer.py), instead of on the first PDF request.
+PDF_RENDERER_WARM_UP = config('PDF_RENDERER_WARM_UP', default=True, cast=bool)
+
+# UserPreference cache (cases/services/preference_service.py)
+# Saves invalidate immediately; this bounds how long admin edits take to show up.
+PREFERENCE_CACHE_TIMEOUT = config('PREFERENCE_CACHE_TIMEOUT', default=3600, cast=int)
+
 # TinyMCE Configuration for Rich Text Editing
 TINYMCE_DEFAULT_CONFIG = {
     'height': 300,
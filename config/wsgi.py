@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Compile the PDF stylesheets and resolve fonts before the first PDF request
+from cases.services.pdf_renderer import warm_up_on_startup  # noqa: E402
+warm_up_on_startup()
@@ -5,5 +5,7 @@ class CoreConfig(AppConfig):
     name = 'core'
     
     def ready(self):
-        """Register signal handlers when app is ready"""
+        """Register signal handlers and request metrics instrumentation when app is ready"""
         import core.signals  # noqa
+        from core.middleware import install_template_timing
+        install_template_timing()
@@ -0,0 +1,40 @@
+"""
+Django management command deleting RequestMetric rows older than
+REQUEST_METRICS_RETENTION_DAYS. Runs in batches so no single DELETE holds
+locks on the table for long; request handling never prunes.
+
+Cron example (daily at 03:30):
+    30 3 * * * cd /path/to/project && python manage.py prune_request_metrics
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import RequestMetric
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Delete request metrics older than REQUEST_METRICS_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.REQUEST_METRICS_RETENTION_DAYS,
+            help=f'Keep this many days of metrics (default: {settings.REQUEST_METRICS_RETENTION_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = RequestMetric.objects.filter(created_at__lt=cutoff).order_by()
+        deleted = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            deleted += RequestMetric.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} request metric(s) older than {options["days"]} day(s)'))
@@ -0,0 +1,346 @@
+"""
+Request metrics and on-demand profiling middleware.
+
+Records, per resolved view name, the request wall time, SQL query count and
+time, repeated SQL statements (N+1 fingerprints) and template render time.
+Metrics go to an in-process ring buffer (oldest dropped if the database is
+unreachable for long) that a daemon thread flushes to RequestMetric in one
+bulk insert every REQUEST_METRICS_FLUSH_SECONDS, or sooner once the buffer
+is half full; requests only append to the buffer. See core/views_metrics.py
+for the p50/p95 page.
+
+Template time covers the top-level render() of each response, including
+queries run from inside the template. The timing wrapper is installed once
+at startup (CoreConfig.ready). Old rows are removed by the
+prune_request_metrics command, never during a request.
+
+SamplingProfilerMiddleware profiles the requests an administrator armed a
+ProfilingSession for (core/views_profiler.py); with no session armed it
+only compares a timestamp per request.
+"""
+import contextvars
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.db.models import F
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils import timezone
+
+from core.prometheus import HTTP_REQUEST_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Statements repeated this many times in one request are listed on the metrics page
+DUPLICATE_THRESHOLD = 2
+MAX_DUPLICATES_STORED = 5
+
+_collector = contextvars.ContextVar('request_metrics_collector', default=None)
+
+_buffer_lock = threading.Lock()
+_buffer = deque(maxlen=settings.REQUEST_METRICS_BUFFER_SIZE)
+_flush_state = {'thread': None}
+_flush_wanted = threading.Event()
+
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+class _Collector:
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.statements = Counter()
+        self.template_time = 0.0
+        self.rendering = False
+
+
+def _fingerprint(sql):
+    """Statement shape: parameters are already placeholders; collapse IN lists of any length"""
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+def _record_query(execute, sql, params, many, context):
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        collector.query_time += time.perf_counter() - start
+        collector.query_count += 1
+        collector.statements[_fingerprint(sql)] += 1
+
+
+_original_template_render = DjangoTemplate.render
+
+
+def _timed_template_render(self, context=None, request=None):
+    collector = _collector.get()
+    if collector is None or collector.rendering:
+        return _original_template_render(self, context, request)
+    collector.rendering = True
+    start = time.perf_counter()
+    try:
+        return _original_template_render(self, context, request)
+    finally:
+        collector.template_time += time.perf_counter() - start
+        collector.rendering = False
+
+
+def install_template_timing():
+    """Wrap Django template rendering with the collector's timer (once per process)"""
+    if settings.REQUEST_METRICS_ENABLED:
+        DjangoTemplate.render = _timed_template_render
+
+
+def flush_request_metrics():
+    """
+    Write buffered metrics to RequestMetric.
+
+    Returns:
+        int: Number of metrics written
+    """
+    from core.models import RequestMetric
+
+    with _buffer_lock:
+        pending = list(_buffer)
+        _buffer.clear()
+    if not pending:
+        return 0
+
+    try:
+        RequestMetric.objects.bulk_create([RequestMetric(**metric) for metric in pending], batch_size=500)
+    except Exception:
+        logger.exception('Could not flush request metrics; keeping them buffered')
+        with _buffer_lock:
+            _buffer.extendleft(reversed(pending))
+        return 0
+    return len(pending)
+
+
+def _flush_forever():
+    from django.db import close_old_connections
+    while True:
+        _flush_wanted.wait(settings.REQUEST_METRICS_FLUSH_SECONDS)
+        _flush_wanted.clear()
+        close_old_connections()
+        try:
+            flush_request_metrics()
+        finally:
+            connections.close_all()  # This thread's connections only
+
+
+def _ensure_flusher():
+    """Start the flush thread on first use in this process (again in each forked worker)"""
+    thread = _flush_state['thread']
+    if thread is not None and thread.is_alive():
+        return
+    with _buffer_lock:
+        thread = _flush_state['thread']
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_flush_forever, name='request-metrics-flush', daemon=True)
+            _flush_state['thread'] = thread
+            thread.start()
+
+
+class RequestMetricsMiddleware:
+    """
+    Place first in MIDDLEWARE so the timing covers every other middleware.
+    Under ASGI only wall time is recorded: async views run their queries in
+    worker threads this middleware does not instrument.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        collector = _Collector()
+        token = _collector.set(collector)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_record_query))
+                response = self.get_response(request)
+        finally:
+            _collector.reset(token)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, collector, duration)
+        return response
+
+    async def __acall__(self, request):
+        collector = _Collector()
+        token = _collector.set(collector)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _collector.reset(token)
+        duration = time.perf_counter() - start
+
+        await sync_to_async(self.record)(request, response, collector, duration)
+        return response
+
+    def record(self, request, response, collector, duration):
+        match = getattr(request, 'resolver_match', None)
+        duplicates = [
+            {'sql': sql[:500], 'count': count}
+            for sql, count in collector.statements.most_common(MAX_DUPLICATES_STORED)
+            if count >= DUPLICATE_THRESHOLD
+        ]
+        url_name = (match.view_name if match else '<unresolved>')[:200]
+        HTTP_REQUEST_DURATION.observe(
+            duration, view=url_name, method=request.method, status=response.status_code
+        )
+        metric = {
+            'url_name': url_name,
+            'method': request.method,
+            'status_code': response.status_code,
+            'duration_ms': duration * 1000,
+            'query_count': collector.query_count,
+            'query_ms': collector.query_time * 1000,
+            'duplicate_query_count': collector.query_count - len(collector.statements),
+            'duplicate_queries': duplicates,
+            'template_ms': collector.template_time * 1000,
+            'created_at': timezone.now(),
+        }
+
+        with _buffer_lock:
+            _buffer.append(metric)
+            half_full = len(_buffer) >= _buffer.maxlen // 2
+        _ensure_flusher()
+        if half_full:
+            _flush_wanted.set()
+
+
+_profiling_state = {'sessions': [], 'checked_at': None}
+
+
+def _armed_sessions():
+    """Active ProfilingSessions, re-read at most every PROFILER_POLL_SECONDS per process"""
+    now = time.monotonic()
+    checked_at = _profiling_state['checked_at']
+    if checked_at is None or now - checked_at >= settings.PROFILER_POLL_SECONDS:
+        from core.models import ProfilingSession
+        _profiling_state['checked_at'] = now
+        try:
+            _profiling_state['sessions'] = [
+                (session, re.compile(session.url_pattern))
+                for session in ProfilingSession.objects.filter(remaining_count__gt=0, stopped_at__isnull=True)
+            ]
+        except Exception:
+            logger.exception('Could not load profiling sessions')
+            _profiling_state['sessions'] = []
+    return _profiling_state['sessions']
+
+
+def expire_profiling_sessions():
+    """Make this process re-read sessions on the next request (after arming or stopping one)"""
+    _profiling_state['checked_at'] = None
+
+
+class SamplingProfilerMiddleware:
+    """
+    Place after AuthenticationMiddleware so sessions can match on the user.
+    Profiles only run for sync (WSGI) requests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.get_response(request)
+        sessions = _armed_sessions()
+        if not sessions:
+            return self.get_response(request)
+        session = self.claim_session(request, sessions)
+        if session is None:
+            return self.get_response(request)
+        return self.profile(request, session)
+
+    def claim_session(self, request, sessions):
+        from core.models import ProfilingSession
+        for session, pattern in sessions:
+            if session.url_pattern and not pattern.search(request.path):
+                continue
+            if session.user_id and request.user.pk != session.user_id:
+                continue
+            claimed = ProfilingSession.objects.filter(
+                pk=session.pk, remaining_count__gt=0, stopped_at__isnull=True
+            ).update(remaining_count=F('remaining_count') - 1)
+            if claimed:
+                return session
+            # Used up or stopped by another process
+            expire_profiling_sessions()
+        return None
+
+    def profile(self, request, session):
+        from core.models import RequestProfile
+        from core.profiler import QueryRecorder, StackSampler, format_collapsed
+
+        recorder = QueryRecorder(_fingerprint)
+        sampler = StackSampler(session.interval_ms / 1000)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                stacks = sampler.stop()
+        duration = time.perf_counter() - start
+
+        queries = recorder.summary()
+        match = getattr(request, 'resolver_match', None)
+        try:
+            RequestProfile.objects.create(
+                session=session,
+                path=request.path[:500],
+                url_name=(match.view_name if match else '')[:200],
+                method=request.method,
+                status_code=response.status_code,
+                user=request.user if request.user.is_authenticated else None,
+                duration_ms=duration * 1000,
+                sample_count=sum(stacks.values()),
+                profile_file=ContentFile(
+                    format_collapsed(stacks).encode('utf-8'),
+                    name=f'{session.pk}-{secrets.token_hex(6)}.folded'
+                ),
+                query_count=sum(entry['count'] for entry in recorder.statements.values()),
+                query_ms=sum(entry['ms'] for entry in recorder.statements.values()),
+                queries=queries,
+            )
+        except Exception:
+            logger.exception(f'Could not save profile of {request.path}')
+        return response
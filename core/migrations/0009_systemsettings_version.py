@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_add_email_notifications_enabled_toggle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemsettings',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every save; other processes reload their cached settings when it changes'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_systemsettings_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(help_text="Resolved view name, e.g. 'cases:case_detail'", max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField(help_text='Wall time of the whole request')),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('query_ms', models.FloatField(default=0)),
+                ('duplicate_query_count', models.PositiveIntegerField(default=0, help_text='Queries repeating an already-run statement (N+1 pattern)')),
+                ('duplicate_queries', models.JSONField(blank=True, default=list, help_text='Most repeated statements: [{"sql": ..., "count": ...}]')),
+                ('template_ms', models.FloatField(default=0, help_text='Time spent rendering templates')),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Request Metric',
+                'verbose_name_plural': 'Request Metrics',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['url_name', '-created_at'], name='core_reques_url_nam_7f90de_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_requestmetric'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilingSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_pattern', models.CharField(blank=True, help_text='Regular expression searched in the request path; blank matches every path', max_length=200)),
+                ('requested_count', models.PositiveIntegerField(help_text='Number of requests to profile')),
+                ('remaining_count', models.PositiveIntegerField(help_text='Requests still to be profiled')),
+                ('interval_ms', models.PositiveSmallIntegerField(default=5, help_text='Stack sampling interval')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('stopped_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiling_sessions', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(blank=True, help_text='Only profile requests by this user; blank for any user', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Profiling Session',
+                'verbose_name_plural': 'Profiling Sessions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500)),
+                ('url_name', models.CharField(blank=True, max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('sample_count', models.PositiveIntegerField()),
+                ('profile_file', models.FileField(upload_to='profiles/%Y/%m/%d/')),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('query_ms', models.FloatField(default=0)),
+                ('queries', models.JSONField(blank=True, default=list, help_text='SQL by statement shape: [{"sql", "count", "ms", "callers"}], slowest first')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profiles', to='core.profilingsession')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Request Profile',
+                'verbose_name_plural': 'Request Profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import F
+from django.core.signals import request_started
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.dispatch import receiver
 from django.utils import timezone
+import threading
 
 
 class AuditLog(models.Model):
@@ -179,10 +183,21 @@ class AuditLog(models.Model):
 
 
 
+# Process-wide cached SystemSettings instance (see SystemSettings.get_settings)
+_settings_cache = {'instance': None}
+# Per-thread flag: has the cached instance been checked against the DB version yet?
+_settings_check = threading.local()
+
+
 class SystemSettings(models.Model):
     """
     Global system configuration settings for the advisor portal.
     Uses a singleton pattern - only one instance should exist.
+    
+    get_settings() returns a process-cached instance and re-reads the row only
+    when its version column has changed. The version is checked at most once
+    per request (and once per management command run), so code paths that
+    read settings per email or per case hit the database once.
     """
     
     # Credits Management
@@ -299,6 +314,10 @@ class SystemSettings(models.Model):
     )
     
     # Metadata
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text='Incremented on every save; other processes reload their cached settings when it changes'
+    )
     updated_at = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey(
         'accounts.User',
@@ -315,12 +334,194 @@ class SystemSettings(models.Model):
     def __str__(self):
         return 'System Settings'
     
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.version = (self.version or 0) + 1
+        else:
+            # Incremented by the database, so concurrent saves never reuse a version
+            self.version = F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'version' not in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['version']
+        super().save(*args, **kwargs)
+        if not isinstance(self.version, int):
+            self.refresh_from_db(fields=['version'])
+        # Drop this process's copy; other processes see the new version on their next check
+        _settings_cache['instance'] = None
+    
+    @classmethod
+    def get_settings(cls, cached=True):
+        """
+        Get or create the singleton settings instance.
+        
+        Args:
+            cached: Return the shared process-cached instance (read-only use).
+                    Pass False to get a fresh instance that is safe to modify and save.
+        """
+        if not cached:
+            obj, created = cls.objects.get_or_create(pk=1)
+            return obj
+        
+        instance = _settings_cache['instance']
+        if instance is not None and getattr(_settings_check, 'checked', False):
+            return instance
+        
+        if instance is not None:
+            current_version = cls.objects.filter(pk=1).values_list('version', flat=True).first()
+            if current_version != instance.version:
+                instance = None
+        
+        if instance is None:
+            instance, created = cls.objects.get_or_create(pk=1)
+            _settings_cache['instance'] = instance
+        
+        _settings_check.checked = True
+        return instance
+    
     @classmethod
-    def get_settings(cls):
-        """Get or create the singleton settings instance"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+    def expire_cached_settings(cls):
+        """
+        Make the next get_settings() call in this thread re-check the version.
+        Called at the start of every request; long-running loops should call it
+        once per iteration.
+        """
+        _settings_check.checked = False
     
     def get_available_credits_list(self):
         """Return available credits as a list of floats"""
         return [float(x.strip()) for x in self.available_credits.split(',')]
+
+
+@receiver(request_started)
+def expire_cached_system_settings(sender, **kwargs):
+    """Re-check the SystemSettings version once per request"""
+    SystemSettings.expire_cached_settings()
+
+
+class RequestMetric(models.Model):
+    """
+    Timing and query counts for one request, recorded by
+    core.middleware.RequestMetricsMiddleware and flushed here in batches.
+    Shown per view (p50/p95, N+1 offenders) on the request metrics page.
+    """
+    
+    url_name = models.CharField(
+        max_length=200,
+        help_text="Resolved view name, e.g. 'cases:case_detail'"
+    )
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    
+    duration_ms = models.FloatField(help_text='Wall time of the whole request')
+    query_count = models.PositiveIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    duplicate_query_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Queries repeating an already-run statement (N+1 pattern)'
+    )
+    duplicate_queries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Most repeated statements: [{"sql": ..., "count": ...}]'
+    )
+    template_ms = models.FloatField(default=0, help_text='Time spent rendering templates')
+    
+    created_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Request Metric'
+        verbose_name_plural = 'Request Metrics'
+        indexes = [
+            models.Index(fields=['url_name', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.method} {self.url_name} {self.duration_ms:.0f}ms ({self.query_count} queries)"
+
+
+class ProfilingSession(models.Model):
+    """
+    Admin request to profile the next N requests matching a URL pattern
+    and/or user, picked up by core.middleware.SamplingProfilerMiddleware.
+    Each captured request is stored as a RequestProfile.
+    """
+    
+    url_pattern = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='Regular expression searched in the request path; blank matches every path'
+    )
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Only profile requests by this user; blank for any user'
+    )
+    requested_count = models.PositiveIntegerField(help_text='Number of requests to profile')
+    remaining_count = models.PositiveIntegerField(help_text='Requests still to be profiled')
+    interval_ms = models.PositiveSmallIntegerField(default=5, help_text='Stack sampling interval')
+    
+    created_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='profiling_sessions'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    stopped_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Profiling Session'
+        verbose_name_plural = 'Profiling Sessions'
+    
+    def __str__(self):
+        return f"Profile {self.url_pattern or '*'} ({self.requested_count - self.remaining_count}/{self.requested_count})"
+    
+    @property
+    def is_active(self):
+        return self.remaining_count > 0 and self.stopped_at is None
+
+
+class RequestProfile(models.Model):
+    """
+    Sampled stacks of one profiled request (collapsed-stack file in storage,
+    one 'frame;frame;frame count' line per distinct stack) and the SQL it ran.
+    """
+    
+    session = models.ForeignKey(ProfilingSession, on_delete=models.CASCADE, related_name='profiles')
+    path = models.CharField(max_length=500)
+    url_name = models.CharField(max_length=200, blank=True)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    duration_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField()
+    profile_file = models.FileField(upload_to='profiles/%Y/%m/%d/')
+    query_count = models.PositiveIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    queries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='SQL by statement shape: [{"sql", "count", "ms", "callers"}], slowest first'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Request Profile'
+        verbose_name_plural = 'Request Profiles'
+    
+    def __str__(self):
+        return f"{self.method} {self.path} {self.duration_ms:.0f}ms ({self.sample_count} samples)"
@@ -0,0 +1,208 @@
+"""
+Sampling profiler for individual production requests.
+
+StackSampler records the stack of the request thread every interval and
+counts identical stacks, giving collapsed-stack profiles ('outer;inner N'
+lines, as read by flamegraph.pl and speedscope). A helper thread reads the
+request thread's frame through sys._current_frames() on a wall-clock
+interval, so time blocked in the database or network shows up as well as
+Python time. No signals or interval timers are used, so the worker's own
+SIGALRM handling (gunicorn sync worker timeouts) and interrupted system
+calls are left alone.
+
+Used by core.middleware.SamplingProfilerMiddleware only for requests an
+administrator armed a ProfilingSession for; nothing here runs otherwise.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+# Stacks deeper than this are cut at the root end
+MAX_STACK_DEPTH = 200
+
+_BASE_DIR = str(settings.BASE_DIR) + os.sep
+# Instrumentation frames never reported as the code running a query
+_INSTRUMENTATION_FILES = {
+    os.path.abspath(__file__),
+    os.path.join(str(settings.BASE_DIR), 'core', 'middleware.py'),
+}
+
+
+def _short_filename(filename):
+    if filename.startswith(_BASE_DIR):
+        return filename[len(_BASE_DIR):]
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _is_project_file(filename):
+    return (
+        filename.startswith(_BASE_DIR)
+        and 'site-packages' not in filename
+        and os.path.abspath(filename) not in _INSTRUMENTATION_FILES
+    )
+
+
+def collapse_stack(frame):
+    """Stack of frame as 'outer;...;inner', one 'file:function' entry per frame"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f'{_short_filename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def project_caller(frame):
+    """'file:line function' of the innermost project frame (e.g. in cases/views.py), or ''"""
+    while frame is not None:
+        code = frame.f_code
+        if _is_project_file(code.co_filename):
+            return f'{_short_filename(code.co_filename)}:{frame.f_lineno} {code.co_name}'
+        frame = frame.f_back
+    return ''
+
+
+class StackSampler:
+    """
+    Samples the calling thread's stack until stop().
+
+    Usage:
+        sampler = StackSampler(interval=0.005)
+        sampler.start()
+        ...
+        stacks = sampler.stop()   # Counter {collapsed stack: samples}
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample_forever, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._thread.join()
+        return self.stacks
+
+    def _sample_forever(self):
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+
+def format_collapsed(stacks):
+    """Counter of stacks as collapsed-stack text, heaviest first"""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+
+def parse_collapsed(text):
+    stacks = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+def _frame_kind(name):
+    """'sql' for database backend frames, 'project' for this repository's code, else ''"""
+    filename = name.rpartition(':')[0]
+    if 'db/backends/' in filename:
+        return 'sql'
+    if os.path.exists(os.path.join(_BASE_DIR, filename)) and 'site-packages' not in filename:
+        return 'project'
+    return ''
+
+
+def flame_graph(stacks, min_fraction=0.002):
+    """
+    Layout of a flame graph (root at the top) for the template.
+
+    Returns:
+        tuple: (list of dicts with name, kind, samples, depth, left and width
+        in percent of the total; maximum depth)
+    """
+    total = sum(stacks.values())
+    if not total:
+        return [], 0
+
+    root = {'children': {}, 'samples': 0}
+    for stack, count in stacks.items():
+        node = root
+        for name in stack.split(';'):
+            child = node['children'].get(name)
+            if child is None:
+                child = node['children'][name] = {'children': {}, 'samples': 0}
+            child['samples'] += count
+            node = child
+
+    rects = []
+    max_depth = 0
+    pending = [(root['children'], 0, 0)]
+    while pending:
+        children, depth, offset = pending.pop()
+        for name, node in sorted(children.items()):
+            if node['samples'] / total >= min_fraction:
+                rects.append({
+                    'name': name,
+                    'kind': _frame_kind(name),
+                    'samples': node['samples'],
+                    'depth': depth,
+                    'left': offset * 100 / total,
+                    'width': node['samples'] * 100 / total,
+                })
+                max_depth = max(max_depth, depth)
+                pending.append((node['children'], depth + 1, offset))
+            offset += node['samples']
+    return rects, max_depth
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper collecting each statement shape with its count,
+    total time and the project code (view, service) that ran it
+    """
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = self.fingerprint(sql)
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = self.statements[key] = {'sql': key[:2000], 'count': 0, 'ms': 0.0, 'callers': Counter()}
+            entry['count'] += 1
+            entry['ms'] += elapsed * 1000
+            entry['callers'][project_caller(sys._getframe(1))] += 1
+
+    def summary(self, limit=100):
+        """Statements slowest first, as stored in RequestProfile.queries"""
+        statements = sorted(self.statements.values(), key=lambda entry: entry['ms'], reverse=True)
+        return [
+            {
+                'sql': entry['sql'],
+                'count': entry['count'],
+                'ms': round(entry['ms'], 2),
+                'callers': [caller for caller, _ in entry['callers'].most_common(3) if caller],
+            }
+            for entry in statements[:limit]
+        ]
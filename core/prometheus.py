@@ -0,0 +1,318 @@
+"""
+Dependency-free Prometheus metrics registry (text exposition format 0.0.4).
+
+Counters and histograms are kept in process memory. Under a multi-process
+server (gunicorn workers) set PROMETHEUS_MULTIPROC_DIR to a directory shared
+by the workers on the host: each process writes its values to
+metrics_<pid>.json there (every PROMETHEUS_DUMP_SECONDS and at exit), and
+whichever worker serves /metrics adds up all files, so the endpoint reports
+host-wide totals. Files of processes that have exited are folded into
+metrics_archive.json so counters never go backwards. Empty the directory
+when deploying a new release. On Windows (no fcntl, and os.kill(pid, 0)
+would terminate the process rather than probe it) files of exited
+processes are left in place; they are still summed, just not folded.
+
+Application metrics are defined at the bottom of this module and updated
+from the request middleware, PDF generation, email sending, the
+benefits-software client and the scheduler.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from django.conf import settings
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._dumper = None
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+
+    def snapshot(self):
+        """{metric name: {label values json: value}} for this process"""
+        with self._lock:
+            return {
+                name: {key: list(value) if isinstance(value, list) else value for key, value in metric.values.items()}
+                for name, metric in self._metrics.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Multi-process aggregation
+    # ------------------------------------------------------------------
+
+    def touched(self):
+        """Called after every update; starts the background dump thread in multiprocess mode"""
+        if self._dumper is None and settings.PROMETHEUS_MULTIPROC_DIR:
+            with self._lock:
+                if self._dumper is None:
+                    self._dumper = threading.Thread(target=self._dump_forever, name='prometheus-dump', daemon=True)
+                    self._dumper.start()
+                    atexit.register(self.dump)
+
+    def _dump_forever(self):
+        while True:
+            time.sleep(settings.PROMETHEUS_DUMP_SECONDS)
+            self.dump()
+
+    def dump(self):
+        directory = settings.PROMETHEUS_MULTIPROC_DIR
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics_{os.getpid()}.json')
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(temp_path, path)
+
+    def collect(self):
+        """Values summed over this process and, in multiprocess mode, all others on the host"""
+        directory = settings.PROMETHEUS_MULTIPROC_DIR
+        if not directory or not os.path.isdir(directory):
+            return self.snapshot()
+
+        self._archive_dead_processes(directory)
+        totals = self.snapshot()
+        own_file = f'metrics_{os.getpid()}.json'
+        for filename in os.listdir(directory):
+            if filename == own_file or not filename.endswith('.json'):
+                continue
+            _merge_into(totals, _read_json(os.path.join(directory, filename)))
+        return totals
+
+    def _archive_dead_processes(self, directory):
+        if fcntl is None:
+            return
+        with open(os.path.join(directory, 'archive.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            archive_path = os.path.join(directory, 'metrics_archive.json')
+            archive = None
+            for filename in os.listdir(directory):
+                pid = _pid_from_filename(filename)
+                if pid is None or _process_alive(pid):
+                    continue
+                if archive is None:
+                    archive = _read_json(archive_path)
+                path = os.path.join(directory, filename)
+                _merge_into(archive, _read_json(path))
+                with open(f'{archive_path}.tmp', 'w') as handle:
+                    json.dump(archive, handle)
+                os.replace(f'{archive_path}.tmp', archive_path)
+                os.remove(path)
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+
+    def render(self):
+        totals = self.collect()
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {metric.sample_name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.sample_name} {metric.type}')
+            for key, value in sorted(totals.get(name, {}).items()):
+                labels = dict(zip(metric.labelnames, json.loads(key)))
+                lines.extend(metric.exposition_lines(labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+def _read_json(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _pid_from_filename(filename):
+    if not (filename.startswith('metrics_') and filename.endswith('.json')):
+        return None
+    pid = filename[len('metrics_'):-len('.json')]
+    return int(pid) if pid.isdigit() else None
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_into(totals, other):
+    for name, values in other.items():
+        merged = totals.setdefault(name, {})
+        for key, value in values.items():
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    type = None
+    suffix = ''
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.sample_name = name + self.suffix
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return json.dumps([str(labels[name]) for name in self.labelnames])
+
+
+class Counter(_Metric):
+    type = 'counter'
+    suffix = '_total'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.registry.touched()
+
+    def exposition_lines(self, labels, value):
+        return [f'{self.sample_name}{_format_labels(labels)} {_format_value(value)}']
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry._lock:
+            # [count per bucket..., sum, count]; buckets are stored non-cumulative
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+        self.registry.touched()
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def exposition_lines(self, labels, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            bucket_labels = dict(labels, le=_format_value(float(bound)))
+            lines.append(f'{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+        lines.append(f'{self.name}_bucket{_format_labels(dict(labels, le="+Inf"))} {state[-1]}')
+        lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(state[-2])}')
+        lines.append(f'{self.name}_count{_format_labels(labels)} {state[-1]}')
+        return lines
+
+
+REGISTRY = Registry()
+
+
+# ============================================================================
+# APPLICATION METRICS
+# ============================================================================
+
+HTTP_REQUEST_DURATION = Histogram(
+    'advisor_http_request_duration_seconds',
+    'Request wall time per view',
+    ['view', 'method', 'status'],
+)
+
+PDF_RENDER_DURATION = Histogram(
+    'advisor_pdf_render_duration_seconds',
+    'Fact finder PDF generation time (WeasyPrint layout or template form fill)',
+    ['renderer', 'outcome'],
+)
+
+PDF_SIZE = Histogram(
+    'advisor_pdf_size_bytes',
+    'Size of generated fact finder PDFs',
+    buckets=(50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000),
+)
+
+EMAIL_SEND_DURATION = Histogram(
+    'advisor_email_send_duration_seconds',
+    'Time to render and send a notification email',
+    ['template', 'outcome'],
+)
+
+BENEFITS_API_DURATION = Histogram(
+    'advisor_benefits_api_duration_seconds',
+    'benefits-software case submission latency',
+    ['outcome'],
+)
+
+SCHEDULER_JOBS = Counter(
+    'advisor_scheduler_jobs',
+    'Scheduled releases and notification emails processed',
+    ['job', 'outcome'],
+)
+
+SCHEDULER_RUN_JOBS = Histogram(
+    'advisor_scheduler_run_jobs',
+    'Cases released or emailed per scheduler run',
+    ['job'],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 1000),
+)
+
+STORAGE_DELETIONS = Counter(
+    'advisor_storage_deletions',
+    'Queued document and report files processed by the storage deletion worker',
+    ['outcome'],
+)
@@ -2,6 +2,8 @@ from django.urls import path
 from . import views
 from . import views_reports
 from . import views_audit
+from . import views_metrics
+from . import views_profiler
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -23,4 +25,10 @@ urlpatterns = [
     path('reports/case-changes/', views_audit.case_change_history_report, name='case_change_history_report'),
     path('reports/quality-review-audit/', views_audit.quality_review_audit_report, name='quality_review_audit_report'),
     path('reports/system-events/', views_audit.system_event_audit_report, name='system_event_audit_report'),
+    # Performance monitoring
+    path('metrics/requests/', views_metrics.request_metrics, name='request_metrics'),
+    path('metrics', views_metrics.prometheus_metrics, name='prometheus_metrics'),
+    path('profiler/', views_profiler.profiler, name='profiler'),
+    path('profiler/<int:profile_id>/', views_profiler.profile_detail, name='profile_detail'),
+    path('profiler/<int:profile_id>/download/', views_profiler.download_profile, name='download_profile'),
 ]
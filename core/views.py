@@ -88,7 +88,8 @@ def system_settings(request):
         messages.error(request, 'Access denied. Administrators only.')
         return redirect('home')
     
-    settings = SystemSettings.get_settings()
+    # Fresh instance - the form below modifies it, and saving invalidates the cached copy
+    settings = SystemSettings.get_settings(cached=False)
     
     if request.method == 'POST':
         # Handle form submission
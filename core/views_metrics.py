@@ -0,0 +1,142 @@
+"""
+Request Metrics Views
+Per-view latency percentiles and N+1 query offenders from RequestMetric
+(recorded by core.middleware.RequestMetricsMiddleware), and the Prometheus
+scrape endpoint for the registry in core/prometheus.py
+"""
+import hmac
+from collections import defaultdict
+from datetime import timedelta
+from math import ceil
+
+from django.contrib import messages
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db.models import Avg, Count
+from django.db.models.functions import Mod
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from core.middleware import flush_request_metrics
+from core.models import RequestMetric
+
+WINDOW_CHOICES = [1, 6, 24, 72, 168]
+
+# Percentiles are computed from at most about this many rows; busier windows are sampled
+MAX_PERCENTILE_SAMPLES = 50000
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@login_required
+def request_metrics(request):
+    """Per-view p50/p95 latency and query counts - Administrators only"""
+    if request.user.role != 'administrator':
+        messages.error(request, 'Access denied. Administrators only.')
+        return redirect('home')
+    
+    try:
+        hours = int(request.GET.get('hours', 24))
+    except ValueError:
+        hours = 24
+    if hours not in WINDOW_CHOICES:
+        hours = 24
+    since = timezone.now() - timedelta(hours=hours)
+    
+    # Include this process's not-yet-flushed requests
+    flush_request_metrics()
+    
+    window = RequestMetric.objects.filter(created_at__gte=since).order_by()
+    
+    # Counts and averages are aggregated by the database
+    totals = {
+        row['url_name']: row
+        for row in window.values('url_name').annotate(
+            count=Count('id'),
+            avg_query_ms=Avg('query_ms'),
+            avg_template_ms=Avg('template_ms'),
+            avg_duplicates=Avg('duplicate_query_count'),
+        )
+    }
+    
+    # Percentiles need the values themselves: load every step-th row (by id) of busy windows,
+    # and all rows of views too quiet to be represented in that sample
+    step = max(1, ceil(sum(row['count'] for row in totals.values()) / MAX_PERCENTILE_SAMPLES))
+    columns = ('url_name', 'duration_ms', 'query_count')
+    samples = defaultdict(lambda: ([], []))
+    rows = window.values_list(*columns)
+    if step > 1:
+        rows = window.annotate(sample_bucket=Mod('id', step)).filter(sample_bucket=0).values_list(*columns)
+    for url_name, duration_ms, query_count in rows.iterator(chunk_size=5000):
+        samples[url_name][0].append(duration_ms)
+        samples[url_name][1].append(query_count)
+    quiet = [url_name for url_name, row in totals.items() if row['count'] < step * 10]
+    if step > 1 and quiet:
+        for url_name in quiet:
+            samples.pop(url_name, None)
+        for url_name, duration_ms, query_count in window.filter(url_name__in=quiet).values_list(*columns).iterator(chunk_size=5000):
+            samples[url_name][0].append(duration_ms)
+            samples[url_name][1].append(query_count)
+    
+    views = []
+    for url_name, row in totals.items():
+        durations, queries = (sorted(values) for values in samples[url_name])
+        views.append({
+            'url_name': url_name,
+            'count': row['count'],
+            'p50_ms': _percentile(durations, 0.50),
+            'p95_ms': _percentile(durations, 0.95),
+            'p50_queries': _percentile(queries, 0.50),
+            'p95_queries': _percentile(queries, 0.95),
+            'avg_query_ms': row['avg_query_ms'],
+            'avg_template_ms': row['avg_template_ms'],
+            'avg_duplicates': row['avg_duplicates'],
+        })
+    views.sort(key=lambda row: row['p95_ms'], reverse=True)
+    
+    # Top N+1 offenders: views repeating the most statements per request, with their worst example
+    offenders = sorted(
+        (row for row in views if row['avg_duplicates'] >= 1),
+        key=lambda row: row['avg_duplicates'],
+        reverse=True
+    )[:10]
+    for row in offenders:
+        worst = RequestMetric.objects.filter(
+            url_name=row['url_name'], created_at__gte=since
+        ).order_by('-duplicate_query_count').values('duplicate_query_count', 'duplicate_queries').first()
+        row['worst_duplicates'] = worst['duplicate_query_count']
+        row['duplicate_queries'] = worst['duplicate_queries']
+    
+    context = {
+        'views': views,
+        'offenders': offenders,
+        'hours': hours,
+        'window_choices': WINDOW_CHOICES,
+        'total_requests': sum(row['count'] for row in views),
+        'sampled': step > 1,
+    }
+    return render(request, 'core/request_metrics.html', context)
+
+
+@require_GET
+def prometheus_metrics(request):
+    """
+    Prometheus text exposition of the application metrics.
+    Allowed from METRICS_ALLOWED_IPS, or with the METRICS_TOKEN bearer token when set.
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    token_ok = bool(token) and hmac.compare_digest(authorization, f'Bearer {token}')
+    if not token_ok and request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden('Forbidden')
+
+    from core.prometheus import REGISTRY
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,129 @@
+"""
+Request Profiler Views
+Arm the sampling profiler (core.middleware.SamplingProfilerMiddleware) for
+the next N requests matching a path pattern and/or user, and view the
+captured profiles as flame graphs - Administrators only
+"""
+import re
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from accounts.models import User
+from core.middleware import expire_profiling_sessions
+from core.models import ProfilingSession, RequestProfile
+from core.profiler import flame_graph, parse_collapsed
+
+MAX_REQUESTS_PER_SESSION = 50
+FLAME_ROW_HEIGHT = 18
+
+
+def _is_administrator(user):
+    return user.is_authenticated and user.role == 'administrator'
+
+
+@login_required
+def profiler(request):
+    """Arm/stop profiling sessions and list captured profiles - Administrators only"""
+    if not _is_administrator(request.user):
+        messages.error(request, 'Access denied. Administrators only.')
+        return redirect('home')
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+
+        if action == 'start':
+            url_pattern = request.POST.get('url_pattern', '').strip()
+            username = request.POST.get('username', '').strip()
+            try:
+                re.compile(url_pattern)
+            except re.error as e:
+                messages.error(request, f'Invalid URL pattern: {e}')
+                return redirect('profiler')
+            user = None
+            if username:
+                user = User.objects.filter(username=username).first()
+                if user is None:
+                    messages.error(request, f'No user named {username}.')
+                    return redirect('profiler')
+            try:
+                request_count = int(request.POST.get('request_count', 5))
+                interval_ms = int(request.POST.get('interval_ms', 5))
+            except ValueError:
+                messages.error(request, 'Request count and interval must be whole numbers.')
+                return redirect('profiler')
+            request_count = max(1, min(request_count, MAX_REQUESTS_PER_SESSION))
+            interval_ms = max(1, min(interval_ms, 100))
+
+            ProfilingSession.objects.create(
+                url_pattern=url_pattern,
+                user=user,
+                requested_count=request_count,
+                remaining_count=request_count,
+                interval_ms=interval_ms,
+                created_by=request.user,
+            )
+            expire_profiling_sessions()
+            messages.success(request, f'Profiling the next {request_count} matching request(s).')
+            if not settings.PROFILER_ENABLED:
+                messages.warning(request, 'PROFILER_ENABLED is off, so nothing is captured until it is enabled.')
+
+        elif action == 'stop':
+            ProfilingSession.objects.filter(
+                pk=request.POST.get('session_id'), stopped_at__isnull=True
+            ).update(stopped_at=timezone.now())
+            expire_profiling_sessions()
+            messages.success(request, 'Profiling session stopped.')
+
+        return redirect('profiler')
+
+    context = {
+        'sessions': ProfilingSession.objects.select_related('user', 'created_by').annotate(
+            captured_count=Count('profiles')
+        )[:20],
+        'profiles': RequestProfile.objects.select_related('user', 'session')[:50],
+        'max_requests': MAX_REQUESTS_PER_SESSION,
+    }
+    return render(request, 'core/profiler.html', context)
+
+
+@login_required
+def profile_detail(request, profile_id):
+    """Flame graph and SQL of one profiled request - Administrators only"""
+    if not _is_administrator(request.user):
+        messages.error(request, 'Access denied. Administrators only.')
+        return redirect('home')
+
+    profile = get_object_or_404(RequestProfile.objects.select_related('user', 'session'), pk=profile_id)
+    with profile.profile_file.open('rb') as handle:
+        stacks = parse_collapsed(handle.read().decode('utf-8'))
+    rects, max_depth = flame_graph(stacks)
+    for rect in rects:
+        rect['top'] = rect['depth'] * FLAME_ROW_HEIGHT
+
+    context = {
+        'profile': profile,
+        'rects': rects,
+        'graph_height': (max_depth + 1) * FLAME_ROW_HEIGHT,
+        'row_height': FLAME_ROW_HEIGHT - 1,
+    }
+    return render(request, 'core/profile_detail.html', context)
+
+
+@login_required
+def download_profile(request, profile_id):
+    """Collapsed-stack file, for flamegraph.pl or speedscope - Administrators only"""
+    if not _is_administrator(request.user):
+        messages.error(request, 'Access denied. Administrators only.')
+        return redirect('home')
+
+    profile = get_object_or_404(RequestProfile, pk=profile_id)
+    with profile.profile_file.open('rb') as handle:
+        response = HttpResponse(handle.read(), content_type='text/plain; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.folded"'
+    return response
@@ -6,12 +6,9 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse
-from django.db.models import Count, Q, Avg, F, Sum, Case as CaseWhen, When, Value, FloatField
 from django.utils import timezone
-from datetime import timedelta
 import csv
 from cases.models import Case
-from accounts.models import User
 
 
 def is_admin(user):
@@ -39,169 +36,17 @@ def view_reports(request):
 
 
 def get_all_reports_data(date_from=None, date_to=None):
-    """Compile all report data for the dashboard with optional date filtering"""
-    from datetime import datetime
+    """
+    Compile all report data for the dashboard with optional date filtering.
+    Answered from the CaseDailyFact rollups (python manage.py build_case_rollups);
+    they are built on first use if the command has never run.
+    """
+    from cases.services import rollup_service
     
-    # Build base queryset with optional date filter
-    cases_qs = Case.objects.all()
+    if rollup_service.get_last_build_time() is None and Case.objects.exists():
+        rollup_service.build_case_rollups()
     
-    if date_from or date_to:
-        if date_from:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-            cases_qs = cases_qs.filter(date_submitted__date__gte=date_from_obj)
-        if date_to:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-            cases_qs = cases_qs.filter(date_submitted__date__lte=date_to_obj)
-    
-    # === CASE ANALYTICS ===
-    total_cases = cases_qs.count()
-    completed_cases = cases_qs.filter(status='completed').count()
-    submitted_cases = cases_qs.filter(status='submitted').count()
-    
-    # Average processing time (days from submission to completion)
-    completed_with_dates = cases_qs.filter(
-        status='completed',
-        date_submitted__isnull=False,
-        date_completed__isnull=False
-    ).annotate(
-        processing_days=F('date_completed') - F('date_submitted')
-    ).aggregate(avg_days=Avg('processing_days'))
-    
-    avg_processing_time = completed_with_dates['avg_days']
-    if avg_processing_time:
-        avg_processing_time = avg_processing_time.days
-    
-    # Rush vs Standard cases
-    rush_cases = cases_qs.filter(urgency='rush').count()
-    standard_cases = cases_qs.filter(urgency='normal').count()
-    
-    # Cases by urgency level
-    cases_by_urgency = cases_qs.values('urgency').annotate(count=Count('id')).order_by('urgency')
-    
-    # === PERFORMANCE METRICS ===
-    # Cases per technician
-    cases_per_tech = cases_qs.filter(
-        assigned_to__isnull=False
-    ).values(
-        'assigned_to__id',
-        'assigned_to__username',
-        'assigned_to__first_name',
-        'assigned_to__last_name'
-    ).annotate(
-        case_count=Count('id')
-    ).order_by('-case_count')
-    
-    # Average credits per case
-    avg_credits = cases_qs.exclude(credit_value__isnull=True).aggregate(
-        avg=Avg(F('credit_value'), output_field=FloatField())
-    )
-    
-    avg_credits_value = avg_credits['avg'] or 0
-    
-    # Quality review metrics - approval rates
-    level_1_cases = cases_qs.filter(assigned_to__user_level='level_1')
-    level_1_completed = level_1_cases.filter(status='completed').count()
-    level_1_pending_review = level_1_cases.filter(status='pending_review').count()
-    level_1_total = level_1_cases.count()
-    
-    if level_1_total > 0:
-        approval_rate = (level_1_completed / level_1_total) * 100
-    else:
-        approval_rate = 0
-    
-    # Member activity
-    total_members = User.objects.filter(role='member').count()
-    members_with_cases = cases_qs.filter(
-        member__isnull=False
-    ).values('member_id').distinct().count()
-    
-    # === FINANCIAL REPORTS ===
-    # Credits analysis - only count credits from completed or accepted cases
-    financial_cases = cases_qs.filter(status__in=['accepted', 'completed'])
-    total_credits_issued = financial_cases.exclude(credit_value__isnull=True).aggregate(
-        total=Sum(F('credit_value'), output_field=FloatField())
-    )['total'] or 0
-    
-    # Credits by workshop code - only from completed/accepted cases
-    credits_by_workshop = financial_cases.exclude(credit_value__isnull=True).values(
-        'workshop_code'
-    ).annotate(
-        total_credits=Sum(F('credit_value'), output_field=FloatField()),
-        case_count=Count('id'),
-        avg_credits=F('total_credits') / F('case_count')
-    ).order_by('-total_credits')[:10]
-    
-    # === STATUS REPORTS ===
-    status_distribution = cases_qs.values('status').annotate(
-        count=Count('id')
-    ).order_by('status')
-    
-    status_labels = {
-        'draft': 'Draft',
-        'submitted': 'Submitted',
-        'accepted': 'Accepted',
-        'hold': 'On Hold',
-        'pending_review': 'Pending Review',
-        'completed': 'Completed',
-    }
-    
-    # Cases by status with readable labels
-    cases_by_status = []
-    for item in status_distribution:
-        percentage = (item['count'] / total_cases * 100) if total_cases > 0 else 0
-        cases_by_status.append({
-            'status': item['status'],
-            'label': status_labels.get(item['status'], item['status']),
-            'count': item['count'],
-            'percentage': round(percentage, 1)
-        })
-    
-    # === TECHNICIAN WORKLOAD ===
-    # Group by user level
-    level_1_techs = User.objects.filter(role='technician', user_level='level_1').count()
-    level_2_techs = User.objects.filter(role='technician', user_level='level_2').count()
-    level_3_techs = User.objects.filter(role='technician', user_level='level_3').count()
-    
-    # Recent cases based on date filter (use custom date range if provided, else last 30 days)
-    if date_from or date_to:
-        recent_cases = cases_qs.count()
-    else:
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_cases = Case.objects.filter(date_submitted__gte=thirty_days_ago).count()
-    
-    return {
-        # Case Analytics
-        'total_cases': total_cases,
-        'completed_cases': completed_cases,
-        'submitted_cases': submitted_cases,
-        'avg_processing_time': avg_processing_time,
-        'rush_cases': rush_cases,
-        'standard_cases': standard_cases,
-        'cases_by_urgency': cases_by_urgency,
-        
-        # Performance Metrics
-        'cases_per_tech': cases_per_tech,
-        'avg_credits': avg_credits_value,
-        'level_1_approval_rate': approval_rate,
-        'level_1_completed': level_1_completed,
-        'level_1_pending': level_1_pending_review,
-        'level_1_total': level_1_total,
-        'total_members': total_members,
-        'active_members': members_with_cases,
-        
-        # Financial Reports
-        'total_credits_issued': total_credits_issued,
-        'credits_by_workshop': credits_by_workshop,
-        
-        # Status Reports
-        'cases_by_status': cases_by_status,
-        
-        # Technician Breakdown
-        'level_1_count': level_1_techs,
-        'level_2_count': level_2_techs,
-        'level_3_count': level_3_techs,
-        'recent_cases_30days': recent_cases,
-    }
+    return rollup_service.get_reports_data(date_from, date_to)
 
 
 @login_required